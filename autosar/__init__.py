@@ -19,6 +19,8 @@ import ntpath
 import os
 import xml.etree.ElementTree as ElementTree
 
+__version__ = '0.3.8'
+
 def workspace(version=3.0, patch = 2, schema=None, attributes=None, useDefaultWriters=True):
    if schema is None and ( (version == 3.0 and patch == 2) or (version == "3.0.2") ):
       schema = 'autosar_302_ext.xsd'
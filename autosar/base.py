@@ -1,9 +1,14 @@
 import xml.etree.ElementTree as ElementTree
+import xml.parsers.expat
 import re
+import os
+import fnmatch
+import hashlib
 
 pVersion = re.compile(r"(\d+)\.(\d+)\.(\d+)")
 
 class AdminData:
+    __slots__ = ('specialDataGroups', '__dict__')
     def __init__(self):
         self.specialDataGroups = []
     def asdict(self):
@@ -23,6 +28,7 @@ class AdminData:
     def __ne__(self, other): return not (self == other)
 
 class SpecialDataGroup(object):
+    __slots__ = ('SDG_GID', 'SD', '__dict__')
     def __init__(self,SDG_GID,SD=None,SD_GID=None):
         self.SDG_GID=SDG_GID
         self.SD = []
@@ -49,6 +55,7 @@ class SpecialDataGroup(object):
     def __ne__(self, other): return not (self == other)
 
 class SpecialData:
+    __slots__ = ('TEXT', 'GID', '__dict__')
     def __init__(self, TEXT, GID):
         self.TEXT = TEXT
         self.GID = GID
@@ -69,6 +76,266 @@ def parseXMLFile(filename,namespace=None):
         removeNamespace(arxml_root,namespace)
     return arxml_root
 
+def _createNamespaceUnawareParser(builder):
+    """
+    Creates an expat parser which feeds the tree builder directly.
+    Namespace processing is disabled in expat, tags are therefore reported exactly as written in the document (i.e. without the default namespace).
+    Expat interns all tag and attribute names, repeated tags share the same string object.
+    """
+    parser = xml.parsers.expat.ParserCreate()
+    parser.buffer_text = True
+    parser.StartElementHandler = builder.start
+    parser.EndElementHandler = builder.end
+    parser.CharacterDataHandler = builder.data
+    return parser
+
+class ElementTreeBackend:
+    """
+    XML backend based on xml.etree.ElementTree (always available)
+    """
+    name = 'etree'
+
+    def parseFileWithoutNamespace(self, filename):
+        builder = ElementTree.TreeBuilder()
+        parser = _createNamespaceUnawareParser(builder)
+        with open(filename, 'rb') as fp:
+            parser.ParseFile(fp)
+        xmlRoot = builder.close()
+        return xmlRoot, xmlRoot.get('xmlns')
+
+class LxmlBackend:
+    """
+    XML backend based on lxml (optional dependency).
+    The default namespace declaration is cut from the root start tag before the document is handed to lxml, tags are thereby parsed without namespace.
+    Comments and processing instructions are dropped during parsing, just like ElementTree.TreeBuilder does.
+    """
+    name = 'lxml'
+    _rootTag = re.compile(br'<(?![?!])[^>]*>')
+    _defaultNamespace = re.compile(br'\s+xmlns\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+
+    def __init__(self):
+        import lxml.etree
+        self.etree = lxml.etree
+        self.parser = lxml.etree.XMLParser(remove_comments=True, remove_pis=True, huge_tree=True)
+
+    def parseFileWithoutNamespace(self, filename):
+        with open(filename, 'rb') as fp:
+            data = fp.read()
+        namespace = None
+        match = self._rootTag.search(data)
+        if match is not None:
+            rootEnd = match.end()
+            nsMatch = self._defaultNamespace.search(data, match.start(), rootEnd)
+            if nsMatch is not None:
+                namespace = (nsMatch.group(1) if nsMatch.group(1) is not None else nsMatch.group(2)).decode('utf-8')
+                data = data[:nsMatch.start()] + data[nsMatch.end():]
+                rootEnd -= (nsMatch.end() - nsMatch.start())
+            hasInnerNamespace = data.find(b'xmlns', rootEnd) >= 0
+        xmlRoot = self.etree.fromstring(data, self.parser)
+        if (match is not None) and hasInnerNamespace:
+            #namespace declared below the root element, fall back to removing namespaces element by element
+            for elem in xmlRoot.iter():
+                if elem.tag[0] == '{':
+                    elem.tag = self.etree.QName(elem).localname
+        return xmlRoot, namespace
+
+_xmlBackends = {'etree': ElementTreeBackend, 'lxml': LxmlBackend}
+_xmlBackend = None
+
+def setXMLBackend(name):
+    """
+    Selects the XML backend used when parsing ARXML files. Valid names are 'etree', 'lxml' and 'auto'.
+    'auto' selects lxml if it's installed, otherwise ElementTree.
+    The initial backend is taken from the environment variable AUTOSAR_XML_BACKEND (defaults to 'etree', lxml is only used when selected).
+    """
+    global _xmlBackend
+    if name == 'auto':
+        try:
+            _xmlBackend = LxmlBackend()
+        except ImportError:
+            _xmlBackend = ElementTreeBackend()
+    elif name in _xmlBackends:
+        _xmlBackend = _xmlBackends[name]()
+    else:
+        raise ValueError('Unknown XML backend: %s'%name)
+    return _xmlBackend
+
+def getXMLBackend():
+    """
+    Returns the XML backend currently in use
+    """
+    if _xmlBackend is None:
+        setXMLBackend(os.environ.get('AUTOSAR_XML_BACKEND', 'etree'))
+    return _xmlBackend
+
+def parseXMLFileWithoutNamespace(filename):
+    """
+    Parses XML file where tags are kept free from the default namespace already during parsing.
+    The file is parsed using the backend selected by setXMLBackend.
+    Returns a tuple (xmlRoot, namespace)
+    """
+    return getXMLBackend().parseFileWithoutNamespace(filename)
+
+def iterparseXMLFile(filename, chunkSize=65536, elementFilter=None):
+    """
+    Incremental version of parseXMLFileWithoutNamespace (always uses ElementTree).
+    Generates tuples (event, element) where event is either 'start' or 'end'.
+    When elementFilter (an ElementFilter) is given, package elements rejected by the filter are dropped before they are built (see _FilteringHandler).
+    """
+    events = []
+    builder = ElementTree.TreeBuilder()
+    parser = _createNamespaceUnawareParser(builder)
+    if elementFilter is None:
+        parser.StartElementHandler = lambda tag, attrib: events.append(('start', builder.start(tag, attrib)))
+        parser.EndElementHandler = lambda tag: events.append(('end', builder.end(tag)))
+    else:
+        handler = _FilteringHandler(builder, events, elementFilter)
+        parser.StartElementHandler = handler.start
+        parser.EndElementHandler = handler.end
+        parser.CharacterDataHandler = handler.data
+    with open(filename, 'rb') as fp:
+        while True:
+            data = fp.read(chunkSize)
+            parser.Parse(data, len(data) == 0)
+            for event in events:
+                yield event
+            del events[:]
+            if len(data) == 0:
+                break
+
+class _FilteringHandler:
+    """
+    Expat handlers used by iterparseXMLFile to drop package elements (children of <ELEMENTS>) rejected by an ElementFilter.
+    An element rejected by its tag is dropped entirely (no events are generated).
+    An element rejected by its reference is kept with only its SHORT-NAME, the remaining content is dropped.
+    """
+    def __init__(self, builder, events, elementFilter):
+        self.builder = builder
+        self.events = events
+        self.elementFilter = elementFilter
+        self.tags = [] #tags of currently open XML elements
+        self.packageNames = [] #names of currently open AR-PACKAGE elements
+        self.elementDepth = None #depth of the package element currently being read
+        self.skipDepth = None #depth of the element whose content is currently being dropped
+        self.skipElement = False #True when the element at skipDepth is dropped as well
+
+    def start(self, tag, attrib):
+        tags = self.tags
+        if self.skipDepth is None:
+            if (len(tags) > 1) and (tags[-1] == 'ELEMENTS') and (tags[-2] == 'AR-PACKAGE'):
+                if not self.elementFilter.acceptTag(tag):
+                    self.skipDepth = len(tags)
+                    self.skipElement = True
+                    tags.append(tag)
+                    return
+                self.elementDepth = len(tags)
+            elif tag == 'AR-PACKAGE':
+                self.packageNames.append('')
+            tags.append(tag)
+            self.events.append(('start', self.builder.start(tag, attrib)))
+        else:
+            tags.append(tag)
+
+    def end(self, tag):
+        tags = self.tags
+        tags.pop()
+        depth = len(tags)
+        if self.skipDepth is not None:
+            if depth == self.skipDepth:
+                self.skipDepth = None
+                if self.skipElement:
+                    return
+            else:
+                return
+        xmlElem = self.builder.end(tag)
+        self.events.append(('end', xmlElem))
+        if depth == self.elementDepth:
+            self.elementDepth = None
+        elif tag == 'AR-PACKAGE':
+            self.packageNames.pop()
+        elif tag == 'SHORT-NAME':
+            if tags[-1] == 'AR-PACKAGE':
+                self.packageNames[-1] = xmlElem.text
+            elif (self.elementDepth is not None) and (depth == self.elementDepth+1) and self.elementFilter.needsRef:
+                ref = '/'+'/'.join(self.packageNames)+'/'+str(xmlElem.text)
+                if not self.elementFilter.accept(tags[-1], ref):
+                    self.skipDepth = self.elementDepth
+                    self.skipElement = False
+
+    def data(self, text):
+        if self.skipDepth is None:
+            self.builder.data(text)
+
+class ElementFilter:
+    """
+    Selects which package elements are loaded from ARXML (see Workspace.loadXML).
+    Patterns starting with '/' are matched against element references, other patterns are matched against XML tags.
+    Patterns can use the wildcards of the fnmatch module ('*' also matches '/').
+    An element is loaded when it matches at least one include pattern (or include is None) and no exclude pattern.
+    """
+    def __init__(self, include=None, exclude=None):
+        if isinstance(include, str): include = [include]
+        if isinstance(exclude, str): exclude = [exclude]
+        self.include = None if include is None else list(include)
+        self.exclude = [] if exclude is None else list(exclude)
+        (self._includeTag, self._includeRef) = self._compile(self.include)
+        (self._excludeTag, self._excludeRef) = self._compile(self.exclude)
+        self.needsRef = (self._includeRef is not None) or (self._excludeRef is not None)
+
+    def _compile(self, patterns):
+        if patterns is None:
+            return None, None
+        tags = [fnmatch.translate(x) for x in patterns if not x.startswith('/')]
+        refs = [fnmatch.translate(x) for x in patterns if x.startswith('/')]
+        return (re.compile('|'.join(tags)) if len(tags) > 0 else None,
+                re.compile('|'.join(refs)) if len(refs) > 0 else None)
+
+    def acceptTag(self, tag):
+        """
+        Returns False if an element with this XML tag is rejected regardless of its reference
+        """
+        if (self._excludeTag is not None) and (self._excludeTag.match(tag) is not None):
+            return False
+        if (self.include is not None) and (self._includeRef is None):
+            return (self._includeTag is not None) and (self._includeTag.match(tag) is not None)
+        return True
+
+    def accept(self, tag, ref):
+        """
+        Returns True if the element with given XML tag and reference shall be loaded
+        """
+        if not self.acceptTag(tag):
+            return False
+        if (self._excludeRef is not None) and (self._excludeRef.match(ref) is not None):
+            return False
+        if self.include is None:
+            return True
+        return ((self._includeTag is not None) and (self._includeTag.match(tag) is not None)) or \
+               ((self._includeRef is not None) and (self._includeRef.match(ref) is not None))
+
+    def __repr__(self):
+        return 'ElementFilter(include=%r, exclude=%r)'%(self.include, self.exclude)
+
+def xmlFingerprint(xmlElem):
+    """
+    Returns digest (bytes) of the XML subtree starting at xmlElem, covering tags, attributes and text.
+    Whitespace-only text between elements (i.e. indentation) doesn't affect the result.
+    """
+    parts = []
+    _appendFingerprintParts(parts, xmlElem)
+    return hashlib.sha1('\0'.join(parts).encode('utf-8')).digest()
+
+def _appendFingerprintParts(parts, xmlElem):
+    parts.append(xmlElem.tag)
+    if len(xmlElem.attrib) > 0:
+        parts.append(repr(sorted(xmlElem.attrib.items())))
+    parts.append(xmlElem.text if (xmlElem.text is not None) and (len(xmlElem) == 0 or not xmlElem.text.isspace()) else '')
+    for xmlChild in xmlElem:
+        _appendFingerprintParts(parts, xmlChild)
+        tail = xmlChild.tail
+        parts.append(tail if (tail is not None) and (not tail.isspace()) else '')
+    parts.append('/')
+
 def getXMLNamespace(element):
     m = re.match(r'\{(.*)\}', element.tag)
     return m.group(1) if m else None
@@ -245,6 +512,7 @@ def findUniqueNameInList(elementList, baseName):
 
 
 class SwDataDefPropsConditional:
+    __slots__ = ('baseTypeRef', 'swCalibrationAccess', 'swAddressMethodRef', 'compuMethodRef', 'dataConstraintRef', 'implementationTypeRef', 'swPointerTargetProps', 'unitRef', '_swImplPolicy', 'parent', '__dict__')
     def tag(self,version=None): return 'SW-DATA-DEF-PROPS-CONDITIONAL'
     def __init__(self, baseTypeRef = None, implementationTypeRef = None, swAddressMethodRef = None, swCalibrationAccess = None, swImplPolicy = None, swPointerTargetProps = None, compuMethodRef = None, dataConstraintRef = None, unitRef = None, parent = None):
         self.baseTypeRef = baseTypeRef
@@ -301,6 +569,7 @@ class SwPointerTargetProps:
     (AUTOSAR 4)
     Implements <SW-POINTER-TARGET-PROPS>
     """
+    __slots__ = ('targetCategory', 'variants', '__dict__')
     def tag(self, version=None): return 'SW-POINTER-TARGET-PROPS'
     def __init__(self, targetCategory=None, variants = None):
         self.targetCategory = targetCategory
@@ -317,6 +586,7 @@ class SymbolProps:
     (AUTOSAR 4)
     Implements <SYMBOL-PROPS>
     """
+    __slots__ = ('name', 'symbol', '__dict__')
     def tag(self, version=None): return 'SYMBOL-PROPS'
 
     def __init__(self, name = None, symbol = None):
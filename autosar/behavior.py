@@ -235,12 +235,7 @@ class RunnableEntity(Element):
         if ref is None: return None
         if ref[0]=='/': ref=ref[1:] #removes initial '/' if it exists
         ref=ref.partition('/')
-        name=ref[0]
-        foundElem = None
-        for elem in self.modeAccessPoints + self.modeSwitchPoints + self.parameterAccessPoints:
-            if elem.name == name:
-                foundElem = elem
-                break
+        foundElem = self._findChild(ref[0], 'modeAccessPoints', 'modeSwitchPoints', 'parameterAccessPoints')
         if foundElem is not None:
             if len(ref[2])>0:
                 return foundElem.find(ref[2])
@@ -254,10 +249,12 @@ class RunnableEntity(Element):
             dataReceivePoint=self._verifyDataReceivePoint(copy.copy(elem))
             self.dataReceivePoints.append(dataReceivePoint)
             dataReceivePoint.parent=self
+            self._childAdded('dataReceivePoints', dataReceivePoint)
         elif isinstance(elem, autosar.behavior.DataSendPoint):
             dataSendPoint=self._verifyDataSendPoint(copy.copy(elem))
             self.dataSendPoints.append(dataSendPoint)
             dataSendPoint.parent=self
+            self._childAdded('dataSendPoints', dataSendPoint)
         else:
             raise NotImplementedError(str(type(elem)))
 
@@ -318,13 +315,6 @@ class RunnableEntity(Element):
         else:
             return self.parent.rootWS()
 
-    @property
-    def ref(self):
-        if self.parent is not None:
-            return self.parent.ref+'/%s'%self.name
-        else:
-            return None
-
 class DataElementInstanceRef(object):
     """
     <DATA-ELEMENT-IREF>
@@ -652,7 +642,9 @@ class InternalBehaviorCommon(Element):
         ws = self.rootWS()
         tmp = self.swc.providePorts+self.swc.requirePorts
         for port in sorted(tmp,key=lambda x: x.name.lower()):
-            self.portAPIOptions.append(PortAPIOption(port.ref))
+            option = PortAPIOption(port.ref)
+            self.portAPIOptions.append(option)
+            self._childAdded('portAPIOptions', option)
 
     def _initSWC(self):
         """
@@ -668,12 +660,7 @@ class InternalBehaviorCommon(Element):
         if ref is None: return None
         if ref[0]=='/': ref=ref[1:] #removes initial '/' if it exists
         ref=ref.partition('/')
-        name=ref[0]
-        foundElem = None
-        for elem in self.runnables + self.perInstanceMemories + self.exclusiveAreas + self.events:
-            if elem.name == name:
-                foundElem = elem
-                break
+        foundElem = self._findChild(ref[0], 'runnables', 'perInstanceMemories', 'exclusiveAreas', 'events')
         if foundElem is not None:
             if len(ref[2])>0:
                 return foundElem.find(ref[2])
@@ -698,6 +685,7 @@ class InternalBehaviorCommon(Element):
         runnable = RunnableEntity(name, concurrent, symbol, self, adminData)
         runnable.minStartInterval = minStartInterval
         self.runnables.append(runnable)
+        self._childAdded('runnables', runnable)
         self._initSWC()
         ws = self.rootWS()
         if portAccess is not None:
@@ -752,15 +740,12 @@ class InternalBehaviorCommon(Element):
         if exclusiveAreas is not None:
             if isinstance(exclusiveAreas, str):
                 exclusiveAreas =[exclusiveAreas]
-            if isinstance(exclusiveAreas, collections.Iterable):
+            if isinstance(exclusiveAreas, collections.abc.Iterable):
                 for exclusiveAreaName in exclusiveAreas:
-                    found = False
-                    for exclusiveArea in self.exclusiveAreas:
-                        if exclusiveArea.name == exclusiveAreaName:
-                            found = True
-                            runnable.exclusiveAreaRefs.append(exclusiveArea.ref)
-                            break
-                    if not found:
+                    exclusiveArea = self._findChild(exclusiveAreaName, 'exclusiveAreas')
+                    if exclusiveArea is not None:
+                        runnable.exclusiveAreaRefs.append(exclusiveArea.ref)
+                    else:
                         raise ValueError('invalid exclusive area name: '+exclusiveAreaName)
             else:
                 raise ValueError('exclusiveAreas must be either string or list')
@@ -790,9 +775,11 @@ class InternalBehaviorCommon(Element):
         if isinstance(port,autosar.port.RequirePort):
             receivePoint=DataReceivePoint(port.ref,dataElement.ref,'REC_{0.name}_{1.name}'.format(port,dataElement),runnable)
             runnable.dataReceivePoints.append(receivePoint)
+            runnable._childAdded('dataReceivePoints', receivePoint)
         elif isinstance(port,autosar.port.ProvidePort):
             sendPoint=DataSendPoint(port.ref,dataElement.ref,'SEND_{0.name}_{1.name}'.format(port,dataElement),runnable)
             runnable.dataSendPoints.append(sendPoint)
+            runnable._childAdded('dataSendPoints', sendPoint)
         else:
             raise ValueError('unexpected type: '+str(type(port)))
 
@@ -805,6 +792,7 @@ class InternalBehaviorCommon(Element):
             callPoint=SyncServerCallPoint('SC_{0.name}_{1.name}'.format(port,operation))
             callPoint.operationInstanceRefs.append(OperationInstanceRef(port.ref, operation.ref))
             runnable.serverCallPoints.append(callPoint)
+            runnable._childAdded('serverCallPoints', callPoint)
         else:
             raise ValueError('unexpected type: '+str(type(port)))
 
@@ -851,6 +839,7 @@ class InternalBehaviorCommon(Element):
         name = None #TODO: support user-controlled name?
         modeAccessPoint = ModeAccessPoint(name, modeGroupInstanceRef)
         runnable.modeAccessPoints.append(modeAccessPoint)
+        runnable._childAdded('modeAccessPoints', modeAccessPoint)
 
     def _createModeSwitchPoint(self, port, modeGroup, runnable):
         if isinstance(port, autosar.port.ProvidePort):
@@ -862,6 +851,7 @@ class InternalBehaviorCommon(Element):
         name = autosar.base.findUniqueNameInList(runnable.modeSwitchPoints, baseName)
         modeSwitchPoint = ModeSwitchPoint(name, modeGroupInstanceRef, runnable)
         runnable.modeSwitchPoints.append(modeSwitchPoint)
+        runnable._childAdded('modeSwitchPoints', modeSwitchPoint)
 
     def createModeSwitchEvent(self, runnableName, modeRef, activationType='ENTRY', name=None):
         self._initSWC()
@@ -886,6 +876,7 @@ class InternalBehaviorCommon(Element):
         event.modeInstRef = ModeInstanceRef(modeDeclarationRef, modeDeclarationGroupRef, portRef)
         assert(isinstance(event.modeInstRef, autosar.behavior.ModeInstanceRef))
         self.events.append(event)
+        self._childAdded('events', event)
         return event
 
     def createTimerEvent(self, runnableName, period, modeDependency=None, name=None ):
@@ -907,6 +898,7 @@ class InternalBehaviorCommon(Element):
         if modeDependency is not None:
             self._processModeDependency(event, modeDependency, ws.version)
         self.events.append(event)
+        self._childAdded('events', event)
         return event
 
     def createTimingEvent(self, runnableName, period, modeDependency=None, name=None):
@@ -957,6 +949,7 @@ class InternalBehaviorCommon(Element):
             self._processModeDependency(event, modeDependency, ws.version)
 
         self.events.append(event)
+        self._childAdded('events', event)
         return event
 
     def createDataReceivedEvent(self, runnableName, dataElementRef, modeDependency=None, name=None ):
@@ -1031,6 +1024,7 @@ class InternalBehaviorCommon(Element):
             self._processModeDependency(event, modeDependency, ws.version)
 
         self.events.append(event)
+        self._childAdded('events', event)
         return event
 
     def _findEventName(self, baseName):
@@ -1065,6 +1059,7 @@ class InternalBehaviorCommon(Element):
         ws = self.rootWS()
         exclusiveArea = ExclusiveArea(str(name), self)
         self.exclusiveAreas.append(exclusiveArea)
+        self._childAdded('exclusiveAreas', exclusiveArea)
         return exclusiveArea
 
 
@@ -1083,6 +1078,7 @@ class InternalBehavior(InternalBehaviorCommon):
         if isinstance(elem,RunnableEntity):
             self.runnables.append(elem)
             elem.parent=self
+            self._childAdded('runnables', elem)
         else:
             raise NotImplementedError(str(type(elem)))
 
@@ -1092,9 +1088,7 @@ class InternalBehavior(InternalBehaviorCommon):
         if result is None:
             if ref[0]=='/': ref=ref[1:] #removes initial '/' if it exists
             ref=ref.partition('/')
-            name=ref[0]
-            for elem in self.sharedCalParams:
-                if elem.name == name: return elem
+            return self._findChild(ref[0], 'sharedCalParams')
         else:
             return result
         return None
@@ -1118,6 +1112,7 @@ class InternalBehavior(InternalBehaviorCommon):
             raise ValueError('invalid reference: '+typeRef)
         perInstanceMemory = PerInstanceMemory(name, dataType.ref, self)
         self.perInstanceMemories.append(perInstanceMemory)
+        self._childAdded('perInstanceMemories', perInstanceMemory)
         return perInstanceMemory
 
     def createSharedCalParam(self, name, typeRef, SwAddrMethodRef, adminData=None):
@@ -1129,6 +1124,7 @@ class InternalBehavior(InternalBehaviorCommon):
         elem = CalPrmElemPrototype(name, dataType.ref, self, adminData)
         elem.swDataDefsProps.append(SwAddrMethodRef)
         self.sharedCalParams.append(elem)
+        self._childAdded('sharedCalParams', elem)
         return elem
 
     def createNvmBlock(self, name, blockParams):
@@ -1192,6 +1188,7 @@ class InternalBehavior(InternalBehaviorCommon):
             raise ValueError('serviceCallPorts must be either string or list of string of format the "portName/operationName"')
 
         self.swcNvBlockNeeds.append(elem)
+        self._childAdded('swcNvBlockNeeds', elem)
         return elem
 
 
@@ -1213,12 +1210,7 @@ class SwcInternalBehavior(InternalBehaviorCommon):
         if result is None:
             if ref[0]=='/': ref=ref[1:] #removes initial '/' if it exists
             ref=ref.partition('/')
-            name=ref[0]
-            foundElem = None
-            for elem in self.parameterDataPrototype:
-                if elem.name == name:
-                    foundElem = elem
-                    break
+            foundElem = self._findChild(ref[0], 'parameterDataPrototype')
             if foundElem is not None:
                 if len(ref[2])>0:
                     return foundElem.find(ref[2])
@@ -1242,6 +1234,7 @@ class SwcInternalBehavior(InternalBehaviorCommon):
             raise ValueError('invalid reference: '+implementationTypeRef)
         dataElement = DataElement(name, dataType.ref, swAddressMethodRef = swAddressMethodRef, swCalibrationAccess=swCalibrationAccess, parent=self)
         self.perInstanceMemories.append(dataElement)
+        self._childAdded('perInstanceMemories', dataElement)
         return dataElement
 
     def createSharedDataParameter(self, name, implementationTypeRef, swAddressMethodRef = None, swCalibrationAccess = None, initValue = None):
@@ -1255,6 +1248,7 @@ class SwcInternalBehavior(InternalBehaviorCommon):
             raise ValueError('invalid reference: '+implementationTypeRef)
         parameter = autosar.element.ParameterDataPrototype(name, dataType.ref, swAddressMethodRef = swAddressMethodRef, swCalibrationAccess=swCalibrationAccess, initValue=initValue, parent=self)
         self.parameterDataPrototype.append(parameter)
+        self._childAdded('parameterDataPrototype', parameter)
         return parameter
 
     def createNvmBlock(self, name, portName, perInstanceMemoryName, nvmBlockConfig = None, defaultValueName = None, perInstanceMemoryRole='ramBlock', defaultValueRole = 'defaultValue', blockAdminData = None):
@@ -1295,6 +1289,7 @@ class SwcInternalBehavior(InternalBehaviorCommon):
                 raise ValueError('%s: No shared data parameter found with name "%s"'%(self.swc.name, defaultValueName))
 
         self.serviceDependencies.append(serviceDependency)
+        self._childAdded('serviceDependencies', serviceDependency)
         return serviceDependency
 
     def createInitEvent(self, runnableName, modeDependency=None, name=None ):
@@ -1316,6 +1311,7 @@ class SwcInternalBehavior(InternalBehaviorCommon):
         if modeDependency is not None:
             self._processModeDependency(event, modeDependency, ws.version)
         self.events.append(event)
+        self._childAdded('events', event)
         return event
 
     def createModeSwitchAckEvent(self, runnableName, modeSwitchSource, modeDependency=None, name=None ):
@@ -1374,6 +1370,7 @@ class SwcInternalBehavior(InternalBehaviorCommon):
         if modeDependency is not None:
             self._processModeDependency(event, modeDependency, ws.version)
         self.events.append(event)
+        self._childAdded('events', event)
         return event
 
 class VariableAccess(Element):
@@ -1688,12 +1685,14 @@ def createNvBlockDescriptor(parent, portAccess, **kwargs):
 
         descriptor.nvBlockDataMappings.append(nvBlockDataMapping)
         parent.nvBlockDescriptors.append(descriptor)
+        parent._childAdded('nvBlockDescriptors', descriptor)
     return descriptor
 
 class NvBlockRamBlock(autosar.element.DataElement):
     """
     <RAM-BLOCK>
     """
+    __slots__ = ()
     def __init__(self, name, typeRef, isQueued=False, swAddressMethodRef=None, swCalibrationAccess=None, swImplPolicy = None, category = None, parent=None, adminData=None):
         super().__init__(name, typeRef, isQueued, swAddressMethodRef, swCalibrationAccess, swImplPolicy, category, parent, adminData)
 
@@ -1712,6 +1711,7 @@ class NvBlockRomBlock(ParameterDataPrototype):
     """
     Represents <ROM-BLOCK>
     """
+    __slots__ = ()
 
     def __init__(self, name, typeRef, swAddressMethodRef=None, swCalibrationAccess=None, initValue = None, initValueRef = None, parent=None, adminData=None):
         super().__init__(name=name, parent=parent, typeRef=typeRef, swAddressMethodRef=swAddressMethodRef, swCalibrationAccess=swCalibrationAccess, initValue=initValue, initValueRef=initValueRef, adminData=adminData)
@@ -0,0 +1,145 @@
+"""
+On-disk cache of parsed ARXML files (see Workspace.enableParseCache) and in-memory cache of written XML (see Workspace.enableXMLCache)
+"""
+import hashlib
+import os
+import pickle
+import sys
+import autosar
+
+CACHE_FORMAT = 4 #increase when cached objects are no longer compatible with the classes of the library
+
+class ParseCache:
+    """
+    Stores the packages parsed from an ARXML file in a directory.
+    Entries are keyed by the content of the file, the library version and the configuration of the package parser.
+    """
+    def __init__(self, directory):
+        self.directory = os.path.abspath(directory)
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, data, packageParser, elementFilter=None):
+        """
+        Returns cache key for file content data when parsed using packageParser and elementFilter
+        """
+        hasher = hashlib.sha256()
+        hasher.update(data)
+        hasher.update(self._parserSignature(packageParser).encode('utf-8'))
+        hasher.update(repr(elementFilter).encode('utf-8'))
+        return hasher.hexdigest()
+
+    def load(self, key):
+        """
+        Returns cached payload for key or None if not found
+        """
+        try:
+            with open(self._path(key), 'rb') as fp:
+                payload = pickle.load(fp)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return payload
+
+    def store(self, key, payload):
+        """
+        Writes payload to the cache. The file is written under a temporary name first so readers never see partial entries
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        tmpPath = '%s.%d.tmp'%(path, os.getpid())
+        with open(tmpPath, 'wb') as fp:
+            pickle.dump(payload, fp, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmpPath, path)
+
+    def clear(self):
+        """
+        Removes all entries from the cache directory
+        """
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if name.endswith('.pickle'):
+                    os.remove(os.path.join(self.directory, name))
+
+    def _path(self, key):
+        return os.path.join(self.directory, key+'.pickle')
+
+    def _parserSignature(self, packageParser):
+        items = ['%d'%CACHE_FORMAT, autosar.__version__, '%d.%d'%sys.version_info[:2], str(packageParser.version)]
+        for tag in sorted(packageParser.switcher.keys()):
+            parserObject = packageParser.switcher[tag]
+            parserClass = type(parserObject)
+            items.append('%s=%s.%s:%s'%(tag, parserClass.__module__, parserClass.__qualname__, str(parserObject.version)))
+        return '\n'.join(items)
+
+class XMLCache:
+    """
+    Stores the XML written for package elements, so a workspace that is saved repeatedly only serializes the elements changed since the last save.
+    Changed elements are reported by markDirty, which discards their entries and the entries of the elements referring to them (their XML can
+    contain information taken from the referenced element). All entries are discarded when the token passed to validate changes.
+    dependencies(element) returns the package elements referenced by element.
+    """
+    def __init__(self, dependencies=None):
+        self.entries = {} #id(element) -> (element, indent, XML text, referenced package elements)
+        self.dependents = {} #id(package element) -> {id(element): element}, cached elements referring to the package element
+        self.dependencies = dependencies
+        self.token = None
+        self.hits = 0
+        self.misses = 0
+
+    def validate(self, token):
+        """
+        Called before each save. Clears the cache unless token equals the token of the previous call
+        """
+        if token != self.token:
+            self.clear()
+            self.token = token
+
+    def get(self, element, indent):
+        """
+        Returns the XML text stored for element written at indentation level indent, or None if not found
+        """
+        entry = self.entries.get(id(element))
+        if (entry is not None) and (entry[0] is element) and (entry[1] == indent):
+            self.hits += 1
+            return entry[2]
+        self.misses += 1
+        return None
+
+    def store(self, element, indent, text):
+        self.discard(element)
+        dependencies = ()
+        if self.dependencies is not None:
+            dependencies = tuple(x for x in self.dependencies(element) if x is not element)
+        self.entries[id(element)] = (element, indent, text, dependencies)
+        for dependency in dependencies:
+            self.dependents.setdefault(id(dependency), {})[id(element)] = element
+
+    def markDirty(self, element):
+        """
+        Discards the entries of package element and of the elements referring to it
+        """
+        self.discard(element)
+        dependents = self.dependents.pop(id(element), None)
+        if dependents is not None:
+            for dependent in list(dependents.values()):
+                self.discard(dependent)
+
+    def discard(self, element):
+        """
+        Discards the entry of element
+        """
+        entry = self.entries.get(id(element))
+        if (entry is not None) and (entry[0] is element):
+            del self.entries[id(element)]
+            for dependency in entry[3]:
+                dependents = self.dependents.get(id(dependency))
+                if dependents is not None:
+                    dependents.pop(id(element), None)
+                    if len(dependents) == 0:
+                        del self.dependents[id(dependency)]
+
+    def clear(self):
+        self.entries.clear()
+        self.dependents.clear()
@@ -19,21 +19,17 @@ class ComponentType(Element):
 
     def find(self,ref):
         ref=ref.partition('/')
-        for port in self.requirePorts:
-            if port.name == ref[0]:
-                return port
-        for port in self.providePorts:
-            if port.name == ref[0]:
-                return port
-        return None
+        return self._findChild(ref[0], 'requirePorts', 'providePorts')
 
     def append(self, elem):
         if isinstance(elem,autosar.port.RequirePort):
             self.requirePorts.append(elem)
             elem.parent=self
+            self._childAdded('requirePorts', elem)
         elif isinstance(elem,autosar.port.ProvidePort):
             self.providePorts.append(elem)
             elem.parent=self
+            self._childAdded('providePorts', elem)
         else:
             raise ValueError("unexpected type:" + str(type(elem)))
 
@@ -93,6 +89,7 @@ class ComponentType(Element):
             comspecList = self._autoCreateComSpecListFromArgs(ws, portInterface, kwargs)
         port = autosar.port.ProvidePort(name, portInterface.ref, comspecList, parent=self)
         self.providePorts.append(port)
+        self._childAdded('providePorts', port)
         return port
 
     def createRequirePort(self, name, portInterfaceRef, **kwargs):
@@ -138,6 +135,7 @@ class ComponentType(Element):
             comspecList = self._autoCreateComSpecListFromArgs(ws, portInterface, kwargs)
         port = autosar.port.RequirePort(name,portInterface.ref, comspecList, parent=self)
         self.requirePorts.append(port)
+        self._childAdded('requirePorts', port)
         return port
 
     def apply(self, template, **kwargs):
@@ -285,12 +283,9 @@ class AtomicSoftwareComponent(ComponentType):
     def find(self,ref):
         ws = self.rootWS()
         ref=ref.partition('/')
-        for port in self.requirePorts:
-            if port.name == ref[0]:
-                return port
-        for port in self.providePorts:
-            if port.name == ref[0]:
-                return port
+        port = self._findChild(ref[0], 'requirePorts', 'providePorts')
+        if port is not None:
+            return port
         if (ws is not None) and (ws.version >= 4.0) and (self.behavior is not None):
             if self.behavior.name == ref[0]:
                 if len(ref[2])>0:
@@ -351,12 +346,12 @@ class NvBlockComponent(AtomicSoftwareComponent):
 
     def find(self, ref):
         parts=ref.partition('/')
-        for elem in self.nvBlockDescriptors:
-            if elem.name == parts[0]:
-                if len(parts[2]) > 0:
-                    return elem.find(parts[2])
-                else:
-                    return elem
+        elem = self._findChild(parts[0], 'nvBlockDescriptors')
+        if elem is not None:
+            if len(parts[2]) > 0:
+                return elem.find(parts[2])
+            else:
+                return elem
         return super().find(ref)
 
 class CompositionComponent(ComponentType):
@@ -374,15 +369,9 @@ class CompositionComponent(ComponentType):
 
     def find(self, ref):
         parts=ref.partition('/')
-        for elem in self.components:
-            if elem.name == parts[0]:
-                return elem
-        for elem in self.assemblyConnectors:
-            if elem.name == parts[0]:
-                return elem
-        for elem in self.delegationConnectors:
-            if elem.name == parts[0]:
-                return elem
+        elem = self._findChild(parts[0], 'components', 'assemblyConnectors', 'delegationConnectors')
+        if elem is not None:
+            return elem
         return super().find(ref)
 
 
@@ -404,6 +393,7 @@ class CompositionComponent(ComponentType):
             name = component.name
         elem = ComponentPrototype(name, component.ref, self)
         self.components.append(elem)
+        self._childAdded('components', elem)
         return elem
 
     def createConnector(self, portRef1, portRef2):
@@ -451,6 +441,7 @@ class CompositionComponent(ComponentType):
         if self.find(connectorName) is not None:
             raise ValueError('connector "%s" already exists'%connectorName)
         self.assemblyConnectors.append(connector)
+        self._childAdded('assemblyConnectors', connector)
         return connector
 
     def _createDelegationConnectorInternal(self, innerComponent, innerPort, outerPort):
@@ -460,6 +451,7 @@ class CompositionComponent(ComponentType):
             connectorName = '_'.join([outerPort.name, innerComponent.name, innerPort.name])
         connector = DelegationConnector(connectorName, InnerPortInstanceRef(innerComponent.ref, innerPort.ref), OuterPortRef(outerPort.ref))
         self.delegationConnectors.append(connector)
+        self._childAdded('delegationConnectors', connector)
         return connector
 
     def _analyzePortRef(self, ws, portRef):
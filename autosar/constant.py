@@ -1,4 +1,5 @@
-from autosar.element import Element, LabelElement
+from autosar.element import Element, LabelElement, _valueChanged
+import array
 
 def initializer_string(constant):
     if constant is None:
@@ -17,16 +18,37 @@ def initializer_string(constant):
 
 
 class Value(Element):
+    __slots__ = ()
     def __init__(self, name, parent=None, adminData = None, category = None):
         super().__init__(name, parent, adminData, category)
 
 class ValueAR4(LabelElement):
     """Same as Value but uses label as main identifier instead of name"""
+    __slots__ = ()
     def __init__(self, label, parent=None, adminData = None, category = None):
         super().__init__(label, parent, adminData, category)
 
+def createNumberArray(values):
+    """
+    Returns values as array.array when all values are int (typecode 'q') or all values are float (typecode 'd').
+    Returns None when values is empty, has mixed or non-numeric items or when an int doesn't fit in 64 bits.
+    """
+    if len(values) == 0:
+        return None
+    itemType = type(values[0])
+    if (itemType is not int) and (itemType is not float):
+        return None
+    for value in values:
+        if type(value) is not itemType:
+            return None
+    try:
+        return array.array('q' if itemType is int else 'd', values)
+    except OverflowError:
+        return None
+
 #AUTOSAR 3 constant values
 class IntegerValue(Value):
+    __slots__ = ('typeRef', '_value')
 
     def tag(self,version=None): return "INTEGER-LITERAL"
 
@@ -41,13 +63,17 @@ class IntegerValue(Value):
 
     @value.setter
     def value(self,val):
+        isChange = hasattr(self, '_value') #False when called by the constructor
         if val is not None:
             self._value=int(val)
         else:
             self._value=None
+        if isChange:
+            _valueChanged(self)
 
 
 class StringValue(Value):
+    __slots__ = ('typeRef', '_value')
 
     def tag(self,version=None): return "STRING-LITERAL"
 
@@ -66,13 +92,17 @@ class StringValue(Value):
 
     @value.setter
     def value(self,val):
+        isChange = hasattr(self, '_value')
         if val is not None:
             self._value=str(val)
         else:
             self._value=None
+        if isChange:
+            _valueChanged(self)
 
 
 class BooleanValue(Value):
+    __slots__ = ('typeRef', '_value')
 
     def tag(self,version=None): return "BOOLEAN-LITERAL"
 
@@ -87,6 +117,7 @@ class BooleanValue(Value):
 
     @value.setter
     def value(self,val):
+        isChange = hasattr(self, '_value')
         if val is not None:
             if isinstance(val,str):
                 self._value = True if val=='true' else False
@@ -94,12 +125,15 @@ class BooleanValue(Value):
                 self._value=bool(val)
         else:
             self._value=None
+        if isChange:
+            _valueChanged(self)
 
 
 class RecordValue(Value):
     """
     typeRef is only necessary for AUTOSAR 3 constants
     """
+    __slots__ = ('typeRef', 'elements')
     def tag(self,version=None): return "RECORD-VALUE-SPECIFICATION" if version >= 4.0 else "RECORD-SPECIFICATION"
 
     def __init__(self, name, typeRef=None, elements=None, parent=None):
@@ -115,6 +149,7 @@ class ArrayValue(Value):
     """
     name and typeRef is only necessary for AUTOSAR 3 constants
     """
+    __slots__ = ('typeRef', 'elements')
     def tag(self,version=None): return "ARRAY-VALUE-SPECIFICATION" if version >= 4.0 else "ARRAY-SPECIFICATION"
 
     def __init__(self, name=None, typeRef=None, elements=None, parent=None):
@@ -128,6 +163,7 @@ class ArrayValue(Value):
 
 #AUTOSAR 4 constant values
 class TextValue(ValueAR4):
+    __slots__ = ('_value',)
     def tag(self, version=None): return "TEXT-VALUE-SPECIFICATION"
 
     def __init__(self, label, value=None, category = None, parent = None, adminData = None):
@@ -142,13 +178,17 @@ class TextValue(ValueAR4):
 
     @value.setter
     def value(self,val):
+        isChange = hasattr(self, '_value')
         if val is not None:
             self._value=str(val)
         else:
             self._value=None
+        if isChange:
+            _valueChanged(self)
 
 
 class NumericalValue(ValueAR4):
+    __slots__ = ('_value',)
 
     def tag(self, version=None): return "NUMERICAL-VALUE-SPECIFICATION"
 
@@ -164,10 +204,13 @@ class NumericalValue(ValueAR4):
 
     @value.setter
     def value(self,val):
+        isChange = hasattr(self, '_value')
         if val is not None:
             self._value = str(val)
         else:
             self._value = None
+        if isChange:
+            _valueChanged(self)
 
 
 class ApplicationValue(ValueAR4):
@@ -175,6 +218,7 @@ class ApplicationValue(ValueAR4):
     (AUTOSAR4)
     Implements <APPLICATION-VALUE-SPECIFICATION>
     """
+    __slots__ = ('swAxisCont', 'swValueCont')
     def tag(self, version=None): return "APPLICATION-VALUE-SPECIFICATION"
 
     def __init__(self, label = None, swValueCont = None, swAxisCont = None, category = None, parent = None, adminData = None):
@@ -191,6 +235,7 @@ class ConstantReference(ValueAR4):
     """
     Container class for <CONSTANT-REFERENCE> (AUTOSAR 4)
     """
+    __slots__ = ('value',)
 
     def tag(self, version): return 'CONSTANT-REFERENCE'
 
@@ -199,6 +244,7 @@ class ConstantReference(ValueAR4):
         self.value = value
 
 class RecordValueAR4(ValueAR4):
+    __slots__ = ('typeRef', 'elements')
     def tag(self,version=None): return "RECORD-VALUE-SPECIFICATION"
 
     def __init__(self, label, typeRef=None, elements=None, category = None, parent = None, adminData = None):
@@ -211,18 +257,43 @@ class RecordValueAR4(ValueAR4):
 
 
 class ArrayValueAR4(ValueAR4):
+    """
+    Implements <ARRAY-VALUE-SPECIFICATION> (AUTOSAR 4)
+    When all elements are NumericalValue without label, they can instead be stored compactly in numericalValues
+    (an array.array or a one-dimensional numpy.ndarray). The NumericalValue objects are then only created when elements is accessed.
+    """
+    __slots__ = ('typeRef', '_elements', 'numericalValues')
     def tag(self,version=None): return "ARRAY-VALUE-SPECIFICATION"
 
-    def __init__(self, label=None, typeRef=None, elements=None, category = None, parent = None, adminData = None):
+    def __init__(self, label=None, typeRef=None, elements=None, category = None, parent = None, adminData = None, numericalValues = None):
         super().__init__(label, parent, adminData, category)
         self.typeRef=typeRef
-        if elements is None:
+        if numericalValues is not None:
+            self._elements = None
+            self.numericalValues = numericalValues
+        elif elements is None:
             self.elements=[]
         else:
             self.elements = list(elements)
 
+    @property
+    def elements(self):
+        if self._elements is None:
+            self._elements = [NumericalValue(None, value, parent=self) for value in self.numericalValues.tolist()]
+            self.numericalValues = None
+        return self._elements
+
+    @elements.setter
+    def elements(self, elements):
+        isChange = hasattr(self, '_elements')
+        self._elements = elements
+        self.numericalValues = None
+        if isChange:
+            _valueChanged(self)
+
 #Common classes
 class Constant(Element):
+    __slots__ = ('value',)
 
     def tag(self, version): return 'CONSTANT-SPECIFICATION'
 
@@ -241,41 +312,61 @@ class SwValueCont:
     """
     (AUTOSAR4)
     Implements <SW-VALUE-CONT>
+    values is a list or a single value.
+    The constant parser stores homogeneous int or float values compactly in numericalValues (an array.array, a one-dimensional
+    numpy.ndarray can also be assigned). They are converted to a list the first time values is accessed.
     """
+    __slots__ = ('_values', 'numericalValues', 'unitRef', 'unitDisplayName', 'swArraySize', '__dict__')
 
     def tag(self, version = None): return 'SW-VALUE-CONT'
 
-    def __init__(self, values = None, unitRef = None, unitDisplayName = None, swArraySize = None):
-        if values is None:
-            self.values = None
-        else:
-            if isinstance(values, list):
-                self.values = list(values)
-            else:
-                self.values = values
+    def __init__(self, values = None, unitRef = None, unitDisplayName = None, swArraySize = None, numericalValues = None):
+        self._values = list(values) if isinstance(values, list) else values
+        self.numericalValues = numericalValues
         self.unitRef = unitRef
         self.unitDisplayName = unitDisplayName
         self.swArraySize = swArraySize
 
+    @property
+    def values(self):
+        if self.numericalValues is not None:
+            self._values = self.numericalValues.tolist()
+            self.numericalValues = None
+        return self._values
+
+    @values.setter
+    def values(self, values):
+        self._values = values
+        self.numericalValues = None
+
 
 class SwAxisCont:
     """
     (AUTOSAR4)
     Implements <SW-AXIS-CONT>
+    values is a list or a single value, see SwValueCont for numericalValues.
     """
+    __slots__ = ('unitRef', 'unitDisplayName', 'swAxisIndex', 'swArraySize', 'category', '_values', 'numericalValues', '__dict__')
 
     def tag(self, version = None): return 'SW-AXIS-CONT'
 
-    def __init__(self, values = None, unitRef = None, unitDisplayName = None, swAxisIndex = None, swArraySize = None, category = None):
+    def __init__(self, values = None, unitRef = None, unitDisplayName = None, swAxisIndex = None, swArraySize = None, category = None, numericalValues = None):
         self.unitRef = unitRef
         self.unitDisplayName = unitDisplayName
         self.swAxisIndex = swAxisIndex
         self.swArraySize = swArraySize
         self.category = category
-        if values is None:
-            self.values = None
-        else:
-            if isinstance(values, list):
-                self.values = list(values)
-            else:
-                self.values = values
+        self._values = list(values) if isinstance(values, list) else values
+        self.numericalValues = numericalValues
+
+    @property
+    def values(self):
+        if self.numericalValues is not None:
+            self._values = self.numericalValues.tolist()
+            self.numericalValues = None
+        return self._values
+
+    @values.setter
+    def values(self, values):
+        self._values = values
+        self.numericalValues = None
@@ -11,6 +11,7 @@ class RecordTypeElement(Element):
     Implemenetation of <RECORD-ELEMENT> (found inside <RECORD-TYPE>).
 
     """
+    __slots__ = ('typeRef',)
     def tag(self, version=None): return 'RECORD-ELEMENT'
 
     def __init__(self, name, typeRef, parent = None, adminData = None):
@@ -31,6 +32,7 @@ class CompuScaleElement:
     """
     Base class for <COMPU-SCALE>
     """
+    __slots__ = ('lowerLimit', 'upperLimit', 'lowerLimitType', 'upperLimitType', 'symbol', 'label', 'adminData', 'textValue', 'offset', 'numerator', 'denominator', 'mask', '__dict__')
     def tag(self, version=None): return 'COMPU-SCALE'
 
     def __init__(self, lowerLimit, upperLimit, lowerLimitType = 'CLOSED', upperLimitType = 'CLOSED', label=None, symbol=None, textValue = None, numerator = None, denominator = None, offset = None, mask = None, adminData=None):
@@ -493,6 +495,7 @@ class SwBaseType(Element):
         self.nativeDeclaration=nativeDeclaration
 
 class ImplementationDataTypeElement(Element):
+    __slots__ = ('arraySize', 'variantProps', 'arraySizeSemantics')
     def tag(self, version=None): return 'IMPLEMENTATION-DATA-TYPE-ELEMENT'
 
     def __init__(self, name, category=None, arraySize=None, arraySizeSemantics=None, variantProps=None, parent=None, adminData=None):
@@ -599,6 +602,7 @@ class ApplicationArrayElement(Element):
     sizeHandling: <ARRAY-SIZE-HANDLING> (None or str['ALL-INDICES-DIFFERENT-ARRAY-SIZE', 'ALL-INDICES-SAME-ARRAY-SIZE', 'INHERITED-FROM-ARRAY-ELEMENT-TYPE-SIZE', ])
     sizeSemantics: <ARRAY-SIZE-SEMANTICS> (None or str['FIXED-SIZE', 'VARIABLE-SIZE']])
     """
+    __slots__ = ('typeRef', 'arraySize', 'sizeHandling', 'sizeSemantics')
     def tag(self, version=None): return 'ELEMENT'
 
     def __init__(self, name = None, typeRef = None, arraySize = None, sizeHandling = None, sizeSemantics = 'FIXED-SIZE', category = 'VALUE', parent = None, adminData = None):
@@ -644,6 +648,7 @@ class ApplicationRecordElement(Element):
     """
     Implements <APPLICATION-RECORD-ELEMENT> (AUTOSAR4)
     """
+    __slots__ = ('typeRef',)
 
     def tag(self, version): return 'APPLICATION-RECORD-ELEMENT'
 
@@ -696,6 +701,7 @@ class DataTypeMappingSet(Element):
         return None
 
 class DataTypeMap:
+    __slots__ = ('applicationDataTypeRef', 'implementationDataTypeRef', '__dict__')
     def __init__(self, applicationDataTypeRef, implementationDataTypeRef):
         self.applicationDataTypeRef = applicationDataTypeRef
         self.implementationDataTypeRef = implementationDataTypeRef
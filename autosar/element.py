@@ -1,23 +1,126 @@
 import xml.etree.ElementTree as ElementTree
 import autosar.base
 
+class RefToken:
+    """
+    Validity of cached references (see Element.ref). References are cached together with the current token of the workspace
+    they are in, a rename or move of a package or element invalidates the token it holds and with it all references cached
+    in the same workspace. References cached in other workspaces are unaffected.
+    """
+    __slots__ = ('valid',)
+    def __init__(self):
+        self.valid = True
+
+def _invalidateRefs(obj):
+    """
+    Called when obj (element or package) is renamed or moved, discards the references cached with the token obj holds
+    """
+    token = getattr(obj, '_refToken', None)
+    if token is not None:
+        token.valid = False
+
+def _valueChanged(obj):
+    """
+    Called by property setters when an attribute of obj (element or value) was changed, tells the workspace containing obj (see Workspace.markDirty)
+    """
+    ws = obj.rootWS()
+    if ws is not None:
+        ws._elementChanged(obj)
+
+class ChildIndex:
+    """
+    Name-to-child dictionaries for the lists of child elements held by an element (e.g. the ports of a component).
+    A dictionary is built from its list by the first lookup and kept up to date by the methods adding children (see Element._childAdded)
+    and by renames. Replaced lists are indexed again, items removed from or replaced in a list directly are only seen once the list is replaced.
+    """
+    __slots__ = ('owner', 'entries')
+    def __init__(self, owner):
+        self.owner = owner
+        self.entries = {} #attribute name -> (list, {name: first child with name})
+
+    def find(self, name, *attributes):
+        """
+        Returns the first child with the given name in the lists named by attributes (searched in order) or None.
+        """
+        for attribute in attributes:
+            children = getattr(self.owner, attribute)
+            entry = self.entries.get(attribute)
+            if (entry is None) or (entry[0] is not children):
+                entry = self._index(attribute, children)
+            child = entry[1].get(name)
+            if child is not None:
+                return child
+        return None
+
+    def add(self, attribute, child):
+        """
+        Called after child was appended to the list named by attribute
+        """
+        entry = self.entries.get(attribute)
+        if entry is not None:
+            entry[1].setdefault(child.name, child)
+
+    def rename(self, child):
+        """
+        Called when child was renamed, the lists are indexed again by the next lookup
+        """
+        self.entries.clear()
+
+    def _index(self, attribute, children):
+        names = {}
+        for child in children:
+            names.setdefault(child.name, child)
+        entry = self.entries[attribute] = (children, names)
+        return entry
+
 class Element:
+    __slots__ = ('_name', 'adminData', '_parent', 'category', 'desc', 'descAttr', 'longName', 'longNameAttr', '_refCache', '_refToken', '__dict__')
     def __init__(self, name, parent = None, adminData = None, category = None):
+        self._refToken = None
         if isinstance(adminData, dict):
             adminDataObj=autosar.base.createAdminData(adminData)
         else:
             adminDataObj = adminData
         if (adminDataObj is not None) and not isinstance(adminDataObj, autosar.base.AdminData):
             raise ValueError("adminData must be of type dict or autosar.base.AdminData")
-        self.name=name
+        self._name=name
         self.adminData=adminDataObj
-        self.parent=parent
+        self._parent=parent
         self.category=category
 
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, name):
+        if name != getattr(self, '_name', name):
+            _invalidateRefs(self)
+            parent = getattr(self, '_parent', None)
+            index = getattr(parent, '_childIndex', None)
+            if (index is not None) and (index.owner is parent):
+                index.rename(self)
+        self._name = name
+
+    @property
+    def parent(self):
+        return self._parent
+
+    @parent.setter
+    def parent(self, parent):
+        if parent is not getattr(self, '_parent', None):
+            _invalidateRefs(self)
+        self._parent = parent
+
     @property
     def ref(self):
-        if self.parent is not None:
-            return self.parent.ref+'/%s'%self.name
+        token = self._refToken
+        if (token is not None) and token.valid:
+            return self._refCache
+        if self._parent is not None:
+            self._refCache = self._parent.ref+'/%s'%self._name
+            self._refToken = getattr(self._parent, '_refToken', None) #None when the parent can't cache its reference
+            return self._refCache
         else:
             return None
 
@@ -27,11 +130,33 @@ class Element:
         else:
             return self.parent.rootWS()
 
+    def _childAdded(self, attribute, child):
+        """
+        Called by the methods creating child in or appending it to the list named by attribute (e.g. createRequirePort),
+        tells the workspace containing this element about the change (see Workspace.referrers and Workspace.markDirty)
+        """
+        index = getattr(self, '_childIndex', None)
+        if (index is not None) and (index.owner is self):
+            index.add(attribute, child)
+        ws = self.rootWS()
+        if ws is not None:
+            ws._elementChanged(self)
+
+    def _findChild(self, name, *attributes):
+        """
+        Returns the first child element with the given name in the lists named by attributes (uses a ChildIndex)
+        """
+        index = getattr(self, '_childIndex', None)
+        if (index is None) or (index.owner is not self):
+            index = self._childIndex = ChildIndex(self)
+        return index.find(name, *attributes)
+
     def __deepcopy__(self,memo):
         raise NotImplementedError(type(self))
 
 class LabelElement:
     """Same as Element but uses label as main identifier instead of name"""
+    __slots__ = ('label', 'adminData', 'parent', 'category', 'desc', 'descAttr', 'longName', 'longNameAttr', '__dict__')
     def __init__(self, label, parent = None, adminData = None, category = None):
         if isinstance(adminData, dict):
             adminDataObj=autosar.base.createAdminData(adminData)
@@ -59,6 +184,7 @@ class LabelElement:
 
 
 class DataElement(Element):
+    __slots__ = ('typeRef', 'isQueued', 'swAddressMethodRef', 'swCalibrationAccess', '_swImplPolicy', 'dataConstraintRef')
     def tag(self,version): return "VARIABLE-DATA-PROTOTYPE" if version >= 4.0 else "DATA-ELEMENT-PROTOTYPE"
     def __init__(self, name, typeRef, isQueued=False, swAddressMethodRef=None, swCalibrationAccess=None, swImplPolicy = None, category = None, parent=None, adminData=None):
         super().__init__(name, parent, adminData, category)
@@ -82,6 +208,7 @@ class DataElement(Element):
 
     @swImplPolicy.setter
     def swImplPolicy(self, value):
+        isChange = hasattr(self, '_swImplPolicy') #False when called by the constructor
         if value is None:
             self._swImplPolicy=None
         else:
@@ -93,6 +220,8 @@ class DataElement(Element):
                     self.isQueued = True
             else:
                 raise ValueError('invalid swImplPolicy value: ' +  value)
+        if isChange:
+            _valueChanged(self)
 
     def setProps(self, props):
         if isinstance(props, autosar.base.SwDataDefPropsConditional):
@@ -109,6 +238,7 @@ class ParameterDataPrototype(Element):
     Or
     Represents <CALPRM-ELEMENT-PROTOTYPE> (AUTOSAR 3)
     """
+    __slots__ = ('typeRef', 'swAddressMethodRef', 'swCalibrationAccess', 'initValue')
 
     def __init__(self, name, typeRef, swAddressMethodRef=None, swCalibrationAccess=None, initValue = None, parent=None, adminData=None):
         super().__init__(name, parent, adminData)
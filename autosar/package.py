@@ -12,31 +12,227 @@ from fractions import Fraction
 import collections
 import decimal
 import sys
+import functools
+import itertools
 
 _supress_warnings = True
 
+class _UnparsedElements:
+    """
+    Keeps track of elements which have been found in XML but not yet parsed (see Workspace.loadXML with lazy=True)
+    """
+    def __init__(self, start):
+        self.xml = collections.OrderedDict() #element name -> (packageParser, xmlElement)
+        self.order = {} #element name -> position the element would have had if all elements were parsed immediately
+        self.start = start #number of elements in the package before the first unparsed element was added
+
+@functools.lru_cache(maxsize=256)
+def _compileGlob(pattern):
+    """
+    Returns compiled regular expression for a name pattern where '*' matches any number of characters and '?' matches one character.
+    Returns None if pattern has no wildcards.
+    """
+    if ('*' not in pattern) and ('?' not in pattern):
+        return None
+    return re.compile(_globToRegex(pattern, '.'))
+
+def _globToRegex(pattern, anyChar):
+    return ''.join(anyChar+'*' if c=='*' else anyChar if c=='?' else re.escape(c) for c in pattern)
+
+@functools.lru_cache(maxsize=256)
+def compileQuery(pattern):
+    """
+    Splits a query pattern (see Workspace.iterfind) into a tuple of segments, each segment is either '**', a name or a compiled glob
+    """
+    segments = []
+    for segment in _splitQuery(pattern):
+        glob = None if segment == '**' else _compileGlob(segment)
+        segments.append(segment if glob is None else glob)
+    return tuple(segments)
+
+def _splitQuery(pattern):
+    segments = []
+    for segment in pattern.strip('/').split('/'):
+        if segment == '**':
+            if (len(segments) == 0) or (segments[-1] != '**'):
+                segments.append(segment)
+        elif len(segment) > 0:
+            segments.append(segment)
+    return segments
+
+@functools.lru_cache(maxsize=256)
+def compileQueryRef(pattern):
+    """
+    Returns compiled regular expression matching the absolute references selected by a query pattern
+    """
+    segments = _splitQuery(pattern)
+    parts = []
+    for (i, segment) in enumerate(segments):
+        if segment == '**':
+            parts.append('(?:/[^/]+)+' if i == len(segments)-1 else '(?:/[^/]+)*')
+        else:
+            parts.append('/'+_globToRegex(segment, '[^/]'))
+    return re.compile(''.join(parts))
+
+def iterQuery(container, pattern, elementType=None):
+    """
+    Returns iterator over the packages and package elements below container (a Workspace or Package) which match pattern
+    """
+    segments = compileQuery(pattern)
+    items = _iterQuery(container, segments, elementType)
+    return _unique(items) if segments.count('**') > 1 else items
+
+def _iterQuery(container, segments, elementType):
+    if len(segments) == 0:
+        return
+    segment = segments[0]
+    rest = segments[1:]
+    if segment == '**':
+        if len(rest) == 0:
+            for item in _iterDescendants(container):
+                if (elementType is None) or isinstance(item, elementType):
+                    yield item
+        else:
+            yield from _iterQuery(container, rest, elementType)
+            for subPackage in (container.subPackages if isinstance(container, Package) else container.packages):
+                yield from _iterQuery(subPackage, segments, elementType)
+        return
+    if isinstance(segment, str):
+        item = container.find(segment)
+        items = () if item is None else (item,)
+    elif isinstance(container, Package):
+        items = (x for x in itertools.chain(container.elements, container.subPackages) if segment.fullmatch(x.name) is not None)
+    else:
+        items = (x for x in container.packages if segment.fullmatch(x.name) is not None)
+    for item in items:
+        if len(rest) == 0:
+            if (elementType is None) or isinstance(item, elementType):
+                yield item
+        elif isinstance(item, Package):
+            yield from _iterQuery(item, rest, elementType)
+
+def _iterDescendants(container):
+    if isinstance(container, Package):
+        yield from container.elements
+        subPackages = container.subPackages
+    else:
+        subPackages = container.packages
+    for subPackage in subPackages:
+        yield subPackage
+        yield from _iterDescendants(subPackage)
+
+def _unique(items):
+    found = set()
+    for item in items:
+        if id(item) not in found:
+            found.add(id(item))
+            yield item
+
 class Package(object):
     packageName = None
     def __init__(self, name, parent=None, role=None):
-        self.name = name
-        self.elements = []
+        self._refToken = None
+        self._name = name
+        self._elements = []
+        self._unparsed = None
         self.subPackages = []
-        self.parent=parent
+        self._parent=parent
         self.role=role
         self.map={'elements':{}, 'packages':{}}
         self.unhandledParser = set() #[PackageParser] unhandled
         self.unhandledWriter =set() #[PackageWriter] Unhandled
 
+    @property
+    def elements(self):
+        if self._unparsed is not None:
+            self._parseUnparsedElements()
+        return self._elements
+
+    @elements.setter
+    def elements(self, elements):
+        self._unparsed = None
+        self._elements = elements
+        ws = self.rootWS()
+        if ws is not None:
+            ws._invalidateIndexes()
+
     def __getitem__(self,key):
         if isinstance(key,str):
             return self.find(key)
         else:
             raise ValueError('expected string')
 
+    def addUnparsedElement(self, name, packageParser, xmlElement):
+        """
+        Registers an XML element which will be parsed by packageParser the first time it's accessed.
+        Returns False if an element with the same name already exists in the package.
+        """
+        if name in self.map['elements']:
+            return False
+        if self._unparsed is None:
+            self._unparsed = _UnparsedElements(len(self._elements))
+        elif name in self._unparsed.xml:
+            return False
+        self._unparsed.xml[name] = (packageParser, xmlElement)
+        self._unparsed.order[name] = len(self._unparsed.order)
+        return True
+
+    def _parseUnparsedElement(self, name):
+        (packageParser, xmlElement) = self._unparsed.xml.pop(name)
+        packageParser.loadElement(self, xmlElement, set())
+        return self.map['elements'].get(name)
+
+    def _parseUnparsedElementsByTag(self, tags):
+        """
+        Parses the unparsed elements whose XML tag is in tags, in this package and its sub-packages
+        """
+        if self._unparsed is not None:
+            for (name, (_, xmlElement)) in list(self._unparsed.xml.items()):
+                if (xmlElement.tag in tags) and (self._unparsed is not None) and (name in self._unparsed.xml):
+                    self._parseUnparsedElement(name)
+        for subPackage in self.subPackages:
+            subPackage._parseUnparsedElementsByTag(tags)
+
+    def _parseUnparsedElements(self):
+        """
+        Parses all remaining unparsed elements and restores the order elements would have had if they had been parsed immediately
+        """
+        unparsed = self._unparsed
+        while len(unparsed.xml) > 0:
+            self._parseUnparsedElement(next(iter(unparsed.xml)))
+        self._unparsed = None
+        last = len(unparsed.order)
+        self._elements[unparsed.start:] = sorted(self._elements[unparsed.start:], key=lambda x: unparsed.order.get(x.name, last))
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, name):
+        if name != self._name:
+            autosar.element._invalidateRefs(self)
+        self._name = name
+
+    @property
+    def parent(self):
+        return self._parent
+
+    @parent.setter
+    def parent(self, parent):
+        if parent is not getattr(self, '_parent', None):
+            autosar.element._invalidateRefs(self)
+        self._parent = parent
+
     @property
     def ref(self):
+        token = self._refToken
+        if (token is not None) and token.valid:
+            return self._refCache
         if self.parent is not None:
-            return self.parent.ref+'/%s'%self.name
+            self._refCache = self.parent.ref+'/%s'%self.name
+            self._refToken = getattr(self.parent, '_refToken', None)
+            return self._refCache
         else:
             return None
 
@@ -52,11 +248,16 @@ class Package(object):
                 return package
         if name in self.map['elements']:
             elem=self.map['elements'][name]
-            if len(ref[2])>0:
-                return elem.find(ref[2])
-            else:
-                return elem
-        return None
+        elif (self._unparsed is not None) and (name in self._unparsed.xml):
+            elem=self._parseUnparsedElement(name)
+            if elem is None:
+                return None
+        else:
+            return None
+        if len(ref[2])>0:
+            return elem.find(ref[2])
+        else:
+            return elem
 
     def findall(self,ref):
         """
@@ -70,15 +271,15 @@ class Package(object):
             result.extend(self.subPackages)
         else:
             result=[]
-            for item in (self.elements+self.subPackages):
+            for item in itertools.chain(self.elements, self.subPackages):
                 if item.name == ref[0] or ref[0]=='*':
                     if len(ref[2])>0:
                         result.extend(item.findall(ref[2]))
                     else:
                         result.append(item)
             if (len(result)==0) and ('*' in ref[0]):
-                p = re.compile(ref[0].replace('*','.*'))
-                for item in (self.elements+self.subPackages):
+                p = _compileGlob(ref[0])
+                for item in itertools.chain(self.elements, self.subPackages):
                     m = p.match(item.name)
                     if m is not None:
                         if len(ref[2])>0:
@@ -87,6 +288,12 @@ class Package(object):
                             result.append(item)
         return result
 
+    def iterfind(self, pattern, elementType=None):
+        """
+        Returns iterator over the packages and elements below this package matching pattern (see Workspace.iterfind)
+        """
+        return iterQuery(self, pattern, elementType)
+
     def dir(self,ref=None,_prefix=''):
         if ref==None:
             return [_prefix+x.name for x in self.subPackages]+[_prefix+x.name for x in self.elements]
@@ -109,6 +316,9 @@ class Package(object):
                 else:
                     del self.elements[i]
                     del self.map['elements'][ref[0]]
+                    ws = self.rootWS()
+                    if ws is not None:
+                        ws._removeFromIndexes(self, element)
                     break
 
     def createSenderReceiverInterface(self, name, dataElements=None, modeGroups=None, isService=False, serviceKind = None, adminData=None):
@@ -263,6 +473,10 @@ class Package(object):
 
     def append(self,elem):
         """appends elem to the self.elements list"""
+        if (self._unparsed is not None) and isinstance(elem,autosar.element.Element):
+            if elem.name in self._unparsed.xml:
+                self._parseUnparsedElement(elem.name)
+            self._unparsed.order.setdefault(elem.name, len(self._unparsed.order))
         isNewElement = True
         if elem.name in self.map['elements']:
             isNewElement = False
@@ -274,7 +488,7 @@ class Package(object):
                     raise ValueError('Error: element %s %s already exist in package %s using different definition'%(existingElem.name, str(type(existingElem)), self.name))
         if isNewElement:
             if isinstance(elem,autosar.element.Element):
-                self.elements.append(elem)
+                self._elements.append(elem)
                 elem.parent=self
                 self.map['elements'][elem.name]=elem
             elif isinstance(elem,Package):
@@ -283,6 +497,9 @@ class Package(object):
                 self.map['packages'][elem.name]=elem
             else:
                 raise ValueError('unexpected value type %s'%str(type(elem)))
+            ws = self.rootWS()
+            if ws is not None:
+                ws._updateIndexes(self, elem)
 
     def update(self,other):
         """copies/clones each element from other into self.elements"""
@@ -1133,7 +1350,7 @@ class Package(object):
         if ws.roles['Unit'] is None:
             unitPackage = self
         else:
-            unitPackage = ws.find(ws.roles['Unit'])
+            unitPackage = ws.findRolePackage('Unit')
         unitElem = self._checkAndCreateUnit(ws, shortName, displayName, scaling, offset, unitPackage)
         return unitElem
 
@@ -1176,7 +1393,7 @@ class Package(object):
         if ws.roles['CompuMethod'] is None:
             compuMethodPackage = self
         else:
-            compuMethodPackage = ws.find(ws.roles['CompuMethod'])
+            compuMethodPackage = ws.findRolePackage('CompuMethod')
 
         unitRef = None
         unitObj = self._checkAndCreateUnit(ws, unit)
@@ -1229,7 +1446,7 @@ class Package(object):
         if ws.roles['CompuMethod'] is None:
             compuMethodPackage = self
         else:
-            compuMethodPackage = ws.find(ws.roles['CompuMethod'])
+            compuMethodPackage = ws.findRolePackage('CompuMethod')
         unitRef = None
         unitObj = self._checkAndCreateUnit(ws, unit)
         if unitObj is not None:
@@ -1294,7 +1511,7 @@ class Package(object):
 
         compuMethodPackage = None
         if ws.roles['CompuMethod'] is not None:
-            compuMethodPackage=ws.find(ws.roles['CompuMethod'])
+            compuMethodPackage=ws.findRolePackage('CompuMethod')
         if compuMethodPackage is None:
             raise RuntimeError("No package found with role='CompuMethod'")
         compuMethodObj = compuMethodPackage.find(name)
@@ -1329,7 +1546,7 @@ class Package(object):
             return None
         dataConstraintPackage = None
         if ws.roles['DataConstraint'] is not None:
-            dataConstraintPackage = ws.find(ws.roles['DataConstraint'])
+            dataConstraintPackage = ws.findRolePackage('DataConstraint')
         if dataConstraintPackage is None:
             raise RuntimeError("No package found with role='DataConstraint'")
         dataConstraintObj = dataConstraintPackage.find(name)
@@ -1379,11 +1596,11 @@ class Package(object):
         unitElem = None
         assert(ws is not None)
         if ws.roles['CompuMethod'] is not None:
-            semanticsPackage=ws.find(ws.roles['CompuMethod'])
+            semanticsPackage=ws.findRolePackage('CompuMethod')
             if semanticsPackage is None:
                 raise RuntimeError("no package found with role='CompuMethod'")
         if ws.roles['Unit'] is not None:
-            unitPackage=ws.find(ws.roles['Unit'])
+            unitPackage=ws.findRolePackage('Unit')
             if unitPackage is None:
                 raise RuntimeError("no package found with role='Unit'")
 
@@ -1401,7 +1618,7 @@ class Package(object):
         if shortName is None:
             return None
         if unitPackage is None:
-            unitPackage = ws.find(ws.roles['Unit'])
+            unitPackage = ws.findRolePackage('Unit')
             if unitPackage is None:
                 raise RuntimeError("no package found with role='Unit'")
         assert(isinstance(unitPackage, autosar.package.Package))
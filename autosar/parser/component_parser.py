@@ -123,6 +123,7 @@ class ComponentTypeParser(ElementParser):
                     for descriptorXml in xmlElem.findall('./NV-BLOCK-DESCRIPTOR'):
                         descriptor = self.behavior_parser.parseNvBlockSWCnvBlockDescriptor(descriptorXml, componentType)
                         componentType.nvBlockDescriptors.append(descriptor)
+                        componentType._childAdded('nvBlockDescriptors', descriptor) #the list is indexed by find() calls while parsing descriptors
                 else:
                     print('Unhandled tag: '+xmlElem.tag, file=sys.stderr)
         return componentType
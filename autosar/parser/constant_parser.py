@@ -54,19 +54,19 @@ class ConstantParser(ElementParser):
         if xmlName is not None:
             name=xmlName.text
             if xmlValue.tag == 'INTEGER-LITERAL':
-                typeRef = xmlValue.find('./TYPE-TREF').text
+                typeRef = self.parseTextNode(xmlValue.find('./TYPE-TREF'))
                 innerValue = xmlValue.find('./VALUE').text
                 constantValue = autosar.constant.IntegerValue(name, typeRef, innerValue, parent)
             elif xmlValue.tag=='STRING-LITERAL':
-                typeRef = xmlValue.find('./TYPE-TREF').text
+                typeRef = self.parseTextNode(xmlValue.find('./TYPE-TREF'))
                 innerValue = xmlValue.find('./VALUE').text
                 constantValue = autosar.constant.StringValue(name, typeRef, innerValue, parent)
             elif xmlValue.tag=='BOOLEAN-LITERAL':
-                typeRef = xmlValue.find('./TYPE-TREF').text
+                typeRef = self.parseTextNode(xmlValue.find('./TYPE-TREF'))
                 innerValue = xmlValue.find('./VALUE').text
                 constantValue = autosar.constant.BooleanValue(name, typeRef, innerValue, parent)
             elif xmlValue.tag == 'RECORD-SPECIFICATION' or xmlValue.tag == 'ARRAY-SPECIFICATION':
-                typeRef = xmlValue.find('./TYPE-TREF').text
+                typeRef = self.parseTextNode(xmlValue.find('./TYPE-TREF'))
                 if xmlValue.tag == 'RECORD-SPECIFICATION':
                     constantValue=autosar.constant.RecordValue(name, typeRef, parent=parent)
                 else:
@@ -154,6 +154,9 @@ class ConstantParser(ElementParser):
                 raise NotImplementedError(xmlElem.tag)
 
         if (xmlElements is not None):
+            numericalValues = self._parseNumericalValueArray(xmlElements)
+            if numericalValues is not None:
+                return autosar.constant.ArrayValueAR4(label, parent=parent, numericalValues=numericalValues)
             array = autosar.constant.ArrayValueAR4(label, parent=parent)
             array.elements = self.parseValueV4(xmlElements, array)
             return array
@@ -161,6 +164,29 @@ class ConstantParser(ElementParser):
         else:
             raise RuntimeError("<ELEMENTS> must not be None")
 
+    def _parseNumericalValueArray(self, xmlElements):
+        """
+        Returns the values of xmlElements as array.array when all elements are <NUMERICAL-VALUE-SPECIFICATION> with only a <VALUE>.
+        Returns None if that's not the case or if the values would not be written back exactly as found in the XML.
+        """
+        texts = []
+        for xmlChild in xmlElements:
+            if (xmlChild.tag != 'NUMERICAL-VALUE-SPECIFICATION') or (len(xmlChild) != 1) or (xmlChild[0].tag != 'VALUE'):
+                return None
+            texts.append(xmlChild[0].text)
+        if len(texts) == 0:
+            return None
+        try:
+            values = [int(x) for x in texts]
+        except (TypeError, ValueError):
+            try:
+                values = [float(x) for x in texts]
+            except (TypeError, ValueError):
+                return None
+        if [str(x) for x in values] != texts:
+            return None
+        return autosar.constant.createNumberArray(values)
+
     def _parseConstantReference(self, xmlRoot, parent):
         label, constantRef = None, None
         self.push()
@@ -214,7 +240,10 @@ class ConstantParser(ElementParser):
             else:
                 raise NotImplementedError(xmlElem.tag)
         if len(valueList)==0:
-            valueList = None
+            return autosar.constant.SwValueCont(None, unitRef)
+        numericalValues = autosar.constant.createNumberArray(valueList)
+        if numericalValues is not None:
+            return autosar.constant.SwValueCont(None, unitRef, numericalValues=numericalValues)
         return autosar.constant.SwValueCont(valueList, unitRef)
 
     def _parseSwAxisCont(self, xmlRoot):
@@ -232,5 +261,8 @@ class ConstantParser(ElementParser):
             else:
                 raise NotImplementedError(xmlElem.tag)
         if len(valueList)==0:
-            valueList = None
+            return autosar.constant.SwAxisCont(None, unitRef)
+        numericalValues = autosar.constant.createNumberArray(valueList)
+        if numericalValues is not None:
+            return autosar.constant.SwAxisCont(None, unitRef, numericalValues=numericalValues)
         return autosar.constant.SwAxisCont(valueList, unitRef)
\ No newline at end of file
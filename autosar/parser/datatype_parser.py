@@ -67,7 +67,7 @@ class DataTypeParser(ElementParser):
         if self.version>=3.0:
             name=root.find("./SHORT-NAME").text
             length=int(root.find('ELEMENT/MAX-NUMBER-OF-ELEMENTS').text)
-            typeRef=root.find('ELEMENT/TYPE-TREF').text
+            typeRef=self.parseTextNode(root.find('ELEMENT/TYPE-TREF'))
             dataType=autosar.datatype.ArrayDataType(name,typeRef,length)
             self.parseDesc(root,dataType)
             return dataType;
@@ -2,14 +2,73 @@ import autosar.package
 import autosar.element
 import autosar.parser.parser_base
 import sys
+import time
+import collections
+import gc
+import json
 from autosar.base import parseTextNode
 
+class ParseProfile:
+    """
+    Parse statistics collected by PackageParser (see Workspace.enableParseProfile).
+    For each XML tag and each element parser class it records the number of parsed elements, the wall time in seconds
+    (including time spent in nested parsing) and the change in number of memory blocks allocated by the interpreter.
+    """
+    def __init__(self):
+        self.tags = {}
+        self.parsers = {}
+        self.files = []
+
+    def add(self, tag, parserName, elapsed, allocatedBlocks):
+        for (table, key) in ((self.tags, tag), (self.parsers, parserName)):
+            entry = table.get(key)
+            if entry is None:
+                entry = table[key] = {'count': 0, 'time': 0.0, 'allocatedBlocks': 0}
+            entry['count'] += 1
+            entry['time'] += elapsed
+            entry['allocatedBlocks'] += allocatedBlocks
+
+    def addFile(self, filename, elapsed):
+        self.files.append({'name': filename, 'time': elapsed})
+
+    def merge(self, other):
+        """
+        Adds statistics from another ParseProfile (e.g. collected in a worker process)
+        """
+        for (table, otherTable) in ((self.tags, other.tags), (self.parsers, other.parsers)):
+            for key, otherEntry in otherTable.items():
+                entry = table.setdefault(key, {'count': 0, 'time': 0.0, 'allocatedBlocks': 0})
+                for name in entry.keys():
+                    entry[name] += otherEntry[name]
+        self.files.extend(other.files)
+
+    def asdict(self):
+        """
+        Returns the statistics as a dictionary, tags and parsers are sorted by time (slowest first)
+        """
+        def sortedTable(table):
+            return collections.OrderedDict(sorted(((k, dict(v)) for k, v in table.items()), key=lambda x: -x[1]['time']))
+        return {'total': {'count': sum(x['count'] for x in self.tags.values()),
+                          'time': sum(x['time'] for x in self.parsers.values()),
+                          'allocatedBlocks': sum(x['allocatedBlocks'] for x in self.parsers.values())},
+                'tags': sortedTable(self.tags),
+                'parsers': sortedTable(self.parsers),
+                'files': list(self.files)}
+
+    def toJSON(self, indent=2):
+        return json.dumps(self.asdict(), indent=indent)
+
+    def saveJSON(self, filename):
+        with open(filename, 'w', encoding='utf-8') as fp:
+            fp.write(self.toJSON())
+
 class PackageParser:
     def __init__(self,version):
         assert(isinstance(version, float))
         self.version=version
         self.registeredParsers={}
         self.switcher={}
+        self.profile=None #ParseProfile, only used when profiling is enabled
 
     def registerElementParser(self, elementParser):
         """
@@ -22,38 +81,86 @@ class PackageParser:
                 self.switcher[tagname]=elementParser
             self.registeredParsers[name] = elementParser
 
-    def loadXML(self, package, xmlRoot):
+    def loadElement(self, package, xmlElement, elementNames):
+        """
+        Parses a single child element of <ELEMENTS> and appends the result to package.
+        elementNames is the set of element names already present in package (it's updated when a new element is added).
         """
-        Loads an XML package by repeatedly invoking its registered element parsers
+        element = self.parseElement(package, xmlElement)
+        if (element is not None) and (element.name not in elementNames):
+            #ignore duplicated items
+            package.append(element)
+            elementNames.add(element.name)
+
+    def parseElement(self, package, xmlElement):
+        """
+        Parses a single child element of <ELEMENTS> without adding it to package.
+        Returns None if there is no parser for the element or if the parser returned None.
+        """
+        parserObject = self.switcher.get(xmlElement.tag)
+        if parserObject is None:
+            package.unhandledParser.add(xmlElement.tag)
+            return None
+        if self.profile is None:
+            element = parserObject.parseElement(xmlElement,package)
+        else:
+            element = self._parseElementProfiled(parserObject, xmlElement, package)
+        if element is None:
+            print("[PackageParser] No return value: %s"%xmlElement.tag)
+            return None
+        element.parent=package
+        if not isinstance(element,autosar.element.Element):
+            #raise ValueError("parse error: %s"%type(element))
+            raise ValueError("parse error: %s"%xmlElement.tag)
+        return element
+
+    def _parseElementProfiled(self, parserObject, xmlElement, package):
+        #cyclic garbage collection is postponed while the element is parsed, otherwise memory released by it is counted as well
+        gcEnabled = gc.isenabled()
+        gc.disable()
+        try:
+            allocatedBlocks = sys.getallocatedblocks()
+            start = time.perf_counter()
+            element = parserObject.parseElement(xmlElement,package)
+            elapsed = time.perf_counter() - start
+            allocatedBlocks = sys.getallocatedblocks() - allocatedBlocks
+        finally:
+            if gcEnabled:
+                gc.enable()
+        self.profile.add(xmlElement.tag, type(parserObject).__name__, elapsed, allocatedBlocks)
+        return element
+
+    def loadXML(self, package, xmlRoot, lazy=False, elementFilter=None, packageRef=None):
+        """
+        Loads an XML package by repeatedly invoking its registered element parsers.
+        If lazy is True, elements are only registered in the package and will be parsed the first time they are accessed.
+        Elements rejected by elementFilter (an autosar.base.ElementFilter) are skipped without being parsed.
+        packageRef is the reference of package, only needed when package isn't yet attached to the workspace.
         """
         assert(self.switcher is not None)
-        if xmlRoot.find('ELEMENTS'):
-            elementNames = set([x.name for x in package.elements])
-            for xmlElement in xmlRoot.findall('./ELEMENTS/*'):
-                parserObject = self.switcher.get(xmlElement.tag)
-                if parserObject is not None:
-                    element = parserObject.parseElement(xmlElement,package)
-                    if element is None:
-                        print("[PackageParser] No return value: %s"%xmlElement.tag)
-                        continue
-                    element.parent=package
-                    if isinstance(element,autosar.element.Element):
-                        if element.name not in elementNames:
-                            #ignore duplicated items
-                            package.append(element)
-                            elementNames.add(element.name)
+        if (elementFilter is not None) and (packageRef is None):
+            packageRef = package.ref
+        if xmlRoot.find('ELEMENTS') is not None:
+            xmlElements = xmlRoot.findall('./ELEMENTS/*')
+            if elementFilter is not None:
+                xmlElements = [x for x in xmlElements if self._acceptElement(elementFilter, x, packageRef)]
+            if lazy:
+                for xmlElement in xmlElements:
+                    if xmlElement.tag in self.switcher:
+                        package.addUnparsedElement(parseTextNode(xmlElement.find('SHORT-NAME')), self, xmlElement)
                     else:
-                        #raise ValueError("parse error: %s"%type(element))
-                        raise ValueError("parse error: %s"%xmlElement.tag)
-                else:
-                    package.unhandledParser.add(xmlElement.tag)
+                        package.unhandledParser.add(xmlElement.tag)
+            else:
+                elementNames = set([x.name for x in package.elements])
+                for xmlElement in xmlElements:
+                    self.loadElement(package, xmlElement, elementNames)
 
         if self.version >= 3.0 and self.version < 4.0:
-            if xmlRoot.find('SUB-PACKAGES'):
+            if xmlRoot.find('SUB-PACKAGES') is not None:
                 for xmlPackage in xmlRoot.findall('./SUB-PACKAGES/AR-PACKAGE'):
                     name = xmlPackage.find("./SHORT-NAME").text
                     subPackage = autosar.package.Package(name)
-                    self.loadXML(subPackage,xmlPackage)
+                    self.loadXML(subPackage, xmlPackage, lazy, elementFilter, None if packageRef is None else packageRef+'/'+name)
                     package.append(subPackage)
         elif self.version >= 4.0:
             for subPackageXML in xmlRoot.findall('./AR-PACKAGES/AR-PACKAGE'):
@@ -62,4 +169,11 @@ class PackageParser:
                 if subPackage is None:
                     subPackage = autosar.package.Package(name)
                     package.append(subPackage)
-                self.loadXML(subPackage, subPackageXML)
+                self.loadXML(subPackage, subPackageXML, lazy, elementFilter)
+
+    def _acceptElement(self, elementFilter, xmlElement, packageRef):
+        if not elementFilter.acceptTag(xmlElement.tag):
+            return False
+        if elementFilter.needsRef:
+            return elementFilter.accept(xmlElement.tag, '%s/%s'%(packageRef, parseTextNode(xmlElement.find('SHORT-NAME'))))
+        return True
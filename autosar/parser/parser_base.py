@@ -1,4 +1,5 @@
 import abc
+import sys
 from collections import deque
 from autosar.base import (AdminData, SpecialDataGroup, SpecialData, SwDataDefPropsConditional, SwPointerTargetProps, SymbolProps)
 import autosar.element
@@ -130,7 +131,15 @@ class BaseParser:
         return (None, None)
 
     def parseTextNode(self, xmlElem):
-        return None if xmlElem is None else xmlElem.text
+        """
+        Returns text of xmlElem (or None). Text of reference elements (tags ending with REF) is interned,
+        equal references share one str object.
+        """
+        if xmlElem is None:
+            return None
+        if (xmlElem.text is not None) and xmlElem.tag.endswith('REF'):
+            return sys.intern(xmlElem.text)
+        return xmlElem.text
 
     def parseIntNode(self, xmlElem):
         return None if xmlElem is None else int(xmlElem.text)
@@ -163,11 +163,11 @@ class PortInterfacePackageParser(ElementParser):
             for xmlElem in xmlRoot.findall('./CALPRM-ELEMENTS/CALPRM-ELEMENT-PROTOTYPE'):
                 xmlElemName = xmlElem.find("./SHORT-NAME")
                 if xmlElemName is not None:
-                    typeRef=xmlElem.find("./TYPE-TREF").text
+                    typeRef=self.parseTextNode(xmlElem.find("./TYPE-TREF"))
                     parameter = autosar.element.ParameterDataPrototype(xmlElemName.text,typeRef,parent=portInterface)
                     if hasAdminData(xmlElem):
                         parameter.adminData=parseAdminDataNode(xmlElem.find('ADMIN-DATA'))
-                    if xmlElem.find('SW-DATA-DEF-PROPS'):
+                    if xmlElem.find('SW-DATA-DEF-PROPS') is not None:
                         for xmlItem in xmlElem.findall('SW-DATA-DEF-PROPS/SW-ADDR-METHOD-REF'):
                             parameter.swAddressMethodRef = self.parseTextNode(xmlItem)
                     portInterface.append(parameter)
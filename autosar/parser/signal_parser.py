@@ -34,9 +34,9 @@ class SignalParser(ElementParser):
             if elem.tag=='SHORT-NAME':
                 name=parseTextNode(elem)
             elif elem.tag=='DATA-TYPE-REF':
-                dataTypeRef=parseTextNode(elem)
+                dataTypeRef=self.parseTextNode(elem)
             elif elem.tag=='INIT-VALUE-REF':
-                initValueRef=parseTextNode(elem)
+                initValueRef=self.parseTextNode(elem)
             elif elem.tag=='LENGTH':
                 length=parseIntNode(elem)
             elif elem.tag=='DESC':
@@ -62,7 +62,7 @@ class SignalParser(ElementParser):
                 systemSignalRefs=[]
                 for childElem in elem.findall('./*'):
                     if childElem.tag=='SYSTEM-SIGNAL-REF':
-                        systemSignalRefs.append(parseTextNode(childElem))
+                        systemSignalRefs.append(self.parseTextNode(childElem))
                     else:
                         raise NotImplementedError(childElem.tag)
             else:
@@ -43,7 +43,7 @@ class SystemParser(ElementParser):
     def parseFibexElementRefs(self,xmlRoot,system):
         for xmlElem in xmlRoot.findall('./*'):
             if xmlElem.tag=='FIBEX-ELEMENT-REF':
-                system.fibexElementRefs.append(parseTextNode(xmlElem))
+                system.fibexElementRefs.append(self.parseTextNode(xmlElem))
             else:
                 raise NotImplementedError(xmlElem.tag)
 
@@ -116,7 +116,7 @@ class SystemParser(ElementParser):
             if xmlElem.tag=='DATA-ELEMENT-IREF':
                 dataElemIRef=self.parseDataElemInstanceRef(xmlElem)
             elif xmlElem.tag=='SIGNAL-REF':
-                signalRef=parseTextNode(xmlElem)
+                signalRef=self.parseTextNode(xmlElem)
             else:
                 raise NotImplementedError(xmlElem.tag)
         if (dataElemIRef is not None) and (signalRef is not None):
@@ -134,7 +134,7 @@ class SystemParser(ElementParser):
             if xmlElem.tag == 'DATA-ELEMENT-IREF': #minOccurs=0, maxOccurs=1
                 dataElemIRef=self.parseDataElemInstanceRef(xmlElem)
             elif xmlElem.tag == 'SIGNAL-GROUP-REF': #minOccurs=0, maxOccurs=
-                signalGroupRef=parseTextNode(xmlElem)
+                signalGroupRef=self.parseTextNode(xmlElem)
             elif xmlElem.tag == 'TYPE-MAPPING': #minOccurs=0, maxOccurs=1
                 for xmlChild in xmlElem.findall('./*'):
                     if xmlChild.tag=='SENDER-REC-ARRAY-TYPE-MAPPING':
@@ -152,18 +152,18 @@ class SystemParser(ElementParser):
         return SenderReceiverToSignalGroupMapping(dataElemIRef,signalGroupRef,typeMapping)
 
     def parseDataElemInstanceRef(self,xmlRoot):
-        dataElemRef=parseTextNode(xmlRoot.find('DATA-ELEMENT-REF'))
+        dataElemRef=self.parseTextNode(xmlRoot.find('DATA-ELEMENT-REF'))
         assert(dataElemRef is not None)
         dataElemIRef=SignalDataElementInstanceRef(dataElemRef)
         for xmlChild in xmlRoot.findall('./*'):
             if xmlChild.tag=='DATA-ELEMENT-REF':
                 pass
             elif xmlChild.tag=='SOFTWARE-COMPOSITION-REF':
-                dataElemIRef.softwareCompositionRef=parseTextNode(xmlChild)
+                dataElemIRef.softwareCompositionRef=self.parseTextNode(xmlChild)
             elif xmlChild.tag=='COMPONENT-PROTOTYPE-REF':
-                dataElemIRef.componentPrototypeRef.append(parseTextNode(xmlChild))
+                dataElemIRef.componentPrototypeRef.append(self.parseTextNode(xmlChild))
             elif xmlChild.tag=='PORT-PROTOTYPE-REF':
-                dataElemIRef.portPrototypeRef=parseTextNode(xmlChild)
+                dataElemIRef.portPrototypeRef=self.parseTextNode(xmlChild)
             else:
                 raise NotImplementedError(xmlChild.tag)
         return dataElemIRef
@@ -175,9 +175,9 @@ class SystemParser(ElementParser):
         signalRef=None
         for xmlElem in xmlRoot.findall('./*'):
             if xmlElem.tag=='RECORD-ELEMENT-REF': #minOccurs="0" maxOccurs="1"
-                recordElementRef=parseTextNode(xmlElem)
+                recordElementRef=self.parseTextNode(xmlElem)
             elif xmlElem.tag=='SIGNAL-REF': #minOccurs="0" maxOccurs="1"
-                signalRef=parseTextNode(xmlElem)
+                signalRef=self.parseTextNode(xmlElem)
             else:
                 raise NotImplementedError(xmlElem.tag)
         return SenderRecRecordElementMapping(recordElementRef,signalRef)
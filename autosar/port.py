@@ -13,6 +13,7 @@ import copy
 import collections
 
 class Port(Element):
+    __slots__ = ('portInterfaceRef', 'comspec')
     def __init__(self,name, portInterfaceRef, comspec=None, parent=None, adminData=None):
         super().__init__(name, parent, adminData)
         if portInterfaceRef is not None and not isinstance(portInterfaceRef,str):
@@ -224,6 +225,7 @@ class Port(Element):
         return None
 
 class RequirePort(Port):
+    __slots__ = ()
     def tag(self,version=None): return "R-PORT-PROTOTYPE"
     def __init__(self,name , portInterfaceRef=None, comspec=None, parent=None):
         if isinstance(name, str):
@@ -251,6 +253,7 @@ class RequirePort(Port):
 
 
 class ProvidePort(Port):
+    __slots__ = ()
     def tag(self,version=None): return "P-PORT-PROTOTYPE"
     def __init__(self,name,portInterfaceRef=None,comspec=None,parent=None):
         if isinstance(name,str):
@@ -278,11 +281,13 @@ class ProvidePort(Port):
 
 
 class OperationComSpec:
+    __slots__ = ('name', 'queueLength', '__dict__')
     def __init__(self,name=None,queueLength=1):
         self.name = name
         self.queueLength=queueLength
 
 class DataElementComSpec:
+    __slots__ = ('name', 'initValue', 'initValueRef', '_aliveTimeout', '_queueLength', 'canInvalidate', 'useEndToEndProtection', '__dict__')
     def __init__(self, name=None, initValue=None, initValueRef=None, aliveTimeout=None, queueLength=None, canInvalidate=None, useEndToEndProtection = None):
         self.name = name
         if initValue is not None:
@@ -333,6 +338,7 @@ class ModeSwitchComSpec:
     modeSwitchAckTimeout: Timeout (in milliseconds) for acknowledgement of the successful processing of the mode switch request (None or int).
     modeGroupRef: Full mode group reference (None or str). This has lower precendence to name (only used when name is None)
     """
+    __slots__ = ('name', 'enhancedMode', 'supportAsync', '_queueLength', '_modeSwitchAckTimeout', 'modeGroupRef', '__dict__')
     def __init__(self, name=None, enhancedMode=None, supportAsync=None, queueLength = None, modeSwitchAckTimeout = None, modeGroupRef = None):
         self.name = str(name) if name is not None else None
         self.enhancedMode = bool(enhancedMode) if enhancedMode is not None else None
@@ -373,6 +379,7 @@ class ModeSwitchComSpec:
             self._modeSwitchAckTimeout = int(val)
 
 class ParameterComSpec:
+    __slots__ = ('name', 'initValue', '__dict__')
     def __init__(self, name, initValue=None):
         self.name = name
         self.initValue = initValue
@@ -389,6 +396,7 @@ class NvProvideComSpec:
     romBlockInitValueRef: Rom block init value reference.
     variableRef: Full NvData reference (None or str). This has lower precendence to name (only used when name is None)
     """
+    __slots__ = ('name', 'ramBlockInitValue', 'ramBlockInitValueRef', 'romBlockInitValue', 'romBlockInitValueRef', 'variableRef', '__dict__')
     def __init__(self, name=None, ramBlockInitValue=None, ramBlockInitValueRef=None, romBlockInitValue=None, romBlockInitValueRef=None, variableRef=None):
         self.name = name
         self.ramBlockInitValue = ramBlockInitValue
@@ -410,6 +418,7 @@ class NvRequireComSpec:
     initValueRef: Ram block init value reference.
     variableRef: Full NvData reference (None or str). This has lower precendence to name (only used when name is None)
     """
+    __slots__ = ('name', 'initValue', 'initValueRef', 'variableRef', '__dict__')
     def __init__(self, name=None, initValue=None, initValueRef=None, variableRef=None):
         self.name = name
         self.initValue = initValue
@@ -49,14 +49,7 @@ class SenderReceiverInterface(PortInterface):
 
     def find(self,ref):
         ref = ref.partition('/')
-        name = ref[0]
-        for elem in self.dataElements:
-            if elem.name==name:
-                return elem
-        for elem in self.modeGroups:
-            if elem.name==name:
-                return elem
-        return None
+        return self._findChild(ref[0], 'dataElements', 'modeGroups')
 
     def append(self,elem):
         """
@@ -64,13 +57,17 @@ class SenderReceiverInterface(PortInterface):
         """
         if isinstance(elem, DataElement):
             self.dataElements.append(elem)
+            attribute = 'dataElements'
         elif isinstance(elem, ModeGroup):
             self.modeGroups.append(elem)
+            attribute = 'modeGroups'
         elif isinstance(elem, InvalidationPolicy):
             self.invalidationPolicies.append(invalidationPolicy)
+            attribute = 'invalidationPolicies'
         else:
             raise ValueError("expected elem variable to be of type DataElement")
         elem.parent=self
+        self._childAdded(attribute, elem)
 
 class ParameterInterface(PortInterface):
     def tag(self,version=None):
@@ -85,10 +82,7 @@ class ParameterInterface(PortInterface):
 
     def find(self,ref):
         ref = ref.partition('/')
-        name = ref[0]
-        for elem in self.parameters:
-            if elem.name==name:
-                return elem
+        return self._findChild(ref[0], 'parameters')
 
     def append(self,elem):
         """
@@ -98,6 +92,7 @@ class ParameterInterface(PortInterface):
             raise ValueError("Expected elem variable to be of type ParameterDataPrototype")
         self.parameters.append(elem)
         elem.parent=self
+        self._childAdded('parameters', elem)
 
 class ClientServerInterface(PortInterface):
     def __init__(self, name, isService=False, serviceKind = None, parent=None, adminData=None):
@@ -124,14 +119,7 @@ class ClientServerInterface(PortInterface):
 
     def find(self,ref):
         ref = ref.partition('/')
-        name = ref[0]
-        for elem in self.operations:
-            if elem.name==name:
-                return elem
-        for elem in self.applicationErrors:
-            if elem.name==name:
-                return elem
-        return None
+        return self._findChild(ref[0], 'operations', 'applicationErrors')
 
     def append(self,elem):
         """
@@ -139,11 +127,14 @@ class ClientServerInterface(PortInterface):
         """
         if isinstance(elem, Operation):
             self.operations.append(elem)
+            attribute = 'operations'
         elif isinstance(elem, ApplicationError):
             self.applicationErrors.append(elem)
+            attribute = 'applicationErrors'
         else:
             raise ValueError("invalid type: %s"%(str(type(elem))))
         elem.parent=self
+        self._childAdded(attribute, elem)
 
 class Operation(Element):
     def tag(self,version=None):
@@ -177,6 +168,7 @@ class Operation(Element):
             raise ValueError("invalid name or reference: "+typeRef)
         argument=Argument(name, dataType.ref, 'OUT', swCalibrationAccess, serverArgumentImplPolicy, parent=self)
         self.arguments.append(argument)
+        self._childAdded('arguments', argument)
         return argument
 
     def createInOutArgument(self, name, typeRef, swCalibrationAccess = None, serverArgumentImplPolicy=None):
@@ -187,6 +179,7 @@ class Operation(Element):
             raise ValueError("invalid name or reference: "+typeRef)
         argument=Argument(name, dataType.ref, 'INOUT', swCalibrationAccess, serverArgumentImplPolicy)
         self.arguments.append(argument)
+        self._childAdded('arguments', argument)
         return argument
 
     def createInArgument(self, name, typeRef, swCalibrationAccess = None, serverArgumentImplPolicy=None):
@@ -197,6 +190,7 @@ class Operation(Element):
             raise ValueError("invalid name or reference: "+typeRef)
         argument=Argument(name, dataType.ref, 'IN', swCalibrationAccess, serverArgumentImplPolicy)
         self.arguments.append(argument)
+        self._childAdded('arguments', argument)
         return argument
 
     def append(self, elem):
@@ -210,6 +204,7 @@ class Operation(Element):
         else:
             raise ValueError("invalid type: %s"%(str(type(elem))))
         elem.parent=self
+        self._childAdded('arguments', elem)
 
 
     @property
@@ -370,10 +365,7 @@ class NvDataInterface(PortInterface):
 
     def find(self,ref):
         ref = ref.partition('/')
-        name = ref[0]
-        for elem in self.nvDatas:
-            if elem.name==name:
-                return elem
+        return self._findChild(ref[0], 'nvDatas')
 
     def append(self,elem):
         """
@@ -383,3 +375,4 @@ class NvDataInterface(PortInterface):
             raise ValueError("expected elem variable to be of type DataElement")
         self.nvDatas.append(elem)
         elem.parent=self
+        self._childAdded('nvDatas', elem)
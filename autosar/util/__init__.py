@@ -1,13 +1,14 @@
 import autosar.util.dcf
 
-def importDcf(filename, external = True):
+def importDcf(filename, external = True, workers = None):
     """
-    Convenience method for importing a DCF file into a newly created workspace
+    Convenience method for importing a DCF file into a newly created workspace.
+    When workers is greater than 1, referenced ARXML files are parsed in parallel using up to workers processes
     """
     parser = autosar.util.dcf.DcfParser()
     dcf = parser.parse(filename)
     ws = autosar.workspace()
-    dcf.loadReferences(ws, external)
+    dcf.loadReferences(ws, external, workers)
     return ws
 
 def createDcf(ws):
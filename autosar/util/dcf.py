@@ -1,8 +1,9 @@
 import ntpath
 import os
 import sys
-import xml.etree.ElementTree as ElementTree
+import warnings
 import autosar
+import autosar.base
 
 dvg_xml = """<?xml version="1.0" encoding="utf-8"?>
 <DVG>
@@ -11,6 +12,9 @@ dvg_xml = """<?xml version="1.0" encoding="utf-8"?>
 	</Contents>
 </DVG>"""
 
+def _normalize_path(path):
+    return os.path.normcase(os.path.realpath(path))
+
 class XMLWriterSimple:
 
     def __init__(self):
@@ -158,6 +162,7 @@ class Dcf(XMLWriterSimple):
         self.file_ref = []
         self.external_file_ref = []
         self.ws = ws
+        self.path = None #path of the parsed DCF file (set by DcfParser)
 
         self.component_name = None
         if profile is not None:
@@ -176,9 +181,9 @@ class Dcf(XMLWriterSimple):
         dirname = ntpath.normpath(ntpath.join(basedir,ntpath.dirname(elem['path'])))
         elem['path']=ntpath.join(dirname,basename)
         if os.path.sep == '/': #are we running in cygwin/Linux?
-            elem['path'] = elem['path'].replace(r'\\','/')
+            elem['path'] = elem['path'].replace('\\','/')
 
-    def loadReferences(self, ws = None, external = True):
+    def loadReferences(self, ws = None, external = True, workers = None):
         """
         Loads ARXML from referenced files into an AUTOSAR workspace.
         Returns the workspace object.
@@ -186,24 +191,53 @@ class Dcf(XMLWriterSimple):
 
         * ws: Workspace object where ARXML will be loaded
         * external: If True it will recursively load externally referenced DCF files (DCF inside DCF)
+        * workers: Number of worker processes used for parsing (see Workspace.loadXMLFiles), None means files are parsed in this process
 
+        All referenced DCF files are read first. Each ARXML file is then only loaded once, even when it's referenced from several DCF files.
         """
-        parser = DcfParser()
         if ws is None:
             ws = autosar.workspace()
+        ws.loadXMLFiles(self.collectReferences(external), workers=1 if workers is None else workers)
+        return ws
+
+    def collectReferences(self, external = True):
+        """
+        Returns list of ARXML files referenced by this DCF, in the order they would be loaded.
+        If external is True, DCF files referenced by this DCF are recursively visited (depth-first).
+        Files referenced more than once are only listed the first time.
+        A DCF referencing itself (directly or indirectly) is reported with a RuntimeWarning and not visited again.
+        """
+        xml_paths = []
+        visited_xml = set()
+        visited_dcf = set()
+        self._collect_references(external, DcfParser(), xml_paths, visited_xml, visited_dcf, [])
+        return xml_paths
+
+    def _collect_references(self, external, parser, xml_paths, visited_xml, visited_dcf, dcf_stack):
+        if self.path is not None:
+            key = _normalize_path(self.path)
+            visited_dcf.add(key)
+            dcf_stack = dcf_stack + [key]
         for xml_path in [x['path'] for x in self.file_ref ]:
-            ws.loadXML(xml_path)
+            key = _normalize_path(xml_path)
+            if key not in visited_xml:
+                visited_xml.add(key)
+                xml_paths.append(xml_path)
         if external:
             for external_dcf in self.external_file_ref:
                 child_path = external_dcf['path']
                 if os.path.exists(child_path):
                     root, ext = os.path.splitext(child_path)
                     if ext == '.dcf':
-                        child_dcf = parser.parse(child_path)
-                        child_dcf.loadReferences(ws)
+                        key = _normalize_path(child_path)
+                        if key in dcf_stack:
+                            cycle = dcf_stack[dcf_stack.index(key):] + [key]
+                            warnings.warn("DCF reference cycle: " + " -> ".join(cycle), RuntimeWarning)
+                        elif key not in visited_dcf:
+                            child_dcf = parser.parse(child_path)
+                            child_dcf._collect_references(external, parser, xml_paths, visited_xml, visited_dcf, dcf_stack)
                 else:
                     print("No such file: "+child_path, file=sys.stderr)
-        return ws
 
     def save(self, dest_dir, dcf_name, file_map = None, comp_dir = None, force = False, single_file = None):
         """
@@ -243,6 +277,11 @@ class Dcf(XMLWriterSimple):
         raise NotImplementedError("single XML")
 
     def save_xml_from_file_map(self, dest_dir, xml_file_map, force):
+        """
+        Writes the ARXML files of xml_file_map in one pass over the workspace (see Workspace.saveXMLFiles).
+        All files that are written are open at the same time.
+        """
+        files = []
         for key in xml_file_map.keys():
             file_name = key
             if not file_name.lower().endswith('.arxml'):
@@ -250,7 +289,9 @@ class Dcf(XMLWriterSimple):
             dest_file = os.path.join(dest_dir, file_name)
             if force or not os.path.isfile(dest_file):
                 elem = xml_file_map[key]
-                self.ws.saveXML(dest_file, filters=elem['filters'])
+                files.append((dest_file, elem['filters']))
+        if len(files) > 0:
+            self.ws.saveXMLFiles(files)
 
     def create_default_file_map(self):
         dataTypesPackage = self.ws.findRolePackage('DataType')
@@ -329,17 +370,16 @@ class DcfParser:
         basedir = ntpath.dirname(filename)
         xml_root = self._open_xml(filename)
         dcf = self._process_xml(xml_root)
+        dcf.path = filename
         dcf.adjust_file_refs(basedir)
         return dcf
 
     def _open_xml(self, filename):
-        xmltree = ElementTree.ElementTree()
-        xmltree.parse(filename)
-        xmlroot = xmltree.getroot();
+        (xmlroot, namespace) = autosar.base.parseXMLFileWithoutNamespace(filename)
         return xmlroot
 
     def _process_xml(self,xmlroot):
-       dcf = Dcf()
+       dcf = Dcf(None)
        for elem in xmlroot.findall('./FILEREF'):
            node = elem.find('./ARXML')
            root_item = node.attrib['ROOTITEM'] if 'ROOTITEM' in node.attrib else None
@@ -1,12 +1,23 @@
 import autosar.package
 import autosar.parser.package_parser
 import autosar.writer
-from autosar.base import (parseXMLFile, getXMLNamespace, removeNamespace, parseAutosarVersionAndSchema, prepareFilter, parseVersionString)
+import autosar.cache
+from autosar.base import (parseXMLFileWithoutNamespace, iterparseXMLFile, parseAutosarVersionAndSchema, prepareFilter, parseVersionString, ElementFilter,
+                          xmlFingerprint, parseTextNode, applyFilter)
 import json
 import os
 import ntpath
 import collections
 import re
+import sys
+import io
+import contextlib
+import concurrent.futures
+import itertools
+import time
+import hashlib
+import pickle
+import multiprocessing
 #default parsers
 from autosar.parser.datatype_parser import (DataTypeParser, DataTypeSemanticsParser, DataTypeUnitsParser)
 from autosar.parser.portinterface_parser import (PortInterfacePackageParser,SoftwareAddressMethodParser)
@@ -29,8 +40,233 @@ from autosar.writer.mode_writer import XMLModeWriter
 _validWSRoles = ['DataType', 'Constant', 'PortInterface', 'ComponentType', 'ModeDclrGroup', 'CompuMethod', 'Unit',
                  'BaseType', 'DataConstraint']
 
+def _loadXMLFileWorker(filename, version, patch, schema, packageParser, parseCache=None, elementFilter=None):
+    """
+    Loads filename into a new workspace and returns its top-level packages (plus AUTOSAR version and console output) as a dictionary.
+    Used by Workspace.loadXMLFiles and by Workspace.loadXML when a parse cache is enabled.
+    """
+    if parseCache is not None:
+        with open(filename, 'rb') as fp:
+            key = parseCache.key(fp.read(), packageParser, elementFilter)
+        payload = parseCache.load(key)
+        if payload is not None:
+            return payload
+    ws = Workspace(version, patch, schema)
+    ws.packageParser = packageParser
+    output = io.StringIO()
+    profile = packageParser.profile
+    if profile is not None:
+        #collect statistics for this file only, they are merged into the profile of the calling workspace
+        packageParser.profile = autosar.parser.package_parser.ParseProfile()
+        start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(output):
+            ws.openXML(filename)
+            ws._loadPackage('*', None, False, elementFilter)
+    finally:
+        fileProfile = packageParser.profile
+        packageParser.profile = profile
+    for package in ws.packages:
+        package.parent = None
+    payload = {'header': (ws.major, ws.minor, ws.patch, ws.release, ws.schema),
+               'packages': ws.packages,
+               'output': output.getvalue()}
+    if parseCache is not None:
+        parseCache.store(key, payload)
+    if fileProfile is not None:
+        fileProfile.addFile(filename, time.perf_counter() - start)
+        payload['profile'] = fileProfile
+    return payload
+
+_xmlChunkSize = 1000 #number of package elements serialized by each task when saveXML/toXML use worker processes
+_xmlWriterState = None #(workspace, packageWriter) in worker processes started by saveXML/toXML
+
+class _WorkspacePickler(pickle.Pickler):
+    """
+    Pickles the packages of a workspace without the workspace object itself, references to it are stored as persistent ids
+    """
+    def __init__(self, fp, ws):
+        super().__init__(fp, pickle.HIGHEST_PROTOCOL)
+        self.ws = ws
+
+    def persistent_id(self, obj):
+        return 'ws' if obj is self.ws else None
+
+def _dumpWorkspaceSnapshot(ws):
+    """
+    Returns a copy of ws as bytes, used when worker processes aren't forked (the workspace itself isn't picklable)
+    """
+    fp = io.BytesIO()
+    pickle.dump((ws.version, ws.patch, ws.schema, ws.release), fp, pickle.HIGHEST_PROTOCOL)
+    _WorkspacePickler(fp, ws).dump((ws.roles, ws.profile, ws.packages))
+    return fp.getvalue()
+
+def _loadWorkspaceSnapshot(data):
+    fp = io.BytesIO(data)
+    ws = Workspace(*pickle.load(fp))
+    unpickler = pickle.Unpickler(fp)
+    unpickler.persistent_load = lambda pid: ws
+    (ws.roles, ws.profile, packages) = unpickler.load()
+    for package in packages:
+        ws._appendPackage(package)
+    return ws
+
+def _initXMLWriterWorker(ws, packageWriter):
+    """
+    Initializer of the worker processes used by saveXML/toXML. ws is either the workspace (inherited by forked processes)
+    or a snapshot created by _dumpWorkspaceSnapshot (other start methods).
+    """
+    global _xmlWriterState
+    if isinstance(ws, bytes):
+        ws = _loadWorkspaceSnapshot(ws)
+    _xmlWriterState = (ws, packageWriter)
+
+def _writeXMLElementsWorker(packageRef, start, stop, filters, ignore, indent):
+    """
+    Returns the XML of elements[start:stop] of package packageRef as one string (lines separated by newlines),
+    the names of the element classes without writer and the console output
+    """
+    (ws, packageWriter) = _xmlWriterState
+    package = ws.find(packageRef)
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        text = '\n'.join(packageWriter.iterElementsXML(package, package.elements[start:stop], filters, ignore, indent))
+    return (text, package.unhandledWriter, output.getvalue())
+
+def _createElementFilter(include, exclude):
+    if (include is None) and (exclude is None):
+        return None
+    return ElementFilter(include, exclude)
+
+class _FileSnapshot:
+    """
+    Fingerprints of an ARXML file loaded with trackChanges=True (see Workspace.reloadXML)
+    """
+    def __init__(self):
+        self.elements = {} #element reference -> fingerprint, only for elements created from this file
+        self.packages = {} #package reference -> digest of the package XML (elements and sub-packages)
+        self.createdPackages = set() #references of packages created from this file
+        self.elementFilter = None #ElementFilter used when the file was loaded
+
+_slotNames = {} #class -> names of the slots defined by the class and its base classes
+_linkingTags = frozenset(['INTERNAL-BEHAVIOR', 'SWC-INTERNAL-BEHAVIOR', 'SWC-IMPLEMENTATION']) #see Workspace._parseLinkingElements
+_skippedAttributes = frozenset(['parent', '_parent', 'ws', '_refCache', '_refToken', '_childIndex', '__dict__'])
+
+def _iterAttributes(obj):
+    cls = type(obj)
+    names = _slotNames.get(cls)
+    if names is None:
+        names = []
+        for base in cls.__mro__:
+            slots = base.__dict__.get('__slots__', ())
+            names.extend([slots] if isinstance(slots, str) else slots)
+        names = _slotNames[cls] = tuple(x for x in dict.fromkeys(names) if x not in _skippedAttributes)
+    for name in names:
+        value = getattr(obj, name, None)
+        if value is not None:
+            yield (name, value)
+    if hasattr(obj, '__dict__'):
+        for (name, value) in obj.__dict__.items():
+            if (value is not None) and (name not in _skippedAttributes):
+                yield (name, value)
+
+def _isChildObject(owner, value, visited):
+    if (id(value) in visited) or (not type(value).__module__.startswith('autosar.')):
+        return False
+    if isinstance(value, (autosar.package.Package, Workspace)):
+        return False
+    parent = getattr(value, 'parent', None)
+    return (parent is None) or (parent is owner) #elements with another parent are linked, not contained
+
+def _iterReferences(obj, visited=None):
+    """
+    Yields (owner, attributeName, ref) for each reference held by obj or by the objects it contains.
+    References are strings in attributes with names ending in 'Ref' and lists of strings in attributes ending in 'Ref' or 'Refs'.
+    """
+    if visited is None:
+        visited = set()
+    visited.add(id(obj))
+    for (name, value) in _iterAttributes(obj):
+        if isinstance(value, str):
+            if name.endswith('Ref'):
+                yield (obj, name, value)
+        elif isinstance(value, (list, tuple, dict)):
+            items = value.values() if isinstance(value, dict) else value
+            for item in items:
+                if isinstance(item, str):
+                    if name.endswith(('Ref', 'Refs')):
+                        yield (obj, name, item)
+                elif _isChildObject(obj, item, visited):
+                    yield from _iterReferences(item, visited)
+        elif _isChildObject(obj, value, visited):
+            yield from _iterReferences(value, visited)
+
+def _packageElement(item):
+    """
+    Returns the package element containing item (an element or an object inside it) or None
+    """
+    while (item is not None) and not isinstance(getattr(item, 'parent', None), autosar.package.Package):
+        item = getattr(item, 'parent', None)
+    return item
+
+#reference which couldn't be resolved by Workspace.validateReferences.
+#owner is the object holding the reference in its attribute, element is the package element containing owner.
+BrokenReference = collections.namedtuple('BrokenReference', ['ref', 'owner', 'attribute', 'element'])
+
+class _ReferrerIndex:
+    """
+    Reverse reference index used by Workspace.referrers
+    """
+    def __init__(self):
+        self.owners = {} #reference -> list of (owner, attribute name, package element containing the owner)
+        self.elements = {} #id of package element -> (package element, references found in it)
+        self.changed = {} #id of package element -> package element, elements with children created since they were added
+
+    def add(self, element):
+        refs = set()
+        for (owner, name, ref) in _iterReferences(element):
+            self.owners.setdefault(ref, []).append((owner, name, element))
+            refs.add(ref)
+        self.elements[id(element)] = (element, refs)
+
+    def addPackage(self, package, parseAll=False):
+        """
+        Adds all elements of package and its sub-packages. Unparsed elements (lazy loading) are only added if parseAll is True,
+        otherwise they are added when parsed.
+        """
+        for element in (package.elements if parseAll else package._elements):
+            self.add(element)
+        for subPackage in package.subPackages:
+            self.addPackage(subPackage, parseAll)
+
+    def remove(self, element):
+        entry = self.elements.pop(id(element), None)
+        if entry is not None:
+            for ref in entry[1]:
+                owners = [x for x in self.owners[ref] if x[2] is not element]
+                if len(owners) > 0:
+                    self.owners[ref] = owners
+                else:
+                    del self.owners[ref]
+
+    def markChanged(self, item):
+        """
+        Called when a child element was created in or added to item, the package element containing item is indexed again by update
+        """
+        item = _packageElement(item)
+        if item is not None:
+            self.changed[id(item)] = item
+
+    def update(self):
+        for element in self.changed.values():
+            if id(element) in self.elements: #other elements are added when appended to a package
+                self.remove(element)
+                self.add(element)
+        self.changed.clear()
+
 class PackageRoles(collections.UserDict):
     def __init__(self, data = None):
+        self.version = 0 #incremented on each change
         if data is None:
             data = {'DataType': None,
              'Constant': None,
@@ -42,6 +278,14 @@ class PackageRoles(collections.UserDict):
              'DataConstraint': None }
         super().__init__(data)
 
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.version += 1
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.version += 1
+
 class WorkspaceProfile:
     """
     A Workspace profile allows users to customize default settings and behaviors
@@ -81,6 +325,15 @@ class Workspace:
         self.profile = WorkspaceProfile()
         self.unhandledParser = set() # [PackageParser] unhandled:
         self.unhandledWriter =set() #[PackageWriter] Unhandled
+        self.parseCache = None
+        self.parseProfile = None
+        self.xmlCache = None
+        self._fileSnapshots = {} #filename -> _FileSnapshot
+        self._refIndex = None #absolute reference -> package or element, built by the first call to find
+        self._referrerIndex = None #_ReferrerIndex, built by the first call to referrers
+        self._typeIndex = None #class -> {id: package or element}, built by the first call to iterfind with elementType
+        self._rolePackages = {} #role -> (roles, roles.version, reference of role package, role package), see _updateRoleEntry
+        self._currentRefToken = autosar.element.RefToken()
         
     @property
     def version(self):
@@ -154,50 +407,416 @@ class Workspace:
         self.roles.update(roles)
 
     def openXML(self,filename):
-        xmlroot = parseXMLFile(filename)
-        namespace = getXMLNamespace(xmlroot)
+        (xmlroot, namespace) = parseXMLFileWithoutNamespace(filename)
 
         assert (namespace is not None)
-        (major, minor, patch, release, schema) = parseAutosarVersionAndSchema(xmlroot)
-        removeNamespace(xmlroot,namespace)
+        self._openXMLRoot(xmlroot)
+        self.xmlroot = xmlroot
+
+    def _openXMLRoot(self, xmlroot):
+        """
+        Reads AUTOSAR version and schema from the root <AUTOSAR> element and prepares the package parser
+        """
+        self._setVersionAndSchema(*parseAutosarVersionAndSchema(xmlroot))
+
+    def _openXMLRootFromFile(self, filename):
+        """
+        Reads the root <AUTOSAR> element of filename without parsing the rest of the file
+        """
+        xmlEvents = iterparseXMLFile(filename)
+        (_, xmlroot) = next(xmlEvents)
+        xmlEvents.close()
+        self._openXMLRoot(xmlroot)
+
+    def _setVersionAndSchema(self, major, minor, patch, release, schema):
         self.version=float('%s.%s'%(major,minor))
         self.major = major
         self.minor = minor
         self.patch = patch
         self.release = release
         self.schema = schema
-        self.xmlroot = xmlroot
         if self.version < 3.0:
             raise NotImplementedError("Version below 3.0 is not supported")
         if self.packageParser is None:
             self.packageParser = autosar.parser.package_parser.PackageParser(self.version)
+            self.packageParser.profile = self.parseProfile
         self._registerDefaultElementParsers(self.packageParser)
 
-    def loadXML(self, filename, roles=None):
+    def loadXML(self, filename, roles=None, streaming=False, lazy=False, include=None, exclude=None, trackChanges=False):
+        """
+        Opens filename and loads all packages found in it.
+        When streaming is True the file is read incrementally, releasing the XML of each element as soon as it has been parsed.
+        In streaming mode the file is not kept open, i.e. openXML/loadPackage/listPackages can't be used on it afterwards.
+        When lazy is True, packages are created immediately but elements are not parsed until they are accessed (behaviors and implementations
+        are parsed immediately to link them to their components). The XML tree of the file is kept in memory until all elements are parsed.
+        include and exclude are optional lists of XML tags and/or reference patterns (starting with '/') selecting which elements to load (see autosar.base.ElementFilter).
+        When trackChanges is True, fingerprints of the XML are kept so the file can later be reloaded using reloadXML.
+        """
         global _validWSRoles
+        elementFilter = _createElementFilter(include, exclude)
+        useCache = (self.parseCache is not None) and (not lazy) and (not trackChanges)
+        start = time.perf_counter()
+        if streaming:
+            if lazy:
+                raise ValueError('streaming and lazy can not be used at the same time')
+            if trackChanges:
+                raise ValueError('trackChanges can not be used in streaming mode')
+            self._loadXMLStreaming(filename, elementFilter)
+        elif useCache:
+            if self.packageParser is None:
+                self._openXMLRootFromFile(filename)
+            self._mergeXMLFiles([_loadXMLFileWorker(filename, self.version, self.patch, self.schema, self.packageParser, self.parseCache, elementFilter)])
+            self.xmlroot = None
+        else:
+            if trackChanges and lazy:
+                raise ValueError('trackChanges can not be used together with lazy')
+            self.openXML(filename)
+            if trackChanges:
+                (xmlPackages, digests) = self._fingerprintXMLPackages(self.xmlroot)
+                snapshot = _FileSnapshot()
+                snapshot.elementFilter = elementFilter
+                snapshot.packages = digests
+                snapshot.createdPackages = set([x[0] for x in xmlPackages if self.find(x[0]) is None])
+                newElements = [(ref+'/'+name, fingerprint) for (ref, _, _, elements) in xmlPackages for (name, fingerprint, _) in elements
+                               if self.find(ref+'/'+name) is None]
+            self._loadPackage('*', None, lazy, elementFilter)
+            if lazy:
+                self._parseLinkingElements()
+            if trackChanges:
+                snapshot.elements = dict([x for x in newElements if self.find(x[0]) is not None])
+                self._fileSnapshots[self._snapshotKey(filename)] = snapshot
+        if (self.parseProfile is not None) and (not useCache):
+            self.parseProfile.addFile(filename, time.perf_counter() - start)
+        if roles is not None:
+            if not isinstance(roles, collections.Mapping):
+                raise ValueError('roles parameter must be a dictionary or Mapping')
+            for ref,role in roles.items():
+                self.setRole(ref,role)
+
+    def reloadXML(self, filename):
+        """
+        Reloads a file previously loaded using loadXML with trackChanges=True.
+        Only elements whose XML has changed since the last (re)load are parsed again, they replace the previous elements at the same position.
+        Elements which are new to the file are appended and elements no longer found in the file are deleted.
+        All other packages and elements are kept as-is (same objects).
+        Returns a dictionary with the references of 'added', 'changed' and 'removed' elements.
+        """
+        key = self._snapshotKey(filename)
+        snapshot = self._fileSnapshots.get(key)
+        if snapshot is None:
+            raise ValueError('%s was not loaded with trackChanges=True'%filename)
         self.openXML(filename)
-        self.loadPackage('*')
+        (xmlPackages, digests) = self._fingerprintXMLPackages(self.xmlroot)
+        elementFilter = snapshot.elementFilter
+        newSnapshot = _FileSnapshot()
+        newSnapshot.elementFilter = elementFilter
+        newSnapshot.packages = digests
+        newSnapshot.createdPackages = set(snapshot.createdPackages)
+        result = {'added': [], 'changed': [], 'removed': []}
+        fileElementRefs = set()
+        unchangedRef = None #reference of unchanged package currently being skipped (including its sub-packages)
+        for (ref, parentRef, name, elements) in xmlPackages:
+            fileElementRefs.update([ref+'/'+x[0] for x in elements])
+            if (unchangedRef is not None) and ref.startswith(unchangedRef+'/'):
+                self._keepSnapshotElements(snapshot, newSnapshot, ref, elements)
+                continue
+            unchangedRef = None
+            if snapshot.packages.get(ref) == digests[ref]:
+                unchangedRef = ref
+                self._keepSnapshotElements(snapshot, newSnapshot, ref, elements)
+                continue
+            package = self.find(ref)
+            if package is None:
+                package = self._reloadCreatePackage(parentRef, name)
+                newSnapshot.createdPackages.add(ref)
+            for (elementName, fingerprint, xmlElement) in elements:
+                elementRef = ref+'/'+elementName
+                oldFingerprint = snapshot.elements.get(elementRef)
+                if oldFingerprint == fingerprint:
+                    newSnapshot.elements[elementRef] = fingerprint
+                    continue
+                if (elementFilter is not None) and (not elementFilter.accept(xmlElement.tag, elementRef)):
+                    continue
+                existing = package.find(elementName)
+                if (oldFingerprint is None) and (existing is not None):
+                    continue #element is owned by another file
+                element = self.packageParser.parseElement(package, xmlElement)
+                if element is None:
+                    continue
+                if existing is not None:
+                    package.elements[package.elements.index(existing)] = element
+                    package.map['elements'][elementName] = element
+                    self._invalidateIndexes()
+                    result['changed'].append(elementRef)
+                else:
+                    package.append(element)
+                    result['added'].append(elementRef)
+                newSnapshot.elements[elementRef] = fingerprint
+            self.unhandledParser = self.unhandledParser.union(package.unhandledParser)
+        for elementRef in snapshot.elements.keys():
+            if elementRef not in fileElementRefs:
+                (packageRef, _, elementName) = elementRef.rpartition('/')
+                package = self.find(packageRef)
+                if (package is not None) and (elementName in package.map['elements']):
+                    package.elements.remove(package.map['elements'][elementName])
+                    del package.map['elements'][elementName]
+                    self._invalidateIndexes()
+                    result['removed'].append(elementRef)
+        for ref in sorted(newSnapshot.createdPackages, key=lambda x: -x.count('/')):
+            if ref not in digests:
+                package = self.find(ref)
+                if (package is not None) and (len(package.elements) == 0) and (len(package.subPackages) == 0):
+                    if package.parent is self:
+                        self.delete(ref)
+                    else:
+                        package.parent.subPackages.remove(package)
+                        del package.parent.map['packages'][package.name]
+                        self._invalidateIndexes()
+                newSnapshot.createdPackages.discard(ref)
+        if len(result['added']) > 0 or len(result['changed']) > 0:
+            for package in self.packages:
+                self._linkPackage(package)
+        self._fileSnapshots[key] = newSnapshot
+        return result
+
+    def _snapshotKey(self, filename):
+        return os.path.normcase(os.path.abspath(filename))
+
+    def _keepSnapshotElements(self, snapshot, newSnapshot, ref, elements):
+        for (elementName, fingerprint, _) in elements:
+            elementRef = ref+'/'+elementName
+            if elementRef in snapshot.elements:
+                newSnapshot.elements[elementRef] = fingerprint
+
+    def _reloadCreatePackage(self, parentRef, name):
+        if len(parentRef) == 0:
+            return self.createPackage(name)
+        package = autosar.package.Package(name)
+        self.find(parentRef).append(package)
+        return package
+
+    def _fingerprintXMLPackages(self, xmlroot):
+        """
+        Returns a list of (ref, parentRef, name, elements) for each AR-PACKAGE in document order, where elements is a list of (name, fingerprint, xmlElement),
+        together with a dictionary containing a digest for each package (computed from the fingerprints of its elements and sub-packages).
+        """
+        xmlPackages = []
+        digests = {}
+        if self.version < 4.0:
+            path = './TOP-LEVEL-PACKAGES/AR-PACKAGE'
+        else:
+            path = './AR-PACKAGES/AR-PACKAGE'
+        for xmlPackage in xmlroot.findall(path):
+            self._fingerprintXMLPackage(xmlPackage, '', xmlPackages, digests)
+        return xmlPackages, digests
+
+    def _fingerprintXMLPackage(self, xmlPackage, parentRef, xmlPackages, digests):
+        name = parseTextNode(xmlPackage.find('SHORT-NAME'))
+        ref = parentRef+'/'+name
+        elements = []
+        xmlPackages.append((ref, parentRef, name, elements))
+        hasher = hashlib.sha1(name.encode('utf-8'))
+        for xmlElement in xmlPackage.findall('./ELEMENTS/*'):
+            fingerprint = xmlFingerprint(xmlElement)
+            elements.append((parseTextNode(xmlElement.find('SHORT-NAME')), fingerprint, xmlElement))
+            hasher.update(fingerprint)
+        subPackagePath = './SUB-PACKAGES/AR-PACKAGE' if self.version < 4.0 else './AR-PACKAGES/AR-PACKAGE'
+        for xmlSubPackage in xmlPackage.findall(subPackagePath):
+            hasher.update(self._fingerprintXMLPackage(xmlSubPackage, ref, xmlPackages, digests))
+        digest = hasher.digest()
+        digests[ref] = digest
+        return digest
+
+    def loadXMLFiles(self, filenames, roles=None, workers=None, include=None, exclude=None):
+        """
+        Loads all packages found in filenames, giving the same result as calling loadXML on each file in the given order.
+        The files are parsed in parallel using a pool of worker processes (defaults to one worker per CPU).
+        The parsed packages are merged into the workspace in the order of filenames.
+        include and exclude works the same way as in loadXML.
+        """
+        elementFilter = _createElementFilter(include, exclude)
+        filenames = list(filenames)
+        if len(filenames) == 0:
+            return
+        if self.packageParser is None:
+            self._openXMLRootFromFile(filenames[0])
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = min(int(workers), len(filenames))
+        args = [(filename, self.version, self.patch, self.schema, self.packageParser, self.parseCache, elementFilter) for filename in filenames]
+        if workers <= 1:
+            payloads = (_loadXMLFileWorker(*x) for x in args)
+            self._mergeXMLFiles(payloads)
+        else:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+                payloads = executor.map(_loadXMLFileWorker, *zip(*args))
+                self._mergeXMLFiles(payloads)
+        self.xmlroot = None
         if roles is not None:
             if not isinstance(roles, collections.Mapping):
                 raise ValueError('roles parameter must be a dictionary or Mapping')
             for ref,role in roles.items():
                 self.setRole(ref,role)
 
-    def loadPackage(self, packagename, role=None):
+    def _mergeXMLFiles(self, payloads):
+        for payload in payloads:
+            sys.stdout.write(payload['output'])
+            if (self.parseProfile is not None) and ('profile' in payload):
+                self.parseProfile.merge(payload['profile'])
+            self._setVersionAndSchema(*payload['header'])
+            for loadedPackage in payload['packages']:
+                name = loadedPackage.name
+                package = self.find(name)
+                if package is None:
+                    package = self._appendPackage(autosar.package.Package(name))
+                self._mergePackage(package, loadedPackage)
+                self.unhandledParser = self.unhandledParser.union(package.unhandledParser)
+
+    def _mergePackage(self, package, loadedPackage):
+        """
+        Merges package loaded by another workspace into package, following the same rules as PackageParser.loadXML
+        """
+        elementNames = set([x.name for x in package.elements])
+        for element in loadedPackage.elements:
+            element.parent = package
+            self._linkElement(element)
+            if element.name not in elementNames:
+                package.append(element)
+                elementNames.add(element.name)
+        package.unhandledParser = package.unhandledParser.union(loadedPackage.unhandledParser)
+        for loadedSubPackage in loadedPackage.subPackages:
+            if self.version >= 4.0:
+                subPackage = package.find(loadedSubPackage.name)
+                if subPackage is None:
+                    subPackage = autosar.package.Package(loadedSubPackage.name)
+                    package.append(subPackage)
+                self._mergePackage(subPackage, loadedSubPackage)
+            else:
+                self._linkPackage(loadedSubPackage)
+                package.append(loadedSubPackage)
+
+    def _linkPackage(self, package):
+        for element in package.elements:
+            self._linkElement(element)
+        for subPackage in package.subPackages:
+            self._linkPackage(subPackage)
+
+    def _linkElement(self, element):
+        """
+        Restores links from components to elements which the parsers create when the component is already in the workspace
+        """
+        if isinstance(element, autosar.behavior.InternalBehavior):
+            swc = self.find(element.componentRef)
+            if swc is not None:
+                swc.behavior = element
+        elif isinstance(element, autosar.component.SwcImplementation):
+            behavior = self.find(element.behaviorRef)
+            if behavior is not None:
+                swc = self.find(behavior.componentRef)
+                if swc is not None:
+                    swc.implementation = element
+
+    def enableParseCache(self, directory):
+        """
+        Enables on-disk cache of parsed ARXML files in directory.
+        When enabled, loadXML and loadXMLFiles store the packages parsed from each file and reuse them as long as
+        the file content, library version and registered element parsers are unchanged.
+        """
+        self.parseCache = autosar.cache.ParseCache(directory)
+        return self.parseCache
+
+    def disableParseCache(self):
+        self.parseCache = None
+
+    def enableXMLCache(self):
+        """
+        Enables in-memory cache of the XML written for each package element.
+        When enabled, saveXML and toXML only serialize elements changed since the previous call and reuse the XML of the others.
+        Changes made by create and append methods, Package.delete and property setters (e.g. NumericalValue.value) are tracked,
+        other changes (attribute assignments, lists edited in place) must be reported with markDirty.
+        """
+        if self.xmlCache is None:
+            self.xmlCache = autosar.cache.XMLCache(self._xmlDependencies)
+        return self.xmlCache
+
+    def disableXMLCache(self):
+        self.xmlCache = None
+
+    def markDirty(self, element):
+        """
+        Tells the XML cache that element (or an object inside it) was changed, e.g. by assigning an attribute or by editing a list in place.
+        The next save writes the package element containing it and the elements referring to that package element again.
+        """
+        if self.xmlCache is not None:
+            element = _packageElement(element)
+            if element is not None:
+                self.xmlCache.markDirty(element)
+
+    def _xmlDependencies(self, element):
+        """
+        Yields the package elements referenced (with absolute references) by element or by the objects inside it
+        """
+        for ref in set(x[2] for x in _iterReferences(element)):
+            if ref[:1] == '/':
+                item = self._findOrNone(ref)
+                while (item is not None) and not isinstance(item, autosar.package.Package):
+                    if isinstance(item.parent, autosar.package.Package):
+                        yield item
+                        break
+                    item = item.parent
+
+    def _xmlCacheToken(self):
+        """
+        Returns the settings the cached XML depends on besides the elements themselves
+        """
+        return (self.packageWriter, self.version, self.patch, self.roles, self.roles.version, self._refToken)
+
+    def enableParseProfile(self):
+        """
+        Starts collecting parse statistics (time, count and memory usage per XML tag and element parser).
+        The statistics are available in the parseProfile attribute (an autosar.parser.package_parser.ParseProfile).
+        """
+        self.parseProfile = autosar.parser.package_parser.ParseProfile()
+        if self.packageParser is not None:
+            self.packageParser.profile = self.parseProfile
+        return self.parseProfile
+
+    def disableParseProfile(self):
+        """
+        Stops collecting parse statistics and returns the statistics collected so far
+        """
+        profile = self.parseProfile
+        self.parseProfile = None
+        if self.packageParser is not None:
+            self.packageParser.profile = None
+        return profile
+
+    def loadPackage(self, packagename, role=None, lazy=False, include=None, exclude=None):
+        """
+        Loads package from the opened XML file.
+        If lazy is True, elements in the package are not parsed until they are accessed.
+        include and exclude works the same way as in loadXML.
+        """
+        result = self._loadPackage(packagename, role, lazy, _createElementFilter(include, exclude))
+        if lazy:
+            self._parseLinkingElements()
+        return result
+
+    def _loadPackage(self, packagename, role, lazy, elementFilter):
         found=False
         result=[]
         if self.xmlroot is None:
             raise ValueError("xmlroot is None, did you call loadXML() or openXML()?")
         if self.version >= 3.0 and self.version < 4.0:
-            if self.xmlroot.find('TOP-LEVEL-PACKAGES'):
+            if self.xmlroot.find('TOP-LEVEL-PACKAGES') is not None:
                 for xmlPackage in self.xmlroot.findall('./TOP-LEVEL-PACKAGES/AR-PACKAGE'):
-                    if self._loadPackageInternal(result, xmlPackage, packagename, role):
+                    if self._loadPackageInternal(result, xmlPackage, packagename, role, lazy, elementFilter):
                         found = True
 
         elif self.version>=4.0:
-            if self.xmlroot.find('AR-PACKAGES'):
+            if self.xmlroot.find('AR-PACKAGES') is not None:
                 for xmlPackage in self.xmlroot.findall('.AR-PACKAGES/AR-PACKAGE'):
-                    if self._loadPackageInternal(result, xmlPackage, packagename, role):
+                    if self._loadPackageInternal(result, xmlPackage, packagename, role, lazy, elementFilter):
                         found = True
 
         else:
@@ -209,40 +828,323 @@ class Workspace:
             print("[PackageParser] unhandled: %s" % (", ".join(self.unhandledParser)))
         return result
 
-    def _loadPackageInternal(self, result, xmlPackage, packagename, role):
+    def _parseLinkingElements(self):
+        """
+        Parses the lazily loaded elements which link themselves to their component when parsed (behaviors and implementations),
+        so the behavior and implementation attributes of components are set as after a regular load
+        """
+        for package in self.packages:
+            package._parseUnparsedElementsByTag(_linkingTags)
+
+    def _loadPackageInternal(self, result, xmlPackage, packagename, role, lazy=False, elementFilter=None):
         name = xmlPackage.find("./SHORT-NAME").text
         found = False
         if packagename=='*' or packagename==name:
             found=True
             package = self.find(name)
             if package is None:
-                package = autosar.package.Package(name, parent=self)
-                self.packages.append(package)
+                package = self._appendPackage(autosar.package.Package(name))
                 result.append(package)
-                self.map['packages'][name] = package
-            self.packageParser.loadXML(package,xmlPackage)
+            self.packageParser.loadXML(package,xmlPackage,lazy,elementFilter)
             self.unhandledParser = self.unhandledParser.union(package.unhandledParser)
             if (packagename==name) and (role is not None):
                 self.setRole(package.ref, role)
         return found
 
+    def _loadXMLStreaming(self, filename, elementFilter=None):
+        """
+        Incremental version of loadXML. Memory usage is proportional to the largest element in the file instead of the entire file.
+        """
+        self.xmlroot = None
+        nodes = [] #stack of open XML nodes
+        packages = [] #stack of (depth, package, elementNames) for each open AR-PACKAGE
+        elementDepth = None #depth of the element currently being read under <ELEMENTS>
+        for event, xmlNode in iterparseXMLFile(filename, elementFilter=elementFilter):
+            if event == 'start':
+                if len(nodes) == 0:
+                    assert (xmlNode.get('xmlns') is not None)
+                    self._openXMLRoot(xmlNode)
+                if (elementDepth is None) and (len(packages) > 0):
+                    if (len(nodes) == packages[-1][0]+2) and (nodes[-1].tag == 'ELEMENTS'):
+                        elementDepth = len(nodes)
+                nodes.append(xmlNode)
+            else:
+                depth = len(nodes)-1
+                if elementDepth is not None:
+                    if depth == elementDepth:
+                        (_, package, elementNames) = packages[-1]
+                        if (elementFilter is None) or (not elementFilter.needsRef) or \
+                                elementFilter.accept(xmlNode.tag, '%s/%s'%(package.ref, xmlNode.findtext('SHORT-NAME'))):
+                            self.packageParser.loadElement(package, xmlNode, elementNames)
+                        nodes[-2].remove(xmlNode)
+                        elementDepth = None
+                elif xmlNode.tag == 'SHORT-NAME' and nodes[-2].tag == 'AR-PACKAGE':
+                    name = xmlNode.text
+                    if len(packages) == 0:
+                        package = self.find(name)
+                        if package is None:
+                            package = self._appendPackage(autosar.package.Package(name))
+                    else:
+                        parentPackage = packages[-1][1]
+                        package = parentPackage.find(name) if self.version >= 4.0 else None
+                        if package is None:
+                            package = autosar.package.Package(name)
+                            parentPackage.append(package)
+                    packages.append((depth-1, package, set([x.name for x in package.elements])))
+                elif xmlNode.tag == 'AR-PACKAGE':
+                    if (len(packages) > 0) and (packages[-1][0] == depth):
+                        package = packages.pop()[1]
+                        if len(packages) == 0:
+                            self.unhandledParser = self.unhandledParser.union(package.unhandledParser)
+                    nodes[-2].remove(xmlNode)
+                nodes.pop()
+        if (self.unhandledParser):
+            print("[PackageParser] unhandled: %s" % (", ".join(self.unhandledParser)))
+
     def find(self, ref, role=None):
         global _validWSRoles
         if ref is None: return None
         if (role is not None) and ( ref[0] != '/'):
-            if role not in _validWSRoles:
-                raise ValueError("unknown role name: "+role)
-            if self.roles[role] is not None:
-                ref=self.roles[role]+'/'+ref #appends the role packet name in front of ref
+            entry = self._rolePackages.get(role) #raises ValueError for unknown roles when the entry is created
+            if (entry is None) or (entry[0] is not self.roles) or (entry[1] != self.roles.version):
+                entry = self._updateRoleEntry(role)
+            if entry[2] is not None:
+                ref=entry[2]+'/'+ref #appends the role packet name in front of ref
 
-        if ref[0]=='/': ref=ref[1:] #removes initial '/' if it exists
-        ref = ref.partition('/')
-        if ref[0] in self.map['packages']:
-            pkg = self.map['packages'][ref[0]]
-            if len(ref[2])>0:
-                return pkg.find(ref[2])
-            return pkg
-        return None
+        if ref[0]!='/': ref='/'+ref
+        if (ref[-1]=='/') and (len(ref) > 1): ref=ref[:-1] #a trailing '/' is ignored
+        index = self._refIndex if self._refIndex is not None else self._buildRefIndex()
+        item = index.get(ref)
+        if item is not None:
+            return item
+        #ref points inside an element or to an element which hasn't been parsed yet (lazy loading),
+        #find the closest indexed parent and let it resolve the rest
+        rest = ''
+        while True:
+            (ref, _, name) = ref.rpartition('/')
+            if len(ref) == 0:
+                return None
+            rest = name if len(rest)==0 else name+'/'+rest
+            item = index.get(ref)
+            if item is not None:
+                return item.find(rest)
+
+    def _buildRefIndex(self):
+        self._refIndex = {}
+        for package in self.packages:
+            self._indexPackage(package, '/'+package.name)
+        return self._refIndex
+
+    def _indexPackage(self, package, ref):
+        index = self._refIndex
+        index[ref] = package
+        for element in package._elements: #unparsed elements are indexed once they are parsed
+            index.setdefault(ref+'/'+element.name, element)
+        for subPackage in package.subPackages:
+            self._indexPackage(subPackage, ref+'/'+subPackage.name)
+
+    def _updateIndexes(self, package, item):
+        """
+        Called by Package.append when item (element or sub-package) has been added to package
+        """
+        isPackage = isinstance(item, autosar.package.Package)
+        if self._refIndex is not None:
+            ref = package.ref+'/'+item.name
+            if isPackage:
+                self._indexPackage(item, ref)
+            else:
+                self._refIndex.setdefault(ref, item)
+        if self._referrerIndex is not None:
+            if isPackage:
+                self._referrerIndex.addPackage(item)
+            else:
+                self._referrerIndex.add(item)
+        if self._typeIndex is not None:
+            self._addToTypeIndex(item)
+        if isPackage:
+            self._rolePackages.clear() #a role may refer to the new package (or a package inside it) which wasn't found before
+
+    def _elementChanged(self, item):
+        """
+        Called by Element._childAdded when a child element was created in or appended to item and by property setters of item
+        """
+        if self._referrerIndex is not None:
+            self._referrerIndex.markChanged(item)
+        if self.xmlCache is not None:
+            self.markDirty(item)
+
+    def _removeFromIndexes(self, package, element):
+        """
+        Called by Package.delete when element has been removed from package
+        """
+        if self._refIndex is not None:
+            ref = package.ref+'/'+element.name
+            if self._refIndex.get(ref) is element:
+                del self._refIndex[ref]
+        if self._referrerIndex is not None:
+            self._referrerIndex.remove(element)
+        if self._typeIndex is not None:
+            self._typeIndex.get(type(element), {}).pop(id(element), None)
+        if self.xmlCache is not None:
+            self.xmlCache.markDirty(element) #also discards the XML of elements referring to element
+
+    def _invalidateIndexes(self):
+        """
+        Discards the reference and type indexes, they are rebuilt when needed
+        """
+        self._refIndex = None
+        self._referrerIndex = None
+        self._typeIndex = None
+        self._rolePackages.clear()
+        if self.xmlCache is not None:
+            self.xmlCache.clear()
+
+    def _updateRoleEntry(self, role):
+        """
+        Resolves the package currently assigned to role and stores it in self._rolePackages as (roles, roles.version, package reference, package).
+        The entry is valid as long as self.roles isn't replaced or changed (by setRole, popRoles or direct assignment) and no package is added.
+        """
+        if role not in _validWSRoles:
+            raise ValueError("unknown role name: "+role)
+        ref = self.roles.get(role)
+        package = None if ref is None else self.find(ref)
+        entry = self._rolePackages[role] = (self.roles, self.roles.version, ref, package)
+        return entry
+
+    def _addToTypeIndex(self, item):
+        """
+        Adds item (package or element) to the type index, packages are added with all their elements and sub-packages
+        """
+        self._typeIndex.setdefault(type(item), {})[id(item)] = item
+        if isinstance(item, autosar.package.Package):
+            for element in item.elements: #the element type is only known once parsed
+                self._typeIndex.setdefault(type(element), {})[id(element)] = element
+            for subPackage in item.subPackages:
+                self._addToTypeIndex(subPackage)
+
+    def _appendPackage(self, package):
+        package.parent = self
+        self.packages.append(package)
+        self.map['packages'][package.name] = package
+        if self._refIndex is not None:
+            self._indexPackage(package, '/'+package.name)
+        if self._referrerIndex is not None:
+            self._referrerIndex.addPackage(package)
+        if self._typeIndex is not None:
+            self._addToTypeIndex(package)
+        self._rolePackages.clear()
+        return package
+
+    def iterfind(self, pattern, elementType=None):
+        """
+        Returns iterator over the packages and package elements with references matching pattern.
+        In pattern, '*' matches any part of a name, '?' matches a single character and a '**' segment matches any number of
+        packages (e.g. '/**/*_I' matches all elements ending with '_I' in all packages).
+        If elementType is given, only instances of elementType (a class or tuple of classes) are returned. They are found through
+        an index of packages and elements by type, which is built by the first such call, and sorted in document order.
+        """
+        if elementType is None:
+            return autosar.package.iterQuery(self, pattern)
+        if self._typeIndex is None:
+            self._typeIndex = {}
+            for package in self.packages:
+                self._addToTypeIndex(package)
+        candidates = [items for (cls, items) in self._typeIndex.items() if issubclass(cls, elementType)]
+        if pattern.strip('/') == '**':
+            result = [item for items in candidates for item in items.values()]
+        else:
+            refRegex = autosar.package.compileQueryRef(pattern)
+            result = [item for items in candidates for item in items.values() if refRegex.fullmatch(item.ref) is not None]
+        return iter(self._sortInDocumentOrder(result))
+
+    def _sortInDocumentOrder(self, items):
+        """
+        Sorts items (packages and package elements) in the order they are written: the elements of a package come before its
+        sub-packages and each package comes before its content.
+        """
+        positions = {} #id of workspace or package -> {id of child: position of child}
+        def getPath(item):
+            path = []
+            while item is not self:
+                parent = item.parent
+                childPositions = positions.get(id(parent))
+                if childPositions is None:
+                    children = parent.packages if parent is self else itertools.chain(parent.elements, parent.subPackages)
+                    childPositions = positions[id(parent)] = {id(x): i for (i, x) in enumerate(children)}
+                path.append(childPositions.get(id(item), -1))
+                item = parent
+            path.reverse()
+            return path
+        return sorted(items, key=getPath)
+
+    def referrers(self, ref):
+        """
+        Returns list of objects holding a reference to ref (reference string or element), e.g. the data elements,
+        constants and ports using a data type.
+        The index behind this method is built by the first call and kept up to date when elements are added to or removed
+        from packages and when child elements are created in elements of the workspace (e.g. by createRequirePort).
+        Call updateReferrers after assigning references of objects which are already in the workspace.
+        """
+        if not isinstance(ref, str):
+            ref = ref.ref
+        if self._referrerIndex is None:
+            referrerIndex = _ReferrerIndex()
+            for package in self.packages:
+                referrerIndex.addPackage(package, parseAll=True)
+            self._referrerIndex = referrerIndex
+        else:
+            self._referrerIndex.update()
+        result = []
+        found = set()
+        for (owner, name, _) in self._referrerIndex.owners.get(ref, ()):
+            if id(owner) not in found:
+                value = getattr(owner, name, None)
+                if (value == ref) or (isinstance(value, (list, tuple)) and (ref in value)):
+                    result.append(owner)
+                    found.add(id(owner))
+        return result
+
+    def validateReferences(self):
+        """
+        Resolves all references held by objects in the workspace (see referrers for what counts as a reference).
+        Returns list of BrokenReference, one for each reference attribute that doesn't resolve. Relative references (not starting with '/') are not checked.
+        """
+        resolved = {} #ref -> True when ref was found
+        result = []
+        packages = list(self.packages)
+        while len(packages) > 0:
+            package = packages.pop(0)
+            for element in package.elements:
+                for (owner, name, ref) in _iterReferences(element):
+                    isResolved = resolved.get(ref)
+                    if isResolved is None:
+                        isResolved = resolved[ref] = (ref[:1] != '/') or (self._findOrNone(ref) is not None)
+                    if not isResolved:
+                        result.append(BrokenReference(ref, owner, name, element))
+            packages[0:0] = package.subPackages
+        return result
+
+    def _findOrNone(self, ref):
+        try:
+            return self.find(ref)
+        except AttributeError: #ref continues below an element which has no children
+            return None
+
+    def updateReferrers(self, element=None):
+        """
+        Updates the index used by referrers after references held by element, or by objects inside it, have been changed.
+        Without element, the index is discarded and rebuilt by the next call to referrers.
+        """
+        if self._referrerIndex is None:
+            return
+        if element is None:
+            self._referrerIndex = None
+            return
+        while (element is not None) and not isinstance(element.parent, autosar.package.Package):
+            element = element.parent
+        if element is not None:
+            self._referrerIndex.remove(element)
+            self._referrerIndex.add(element)
 
     def findall(self,ref):
         """
@@ -268,6 +1170,14 @@ class Workspace:
         Returns package with role set to roleName or None
         """
         if roleName is None: return None
+        if roleName in _validWSRoles: #other roles can only be set on the packages themselves
+            entry = self._rolePackages.get(roleName)
+            if (entry is None) or (entry[0] is not self.roles) or (entry[1] != self.roles.version) or \
+                    ((entry[3] is not None) and (entry[3].ref != entry[2])): #role package was moved or renamed
+                entry = self._updateRoleEntry(roleName)
+            if isinstance(entry[3], autosar.package.Package):
+                return entry[3]
+        #role only set on the package itself, e.g. Package(name, role=roleName)
         for pkg in self.packages:
             if pkg.role == roleName:
                 return pkg
@@ -279,9 +1189,7 @@ class Workspace:
 
     def createPackage(self,name,role=None):
         if name not in self.map['packages']:
-            package = autosar.package.Package(name,self)
-            self.packages.append(package)
-            self.map['packages'][name] = package
+            package = self._appendPackage(autosar.package.Package(name))
             if role is not None:
                 self.setRole(package.ref, role)
             return package
@@ -307,38 +1215,144 @@ class Workspace:
     def rootWS(self):
         return self
 
-    def saveXML(self, filename, filters=None, ignore=None):
-        if self.packageWriter is None:
-            self.packageWriter = autosar.writer.package_writer.PackageWriter(self.version, self.patch)
-            if self.useDefaultWriters:
-                self._registerDefaultElementWriters(self.packageWriter)
-        workspaceWriter=autosar.writer.WorkspaceWriter(self.version, self.patch, self.schema, self.packageWriter)
-        with open(filename, 'w', encoding="utf-8") as fp:
-            if isinstance(filters,str): filters=[filters]
-            if isinstance(ignore,str): filters=[ignore]
-            if filters is not None:
-                filters = [prepareFilter(x) for x in filters]
-            workspaceWriter.saveXML(self, fp, filters, ignore)
+    @property
+    def _refToken(self):
+        """
+        RefToken stored with the references of packages and elements cached in this workspace, replaced once invalidated
+        """
+        if not self._currentRefToken.valid:
+            self._currentRefToken = autosar.element.RefToken()
+        return self._currentRefToken
+
+    def saveXML(self, filename, filters=None, ignore=None, workers=None, startMethod=None):
+        """
+        Writes the workspace as XML to filename. filename can also be a file-like object opened in text mode.
+        The XML is written while it's being generated, the complete document is never held in memory.
+        When workers is greater than 1, package elements are serialized in parallel by that many worker processes.
+        startMethod is the multiprocessing start method of the worker processes ('fork', 'spawn' or 'forkserver'), None uses the default one.
+        """
+        workspaceWriter = self._createWorkspaceWriter()
+        if isinstance(filters,str): filters=[filters]
+        if isinstance(ignore,str): ignore=[ignore]
+        if filters is not None:
+            filters = [prepareFilter(x) for x in filters]
+        with self._parallelXMLWriter(workers, filters, ignore, startMethod) as renderElements:
+            if hasattr(filename, 'write'):
+                workspaceWriter.saveXML(self, filename, filters, ignore, renderElements)
+            else:
+                with open(filename, 'w', encoding="utf-8") as fp:
+                    workspaceWriter.saveXML(self, fp, filters, ignore, renderElements)
+
+        if (self.unhandledWriter):
+            print( "[PackageWriter] unhandled: %s" % (", ".join(  self.unhandledWriter  )) )
+
+    def saveXMLFiles(self, files, ignore=None):
+        """
+        Writes several XML files in one pass over the workspace.
+        files is a dictionary (or list of pairs) of filename and filters, each file gets the same content as saveXML(filename, filters).
+        Each package and element is converted once and written to every file whose filters select it, all files are written at the same time.
+        Every output file is kept open until the last one is written, so the number of files is limited by the open file limit of the process.
+        """
+        workspaceWriter = self._createWorkspaceWriter()
+        if isinstance(ignore,str): ignore=[ignore]
+        cache = self.xmlCache
+        if cache is not None:
+            cache.validate(self._xmlCacheToken())
+        with contextlib.ExitStack() as stack:
+            outputs = []
+            for (filename, filters) in (files.items() if isinstance(files, dict) else files):
+                if isinstance(filters,str): filters=[filters]
+                if filters is not None:
+                    filters = [prepareFilter(x) for x in filters]
+                fp = filename if hasattr(filename, 'write') else stack.enter_context(open(filename, 'w', encoding="utf-8"))
+                outputs.append((fp, filters))
+            workspaceWriter.saveXMLMultiplexed(self, outputs, ignore, cache)
 
         if (self.unhandledWriter):
             print( "[PackageWriter] unhandled: %s" % (", ".join(  self.unhandledWriter  )) )
 
-    def toXML(self, filters=None, ignore=None):
+    def toXML(self, filters=None, ignore=None, workers=None, startMethod=None):
+        """
+        Returns the workspace as XML string, see saveXML for workers and startMethod.
+        """
+        workspaceWriter = self._createWorkspaceWriter()
+        if isinstance(filters,str): filters=[filters]
+        if isinstance(ignore,str): ignore=[ignore]
+        if filters is not None:
+            filters = [prepareFilter(x) for x in filters]
+        with self._parallelXMLWriter(workers, filters, ignore, startMethod) as renderElements:
+            return workspaceWriter.toXML(self, filters, ignore, renderElements)
+
+    def _createWorkspaceWriter(self):
         if self.packageWriter is None:
             self.packageWriter = autosar.writer.package_writer.PackageWriter(self.version, self.patch)
             if self.useDefaultWriters:
                 self._registerDefaultElementWriters(self.packageWriter)
-        workspaceWriter=autosar.writer.WorkspaceWriter(self.version, self.patch, self.schema, self.packageWriter)
-        if isinstance(filters,str): filters=[filters]
-        if isinstance(ignore,str): filters=[ignore]
-        if filters is not None:
-            filters = [prepareFilter(x) for x in filters]
-        return workspaceWriter.toXML(self, filters, ignore)
+        return autosar.writer.WorkspaceWriter(self.version, self.patch, self.schema, self.packageWriter)
+
+    @contextlib.contextmanager
+    def _parallelXMLWriter(self, workers, filters, ignore, startMethod=None):
+        """
+        Serializes the elements of all packages selected by filters in worker processes, in tasks of _xmlChunkSize elements.
+        At most 2*workers tasks are pending at any time; the next ones are submitted as the results are consumed in document order.
+        Yields the renderElements function for PackageWriter.iterXML (None when workers is None or less than 2, or on Python < 3.7).
+        When the XML cache is enabled, workers is ignored and the yielded function serializes changed elements only.
+        """
+        if self.xmlCache is not None:
+            cache = self.xmlCache
+            cache.validate(self._xmlCacheToken())
+            yield lambda package, indent: self.packageWriter.iterElementsXML(package, package.elements, filters, ignore, indent, cache)
+            return
+        if (workers is None) or (int(workers) < 2) or (sys.version_info < (3, 7)):
+            yield None #ProcessPoolExecutor supports mp_context and initializer since Python 3.7
+            return
+        packages = [] #(package, indent of its elements), in document order
+        pending = [(x, 4) for x in reversed(self.packages) if applyFilter(x.ref, filters)]
+        while len(pending) > 0:
+            (package, indent) = pending.pop()
+            packages.append((package, indent))
+            pending.extend((x, indent+2) for x in reversed(package.subPackages) if applyFilter(x.ref, filters))
+        for (package, _) in packages:
+            package.elements #parses lazily loaded elements before the workers are started
+        if self._refIndex is None:
+            self._buildRefIndex()
+        context = multiprocessing.get_context(startMethod)
+        if context.get_start_method() == 'fork':
+            initargs = (self, self.packageWriter) #inherited by the worker processes
+        else:
+            initargs = (_dumpWorkspaceSnapshot(self), self.packageWriter)
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=int(workers), mp_context=context, initializer=_initXMLWriterWorker, initargs=initargs)
+        tasks = ((package, start, indent) for (package, indent) in packages for start in range(0, len(package.elements), _xmlChunkSize))
+        planned = set(id(package) for (package, _) in packages)
+        pending = collections.deque() #(package, future), in document order
+        maxPending = 2*int(workers)
+        def submitTasks():
+            for (package, start, indent) in itertools.islice(tasks, maxPending-len(pending)):
+                pending.append((package, executor.submit(_writeXMLElementsWorker, package.ref, start, start+_xmlChunkSize, filters, ignore, indent)))
+        try:
+            def renderElements(package, indent):
+                if id(package) not in planned:
+                    yield from self.packageWriter.iterElementsXML(package, package.elements, filters, ignore, indent)
+                    return
+                planned.remove(id(package))
+                for _ in range(0, len(package.elements), _xmlChunkSize):
+                    submitTasks()
+                    (taskPackage, future) = pending.popleft()
+                    assert(taskPackage is package)
+                    (text, unhandledWriter, output) = future.result()
+                    sys.stdout.write(output)
+                    package.unhandledWriter.update(unhandledWriter)
+                    if len(text) > 0:
+                        yield text
+            yield renderElements
+        finally:
+            for (_, future) in pending:
+                future.cancel()
+            executor.shutdown()
 
     def append(self,elem):
         if isinstance(elem,autosar.package.Package):
-            self.packages.append(elem)
-            elem.parent=self
+            self._appendPackage(elem)
         else:
             raise ValueError(type(elem))
 
@@ -404,11 +1418,11 @@ class Workspace:
         if self.xmlroot is None:
             raise ValueError("xmlroot is None, did you call loadXML() or openXML()?")
         if self.version >= 3.0 and self.version < 4.0:
-            if self.xmlroot.find('TOP-LEVEL-PACKAGES'):
+            if self.xmlroot.find('TOP-LEVEL-PACKAGES') is not None:
                 for xmlPackage in self.xmlroot.findall('./TOP-LEVEL-PACKAGES/AR-PACKAGE'):
                     packageList.append(xmlPackage.find("./SHORT-NAME").text)
         elif self.version>=4.0:
-            if self.xmlroot.find('AR-PACKAGES'):
+            if self.xmlroot.find('AR-PACKAGES') is not None:
                 for xmlPackage in self.xmlroot.findall('.AR-PACKAGES/AR-PACKAGE'):
                     packageList.append(xmlPackage.find("./SHORT-NAME").text)
         else:
@@ -426,6 +1440,7 @@ class Workspace:
                 else:
                     del self.packages[i]
                     del self.map['packages'][ref[0]]
+                    self._invalidateIndexes()
                     break
 
     def createAdminData(self, data):
@@ -449,6 +1464,7 @@ class Workspace:
         """
         if self.packageParser is None:
             self.packageParser = autosar.parser.package_parser.PackageParser(self.version)
+            self.packageParser.profile = self.parseProfile
             self._registerDefaultElementParsers(self.packageParser)
         self.packageParser.registerElementParser(elementParser)
 
@@ -461,6 +1477,8 @@ class Workspace:
             if self.useDefaultWriters:
                 self._registerDefaultElementWriters(self.packageWriter)
         self.packageWriter.registerElementWriter(elementWriter)
+        if self.xmlCache is not None:
+            self.xmlCache.clear()
 
     def _registerDefaultElementParsers(self, parser):
         parser.registerElementParser(DataTypeParser(self.version))
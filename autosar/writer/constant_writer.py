@@ -1,4 +1,4 @@
-from autosar.writer.writer_base import ElementWriter
+from autosar.writer.writer_base import ElementWriter, XMLEmitter
 import autosar.constant
 
 class XMLConstantWriter(ElementWriter):
@@ -17,116 +17,77 @@ class XMLConstantWriter(ElementWriter):
         else:
             return None
 
+    def emitElementXML(self, emitter, elem):
+        if type(elem).__name__ == 'Constant':
+            self.emitConstantXML(emitter, elem)
+            return True
+        else:
+            return False
+
     def writeElementCode(self, elem, localvars):
         raise NotImplementedError('writeElementCode')
 
     def writeConstantXML(self,elem):
-        lines = []
+        emitter = XMLEmitter(self.indentChar)
+        self.emitConstantXML(emitter, elem)
+        return emitter.lines
+
+    def emitConstantXML(self, emitter, elem):
         assert(isinstance(elem,autosar.constant.Constant))
-        lines.append('<CONSTANT-SPECIFICATION>')
-        lines.append(self.indent('<SHORT-NAME>%s</SHORT-NAME>'%elem.name,1))
+        emitter.begin('<CONSTANT-SPECIFICATION>')
+        emitter.write('<SHORT-NAME>%s</SHORT-NAME>'%elem.name)
         if elem.adminData is not None:
-            lines.extend(self.indent(self.writeAdminDataXML(elem.adminData),1))
+            emitter.extend(self.writeAdminDataXML(elem.adminData))
         if self.version>=4.0:
-            lines.extend(self.indent(self._writeValueXMLV4(elem.value),1))
+            emitter.begin('<VALUE-SPEC>')
+            self.emitValueSpecificationXML(emitter, elem.value)
+            emitter.end('</VALUE-SPEC>')
         else:
-            lines.extend(self.indent(self._writeValueXMLV3(elem.value),1))
-        lines.append('</CONSTANT-SPECIFICATION>')
-        return lines
-
-    def _writeValueXMLV3(self,elem):
-        lines=[]
-        lines.append('<VALUE>')
-        lines.extend(self.indent(self._writeLiteralValueXML(elem),1))
-        lines.append('</VALUE>')
-        return lines
+            emitter.begin('<VALUE>')
+            self._emitLiteralValueXML(emitter, elem.value)
+            emitter.end('</VALUE>')
+        emitter.end('</CONSTANT-SPECIFICATION>')
 
-    def _writeLiteralValueXML(self,elem):
+    def _emitLiteralValueXML(self, emitter, elem):
         if isinstance(elem,autosar.constant.IntegerValue):
-            return self._writeIntegerLiteralXML(elem)
+            self._emitLiteralXML(emitter, elem, 'INTEGER-LITERAL', '%d'%elem.value)
         elif isinstance(elem,autosar.constant.RecordValue):
-            return self._writeRecordSpecificationXML(elem)
+            self._emitSpecificationXML(emitter, elem, 'RECORD-SPECIFICATION')
         elif isinstance(elem,autosar.constant.StringValue):
-            return self._writeStringLiteralXML(elem)
+            self._emitLiteralXML(emitter, elem, 'STRING-LITERAL', '%s'%elem.value)
         elif isinstance(elem,autosar.constant.BooleanValue):
-            return self._writeBooleanLiteralXML(elem)
+            self._emitLiteralXML(emitter, elem, 'BOOLEAN-LITERAL', 'true' if elem.value is True else 'false')
         elif isinstance(elem,autosar.constant.ArrayValue):
-            return self._writeArraySpecificationXML(elem)
+            self._emitSpecificationXML(emitter, elem, 'ARRAY-SPECIFICATION')
         else:
             raise NotImplementedError(type(elem))
 
-    def _writeIntegerLiteralXML(self,elem):
-        assert(isinstance(elem,autosar.constant.IntegerValue))
-        lines=[]
-        lines.append('<INTEGER-LITERAL>')
-        lines.append(self.indent('<SHORT-NAME>%s</SHORT-NAME>'%elem.name,1))
-        tag = elem.rootWS().find(elem.typeRef).tag(self.version)
-        lines.append(self.indent('<TYPE-TREF DEST="%s">%s</TYPE-TREF>'%(tag,elem.typeRef),1))
-        lines.append(self.indent('<VALUE>%d</VALUE>'%elem.value,1))
-        lines.append('</INTEGER-LITERAL>')
-        return lines
-
-    def _writeRecordSpecificationXML(self,elem):
-        assert(isinstance(elem,autosar.constant.RecordValue))
-        lines=[]
-        lines.append('<RECORD-SPECIFICATION>')
-        lines.append(self.indent('<SHORT-NAME>%s</SHORT-NAME>'%elem.name,1))
-        tag = elem.rootWS().find(elem.typeRef).tag(self.version)
-        lines.append(self.indent('<TYPE-TREF DEST="%s">%s</TYPE-TREF>'%(tag,elem.typeRef),1))
-        if len(elem.elements)==0: lines.append('<ELEMENTS/>')
-        else:
-            lines.append(self.indent('<ELEMENTS>',1))
-            for childElem in elem.elements:
-                lines.extend(self.indent(self._writeLiteralValueXML(childElem),2))
-            lines.append(self.indent('</ELEMENTS>',1))
-        lines.append('</RECORD-SPECIFICATION>')
-        return lines
-
-    def _writeStringLiteralXML(self,elem):
-        assert(isinstance(elem,autosar.constant.StringValue))
-        lines=[]
-        lines.append('<STRING-LITERAL>')
-        lines.append(self.indent('<SHORT-NAME>%s</SHORT-NAME>'%elem.name,1))
-        tag = elem.rootWS().find(elem.typeRef).tag(self.version)
-        lines.append(self.indent('<TYPE-TREF DEST="%s">%s</TYPE-TREF>'%(tag,elem.typeRef),1))
-        lines.append(self.indent('<VALUE>%s</VALUE>'%elem.value,1))
-        lines.append('</STRING-LITERAL>')
-        return lines
-
-    def _writeBooleanLiteralXML(self,elem):
-        assert(isinstance(elem,autosar.constant.BooleanValue))
-        lines=[]
-        lines.append('<BOOLEAN-LITERAL>')
-        lines.append(self.indent('<SHORT-NAME>%s</SHORT-NAME>'%elem.name,1))
-        tag = elem.rootWS().find(elem.typeRef).tag(self.version)
-        lines.append(self.indent('<TYPE-TREF DEST="%s">%s</TYPE-TREF>'%(tag,elem.typeRef),1))
-        lines.append(self.indent('<VALUE>%s</VALUE>'%('true' if elem.value is True else 'false'),1))
-        lines.append('</BOOLEAN-LITERAL>')
-        return lines
-
-    def _writeArraySpecificationXML(self,elem):
-        assert(isinstance(elem,autosar.constant.ArrayValue))
-        lines=[]
-        lines.append('<ARRAY-SPECIFICATION>')
-        lines.append(self.indent('<SHORT-NAME>%s</SHORT-NAME>'%elem.name,1))
-        tag = elem.rootWS().find(elem.typeRef).tag(self.version)
-        lines.append(self.indent('<TYPE-TREF DEST="%s">%s</TYPE-TREF>'%(tag,elem.typeRef),1))
-        if len(elem.elements)==0: lines.append('<ELEMENTS/>')
+    def _emitLiteralXML(self, emitter, elem, tag, value):
+        emitter.begin('<%s>'%tag)
+        emitter.write('<SHORT-NAME>%s</SHORT-NAME>'%elem.name)
+        typeTag = elem.rootWS().find(elem.typeRef).tag(self.version)
+        emitter.write('<TYPE-TREF DEST="%s">%s</TYPE-TREF>'%(typeTag,elem.typeRef))
+        emitter.write('<VALUE>%s</VALUE>'%value)
+        emitter.end('</%s>'%tag)
+
+    def _emitSpecificationXML(self, emitter, elem, tag):
+        """
+        RECORD-SPECIFICATION and ARRAY-SPECIFICATION (AUTOSAR 3)
+        """
+        emitter.begin('<%s>'%tag)
+        emitter.write('<SHORT-NAME>%s</SHORT-NAME>'%elem.name)
+        typeTag = elem.rootWS().find(elem.typeRef).tag(self.version)
+        emitter.write('<TYPE-TREF DEST="%s">%s</TYPE-TREF>'%(typeTag,elem.typeRef))
+        if len(elem.elements)==0:
+            emitter.depth -= 1 #written without indentation
+            emitter.write('<ELEMENTS/>')
+            emitter.depth += 1
         else:
-            lines.append(self.indent('<ELEMENTS>',1))
+            emitter.begin('<ELEMENTS>')
             for childElem in elem.elements:
-                lines.extend(self.indent(self._writeLiteralValueXML(childElem),2))
-            lines.append(self.indent('</ELEMENTS>',1))
-
-        lines.append('</ARRAY-SPECIFICATION>')
-        return lines
-
-    def _writeValueXMLV4(self, value):
-        lines=[]
-        lines.append('<VALUE-SPEC>')
-        lines.extend(self.indent(self.writeValueSpecificationXML(value),1))
-        lines.append('</VALUE-SPEC>')
-        return lines
+                self._emitLiteralValueXML(emitter, childElem)
+            emitter.end('</ELEMENTS>')
+        emitter.end('</%s>'%tag)
 
 class CodeConstantWriter(ElementWriter):
     def __init__(self,version, patch):
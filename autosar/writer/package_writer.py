@@ -1,4 +1,4 @@
-from autosar.writer.writer_base import BaseWriter, ElementWriter
+from autosar.writer.writer_base import BaseWriter, ElementWriter, XMLEmitter
 from autosar.base import applyFilter
 import collections.abc
 import autosar.behavior
@@ -33,60 +33,155 @@ class PackageWriter(BaseWriter):
             self.registeredWriters[writerName] = elementWriter
 
     def toXML(self, package, filters, ignore):
-        lines=[]
-        lines.extend(self.beginPackage(package.name))
+        return list(self.iterXML(package, filters, ignore))
+
+    def iterXML(self, package, filters, ignore, indent=0, renderElements=None):
+        """
+        Yields the XML lines of package (indented by indent levels), element by element.
+        Each line is indented once, when it's yielded, instead of once per package nesting level.
+        renderElements(package, indent) can replace iterElementsXML for the content of <ELEMENTS> (used for parallel serialization),
+        it may yield blocks of several lines separated by newlines.
+        """
+        prefix = self.indentChar*indent
+        for line in self.beginPackage(package.name):
+            yield prefix+line
         if len(package.elements)>0:
-            lines.append(self.indent("<ELEMENTS>",1))
-            for elem in package.elements:
-                elemRef = elem.ref
-                ignoreElem=True if (isinstance(ignore, collections.abc.Iterable) and elemRef in ignore) else False
-                #if SWC was ignored by user, also ignore its InternalBehavior and SwcImplementation elements in case they are in the same package
-                if not ignoreElem and isinstance(elem, autosar.behavior.InternalBehavior):
-                    if (isinstance(ignore, collections.abc.Iterable) and elem.componentRef in ignore):
-                        ignoreElem = True
-                if not ignoreElem and isinstance(elem, autosar.component.SwcImplementation):
-                    behavior = package.rootWS().find(elem.behaviorRef)
-                    if behavior is not None:
-                        if (isinstance(ignore, collections.abc.Iterable) and behavior.componentRef in ignore):
-                            ignoreElem = True
-                if not ignoreElem and applyFilter(elemRef, filters):
-                    elementName = elem.__class__.__name__
-                    elementWriter = self.xmlSwitcher.get(elementName)
-                    if elementWriter is not None:
-                        result = elementWriter.writeElementXML(elem)
-                        if result is None:
-                            print("[PackageWriter] No return value: %s"%elementName)
-                            continue
-                        else:
-                            lines.extend(self.indent(result,2))
-                    else:
-                        package.unhandledWriter.add(elementName)
-            lines.append(self.indent("</ELEMENTS>",1))
+            yield prefix+self.indent("<ELEMENTS>",1)
+            if renderElements is None:
+                yield from self.iterElementsXML(package, package.elements, filters, ignore, indent+2)
+            else:
+                yield from renderElements(package, indent+2)
+            yield prefix+self.indent("</ELEMENTS>",1)
         else:
             if self.version<4.0:
-                lines.append(self.indent("<ELEMENTS/>",1))
+                yield prefix+self.indent("<ELEMENTS/>",1)
         if len(package.subPackages)>0:
             numPackets = 0
-            if self.version >= 3.0 and self.version < 4.0:
+            tag = self._subPackagesTag()
+            if tag is not None:
                 for subPackage in package.subPackages:
                     if applyFilter(subPackage.ref, filters):
                         if numPackets == 0:
-                            lines.append(self.indent("<SUB-PACKAGES>",1))
-                        lines.extend(self.indent(self.toXML(subPackage, filters, ignore),2))
+                            yield prefix+self.indent("<%s>"%tag,1)
+                        yield from self.iterXML(subPackage, filters, ignore, indent+2, renderElements)
                         numPackets += 1
                 if numPackets > 0:
-                    lines.append(self.indent("</SUB-PACKAGES>",1))
-            elif self.version >= 4.0:
-                for subPackage in package.subPackages:
-                    if applyFilter(subPackage.ref, filters):
-                        if numPackets == 0:
-                            lines.append(self.indent("<AR-PACKAGES>",1))
-                        lines.extend(self.indent(self.toXML(subPackage, filters, ignore),2))
-                        numPackets += 1
-                if numPackets > 0:
-                    lines.append(self.indent("</AR-PACKAGES>",1))
-        lines.extend(self.endPackage())
-        return lines
+                    yield prefix+self.indent("</%s>"%tag,1)
+        for line in self.endPackage():
+            yield prefix+line
+
+    def writeXMLMultiplexed(self, package, outputs, ignore, indent=0, cache=None):
+        """
+        Writes the XML of package (indented by indent levels) to several files in one pass.
+        outputs is a list of (write, filters) where write(text) writes to a file whose filters select package.
+        Each element is converted once and written to all outputs whose filters select it, see iterElementsXML for cache.
+        """
+        prefix = self.indentChar*indent
+        self._writeAll(outputs, [prefix+line for line in self.beginPackage(package.name)])
+        if len(package.elements)>0:
+            self._writeAll(outputs, [prefix+self.indent("<ELEMENTS>",1)])
+            emitter = XMLEmitter(self.indentChar, indent+2)
+            for elem in package.elements:
+                if self._isIgnored(package, elem, ignore):
+                    continue
+                elemRef = elem.ref
+                targets = [write for (write, filters) in outputs if applyFilter(elemRef, filters)]
+                if len(targets) > 0:
+                    text = self._elementXML(package, elem, emitter, indent+2, cache)
+                    if text:
+                        text += '\n'
+                        for write in targets:
+                            write(text)
+            self._writeAll(outputs, [prefix+self.indent("</ELEMENTS>",1)])
+        else:
+            if self.version<4.0:
+                self._writeAll(outputs, [prefix+self.indent("<ELEMENTS/>",1)])
+        tag = self._subPackagesTag()
+        if (len(package.subPackages)>0) and (tag is not None):
+            opened = [] #outputs where the tag has been written
+            for subPackage in package.subPackages:
+                subOutputs = [x for x in outputs if applyFilter(subPackage.ref, x[1])]
+                if len(subOutputs) > 0:
+                    self._writeAll([x for x in subOutputs if x not in opened], [prefix+self.indent("<%s>"%tag,1)])
+                    opened.extend(x for x in subOutputs if x not in opened)
+                    self.writeXMLMultiplexed(subPackage, subOutputs, ignore, indent+2, cache)
+            self._writeAll([x for x in outputs if x in opened], [prefix+self.indent("</%s>"%tag,1)])
+        self._writeAll(outputs, [prefix+line for line in self.endPackage()])
+
+    def _writeAll(self, outputs, lines):
+        text = ''.join(line+'\n' for line in lines)
+        for (write, _) in outputs:
+            write(text)
+
+    def _subPackagesTag(self):
+        if self.version >= 3.0 and self.version < 4.0:
+            return "SUB-PACKAGES"
+        elif self.version >= 4.0:
+            return "AR-PACKAGES"
+        return None
+
+    def iterElementsXML(self, package, elements, filters, ignore, indent, cache=None):
+        """
+        Yields the XML lines of elements (taken from package), indented by indent levels.
+        When cache (an autosar.cache.XMLCache) is given, the XML of each element is taken from it or stored in it and yielded as one block of lines.
+        """
+        emitter = XMLEmitter(self.indentChar, indent)
+        for elem in elements:
+            if not self._isIgnored(package, elem, ignore) and applyFilter(elem.ref, filters):
+                if cache is None:
+                    elementWriter = self._elementWriter(package, elem)
+                    if elementWriter is not None:
+                        if elementWriter.emitElementXML(emitter, elem):
+                            yield from emitter.take()
+                        else:
+                            print("[PackageWriter] No return value: %s"%elem.__class__.__name__)
+                else:
+                    text = self._elementXML(package, elem, emitter, indent, cache)
+                    if text:
+                        yield text
+
+    def _isIgnored(self, package, elem, ignore):
+        if not isinstance(ignore, collections.abc.Iterable):
+            return False
+        if elem.ref in ignore:
+            return True
+        #if SWC was ignored by user, also ignore its InternalBehavior and SwcImplementation elements in case they are in the same package
+        if isinstance(elem, autosar.behavior.InternalBehavior):
+            return elem.componentRef in ignore
+        if isinstance(elem, autosar.component.SwcImplementation):
+            behavior = package.rootWS().find(elem.behaviorRef)
+            return (behavior is not None) and (behavior.componentRef in ignore)
+        return False
+
+    def _elementWriter(self, package, elem):
+        """
+        Returns the writer registered for the class of elem, unhandled classes are recorded in package.unhandledWriter
+        """
+        elementName = elem.__class__.__name__
+        elementWriter = self.xmlSwitcher.get(elementName)
+        if elementWriter is None:
+            package.unhandledWriter.add(elementName)
+        return elementWriter
+
+    def _elementXML(self, package, elem, emitter, indent, cache):
+        """
+        Returns the XML of elem as lines joined by newlines (taken from cache when possible, cache can be None).
+        Returns None when elem can't be written.
+        """
+        if cache is not None:
+            text = cache.get(elem, indent)
+            if text is not None:
+                return text
+        elementWriter = self._elementWriter(package, elem)
+        if elementWriter is None:
+            return None
+        if not elementWriter.emitElementXML(emitter, elem):
+            print("[PackageWriter] No return value: %s"%elem.__class__.__name__)
+            return None
+        text = '\n'.join(emitter.take())
+        if cache is not None:
+            cache.store(elem, indent, text)
+        return text
 
     def toCode(self, package, filters, ignore, localvars, isTemplate):
         lines=[]
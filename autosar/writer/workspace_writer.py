@@ -37,21 +37,43 @@ class WorkspaceWriter(BaseWriter):
         return lines
 
 
-    def saveXML(self, ws, fp, filters, ignore):
-        fp.write(self.toXML(ws, filters, ignore))
+    def saveXML(self, ws, fp, filters, ignore, renderElements=None):
+        """
+        Writes the XML document to fp (file-like object opened in text mode) while it's being generated,
+        only the lines of one element at a time are kept in memory.
+        """
+        fp.writelines(line+'\n' for line in self.iterXML(ws, filters, ignore, renderElements))
 
-    def toXML(self, ws, filters, ignore):
-        lines=self.beginFile()
-        result='\n'.join(lines)+'\n'
+    def saveXMLMultiplexed(self, ws, outputs, ignore, cache=None):
+        """
+        Writes several XML documents in one pass over the workspace.
+        outputs is a list of (fp, filters), each package and element is converted once and written to every fp whose filters select it.
+        """
+        for (fp, _) in outputs:
+            fp.writelines(line+'\n' for line in self.beginFile())
+        outputs = [(fp.write, filters) for (fp, filters) in outputs]
+        for package in ws.packages:
+            packageOutputs = [x for x in outputs if applyFilter(package.ref, x[1])]
+            if len(packageOutputs) > 0:
+                self.packageWriter.writeXMLMultiplexed(package, packageOutputs, ignore, 2, cache)
+            ws.unhandledWriter = ws.unhandledWriter.union(package.unhandledWriter)
+        for (write, _) in outputs:
+            write(''.join(line+'\n' for line in self.endFile()))
+
+    def toXML(self, ws, filters, ignore, renderElements=None):
+        return '\n'.join(self.iterXML(ws, filters, ignore, renderElements))+'\n'
+
+    def iterXML(self, ws, filters, ignore, renderElements=None):
+        """
+        Yields the lines of the XML document, packages and elements are converted as the lines are consumed.
+        See PackageWriter.iterXML for renderElements.
+        """
+        yield from self.beginFile()
         for package in ws.packages:
             if applyFilter(package.ref, filters):
-                lines=self.packageWriter.toXML(package, filters, ignore)
-                if len(lines)>0:
-                    lines=self.indent(lines,2)
-                    result+='\n'.join(lines)+'\n'
+                yield from self.packageWriter.iterXML(package, filters, ignore, 2, renderElements)
             ws.unhandledWriter = ws.unhandledWriter.union(package.unhandledWriter)
-        lines=self.endFile()
-        return result+'\n'.join(lines)+'\n'
+        yield from self.endFile()
 
     def toCode(self, ws, filters=None, ignore=None, head=None, tail=None, isModule=False, isTemplate=False, indent=3):
         localvars = collections.OrderedDict()
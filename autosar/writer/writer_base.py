@@ -7,6 +7,60 @@ import collections
 from autosar.element import DataElement
 from decimal import Decimal
 
+class XMLEmitter:
+    """
+    Collects XML lines for the writers. The emitter keeps track of the nesting depth and indents each line once, when
+    it's written, instead of having each writer method re-indent the lines returned by the methods it calls.
+    """
+    def __init__(self, indentChar, depth=0):
+        self.indentChar = indentChar
+        self.depth = depth
+        self.lines = []
+        self._prefixes = [indentChar*i for i in range(depth+1)]
+
+    def prefix(self):
+        """
+        Returns the indentation string of the current depth
+        """
+        return self._prefixes[self.depth]
+
+    def write(self, text):
+        self.lines.append(self._prefixes[self.depth]+text)
+
+    def extend(self, lines):
+        """
+        Writes a list of lines (e.g. returned by ElementWriter.writeElementXML) at the current depth
+        """
+        prefix = self._prefixes[self.depth]
+        if len(prefix) == 0:
+            self.lines.extend(lines)
+        else:
+            self.lines.extend([prefix+x for x in lines])
+
+    def begin(self, text):
+        """
+        Writes an opening tag, lines written after it are nested one level deeper
+        """
+        self.write(text)
+        self.depth += 1
+        if self.depth == len(self._prefixes):
+            self._prefixes.append(self.indentChar*self.depth)
+
+    def end(self, text):
+        """
+        Writes a closing tag at the depth of the matching opening tag
+        """
+        self.depth -= 1
+        self.write(text)
+
+    def take(self):
+        """
+        Returns the lines written so far and empties the emitter
+        """
+        lines = self.lines
+        self.lines = []
+        return lines
+
 class BaseWriter:
     def __init__(self, version=3.0, patch=None):
         self.version=version
@@ -24,10 +78,11 @@ class BaseWriter:
             self.indentChar = '  '
 
     def indent(self,lines,indent):
+        prefix = self.indentChar*indent
         if isinstance(lines,list):
-            return ['%s%s'%(self.indentChar*indent,x) for x in lines]
+            return [prefix+x for x in lines]
         elif isinstance(lines,str):
-            return '%s%s'%(self.indentChar*indent,lines)
+            return prefix+lines
         else:
             raise NotImplementedError(type(lines))
 
@@ -243,106 +298,114 @@ class BaseWriter:
             return element.ref #use full reference
 
     def writeValueSpecificationXML(self, value):
-        lines=[]
-        lines.append('<%s>'%value.tag(self.version))
+        emitter = XMLEmitter(self.indentChar)
+        self.emitValueSpecificationXML(emitter, value)
+        return emitter.lines
+
+    def emitValueSpecificationXML(self, emitter, value):
+        tag = value.tag(self.version)
+        emitter.begin('<%s>'%tag)
         if isinstance(value, autosar.constant.TextValue):
-            lines.extend(self.indent(self._writeSimpleValueSpecificationXML(value), 1))
+            self._emitSimpleValueSpecificationXML(emitter, value)
         elif isinstance(value, autosar.constant.NumericalValue):
-            lines.extend(self.indent(self._writeSimpleValueSpecificationXML(value), 1))
+            self._emitSimpleValueSpecificationXML(emitter, value)
         elif isinstance(value, autosar.constant.RecordValueAR4):
-            lines.extend(self.indent(self._writeRecordValueSpecificationXML(value), 1))
+            self._emitRecordValueSpecificationXML(emitter, value)
         elif isinstance(value, autosar.constant.ArrayValueAR4):
-            lines.extend(self.indent(self._writeArrayValueSpecificationXML(value), 1))
+            self._emitArrayValueSpecificationXML(emitter, value)
         elif isinstance(value, autosar.constant.ApplicationValue):
-            lines.extend(self.indent(self._writeApplicationValueSpecificationXML(value), 1))
+            self._emitApplicationValueSpecificationXML(emitter, value)
         else:
             raise NotImplementedError(str(type(value)))
-        lines.append('</%s>'%value.tag(self.version))
-        return lines
+        emitter.end('</%s>'%tag)
 
-    def _writeSimpleValueSpecificationXML(self, value):
-        lines=[]
+    def _emitSimpleValueSpecificationXML(self, emitter, value):
         if value.label is not None:
-            lines.append('<SHORT-LABEL>%s</SHORT-LABEL>'%(value.label))
-        lines.append('<VALUE>%s</VALUE>'%(value.value))
-        return lines
+            emitter.write('<SHORT-LABEL>%s</SHORT-LABEL>'%(value.label))
+        emitter.write('<VALUE>%s</VALUE>'%(value.value))
 
-    def _writeRecordValueSpecificationXML(self, value):
-        lines=[]
+    def _emitRecordValueSpecificationXML(self, emitter, value):
         if value.label is not None:
-            lines.append('<SHORT-LABEL>%s</SHORT-LABEL>'%(value.label))
-        lines.append('<FIELDS>')
+            emitter.write('<SHORT-LABEL>%s</SHORT-LABEL>'%(value.label))
+        emitter.begin('<FIELDS>')
         for elem in value.elements:
-            lines.extend(self.indent(self.writeValueSpecificationXML(elem),1))
-        lines.append('</FIELDS>')
-        return lines
+            self.emitValueSpecificationXML(emitter, elem)
+        emitter.end('</FIELDS>')
 
-    def _writeArrayValueSpecificationXML(self, value):
-        lines=[]
+    def _emitArrayValueSpecificationXML(self, emitter, value):
         if value.label is not None:
-            lines.append('<SHORT-LABEL>%s</SHORT-LABEL>'%(value.label))
-        lines.append('<ELEMENTS>')
-        for elem in value.elements:
-            lines.extend(self.indent(self.writeValueSpecificationXML(elem),1))
-        lines.append('</ELEMENTS>')
-        return lines
+            emitter.write('<SHORT-LABEL>%s</SHORT-LABEL>'%(value.label))
+        emitter.begin('<ELEMENTS>')
+        if value.numericalValues is not None:
+            #same output as for a list of NumericalValue without label, written without creating the objects
+            prefix = emitter.prefix()
+            (beginTag, valueFormat, endTag) = ('%s<NUMERICAL-VALUE-SPECIFICATION>'%prefix,
+                                               '%s%s<VALUE>%%s</VALUE>'%(prefix, self.indentChar),
+                                               '%s</NUMERICAL-VALUE-SPECIFICATION>'%prefix)
+            lines = emitter.lines
+            for v in value.numericalValues.tolist():
+                lines.extend((beginTag, valueFormat%v, endTag))
+        else:
+            for elem in value.elements:
+                self.emitValueSpecificationXML(emitter, elem)
+        emitter.end('</ELEMENTS>')
 
-    def _writeApplicationValueSpecificationXML(self, value):
+    def _emitApplicationValueSpecificationXML(self, emitter, value):
         ws=value.rootWS()
         assert(ws is not None)
-        lines=[]
         if value.label is not None:
-            lines.append('<SHORT-LABEL>{}</SHORT-LABEL>'.format(value.label))
+            emitter.write('<SHORT-LABEL>{}</SHORT-LABEL>'.format(value.label))
         if value.swAxisCont is not None:
-            lines.extend(self._writeSwAxisContXML(ws, value.swAxisCont))
+            self._emitSwAxisContXML(emitter, ws, value.swAxisCont)
         if value.swValueCont is not None:
-            lines.extend(self._writeSwValueContXML(ws, value.swValueCont))
-        return lines
+            self._emitSwValueContXML(emitter, ws, value.swValueCont)
 
-    def _writeSwAxisContXML(self, ws, elem):
-        lines = []
-        lines.append('<SW-AXIS-CONTS>')
-        lines.append(self.indent('<%s>'%elem.tag(self.version), 1))
+    def _emitSwAxisContXML(self, emitter, ws, elem):
+        emitter.begin('<SW-AXIS-CONTS>')
+        emitter.begin('<%s>'%elem.tag(self.version))
         if elem.unitRef is not None:
             unitObj = ws.find(elem.unitRef)
             if unitObj is None:
                 raise autosar.base.InvalidUnitRef(elem.unitRef)
-            lines.append(self.indent('<UNIT-REF DEST="{0}">{1}</UNIT-REF>'.format(unitObj.tag(self.version), unitObj.ref), 2))
-        if elem.values is not None:
-            lines.append(self.indent('<SW-VALUES-PHYS>', 2))
-            if not isinstance(elem.values, list):
-                valueList = [elem.values]
-            else:
-                valueList = elem.values
+            emitter.write('<UNIT-REF DEST="{0}">{1}</UNIT-REF>'.format(unitObj.tag(self.version), unitObj.ref))
+        if (elem.numericalValues is not None) or (elem.values is not None):
+            emitter.begin('<SW-VALUES-PHYS>')
+            valueList = self._valueList(elem)
             for v in valueList:
-                lines.append(self.indent('<V>{}</V>'.format(str(v)), 3))
-            lines.append(self.indent('</SW-VALUES-PHYS>', 2))
-        lines.append(self.indent('</%s>'%elem.tag(self.version), 1))
-        lines.append('</SW-AXIS-CONTS>')
-        return lines
+                emitter.write('<V>{}</V>'.format(str(v)))
+            emitter.end('</SW-VALUES-PHYS>')
+        emitter.end('</%s>'%elem.tag(self.version))
+        emitter.end('</SW-AXIS-CONTS>')
 
-    def _writeSwValueContXML(self, ws, elem):
-        lines = []
-        lines.append('<%s>'%elem.tag(self.version))
+    def _emitSwValueContXML(self, emitter, ws, elem):
+        emitter.begin('<%s>'%elem.tag(self.version))
         if elem.unitRef is not None:
             unitObj = ws.find(elem.unitRef)
             if unitObj is None:
                 raise autosar.base.InvalidUnitRef(elem.unitRef)
-            lines.append(self.indent('<UNIT-REF DEST="{0}">{1}</UNIT-REF>'.format(unitObj.tag(self.version), unitObj.ref), 1))
-        if elem.values is not None:
-            lines.append(self.indent('<SW-VALUES-PHYS>', 1))
-            if not isinstance(elem.values, list):
-                valueList = [elem.values]
-            else:
-                valueList = elem.values
+            emitter.write('<UNIT-REF DEST="{0}">{1}</UNIT-REF>'.format(unitObj.tag(self.version), unitObj.ref))
+        if (elem.numericalValues is not None) or (elem.values is not None):
+            emitter.begin('<SW-VALUES-PHYS>')
+            valueList = self._valueList(elem)
             for v in valueList:
                 if isinstance(v, (float, int)):
-                    lines.append(self.indent('<V>{}</V>'.format(self._numberToString(v)), 2))
+                    emitter.write('<V>{}</V>'.format(self._numberToString(v)))
                 else:
-                    lines.append(self.indent('<VT>{}</VT>'.format(str(v)), 2))
-            lines.append(self.indent('</SW-VALUES-PHYS>', 1))
-        lines.append('</%s>'%elem.tag(self.version))
-        return lines
+                    emitter.write('<VT>{}</VT>'.format(str(v)))
+            emitter.end('</SW-VALUES-PHYS>')
+        emitter.end('</%s>'%elem.tag(self.version))
+
+    def _valueList(self, elem):
+        """
+        Returns values of SwValueCont or SwAxisCont as list, numericalValues are converted without changing elem
+        """
+        values = elem.values if elem.numericalValues is None else elem.numericalValues
+        if isinstance(values, list):
+            return values
+        elif hasattr(values, 'tolist'): #array.array or numpy.ndarray
+            return values.tolist()
+        else:
+            return [values]
 
     def writeDataElementXML(self, elem):
         assert(isinstance(elem,DataElement))
@@ -436,6 +499,19 @@ class ElementWriter(BaseWriter, metaclass=abc.ABCMeta):
         elem: the element object to write.
         """
 
+    def emitElementXML(self, emitter, elem):
+        """
+        Writes the XML of elem into emitter (XMLEmitter) at its current depth. Returns False if no XML was written.
+
+        The default implementation calls writeElementXML and writes the returned lines, writers that are built on
+        XMLEmitter override this method to avoid creating and re-indenting intermediate lists.
+        """
+        lines = self.writeElementXML(elem)
+        if lines is None:
+            return False
+        emitter.extend(lines)
+        return True
+
     @abc.abstractmethod
     def getSupportedCode(self):
         """
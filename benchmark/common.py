@@ -0,0 +1,63 @@
+"""
+Shared helpers for the benchmark scripts
+"""
+import os, sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import autosar
+import time
+import io
+import contextlib
+
+def create_workspace(num_elements):
+    """
+    Creates an AUTOSAR 4 workspace with num_elements sender-receiver interfaces,
+    num_elements constants and one component type for every 100 interfaces.
+    """
+    ws = autosar.workspace("4.2.2")
+    package = ws.createPackage('DataTypes', role='DataType')
+    package.createSubPackage('CompuMethods', role='CompuMethod')
+    package.createSubPackage('DataConstrs', role='DataConstraint')
+    package.createSubPackage('Units', role='Unit')
+    baseTypes = package.createSubPackage('BaseTypes')
+    ws.createPackage('Constants', role='Constant')
+    ws.createPackage('PortInterfaces', role='PortInterface')
+    ws.createPackage('ComponentTypes', role='ComponentType')
+    baseTypes.createSwBaseType('uint8', 8, nativeDeclaration='uint8')
+    package.createImplementationDataType('uint8', lowerLimit=0, upperLimit=255, baseTypeRef='/DataTypes/BaseTypes/uint8', typeEmitter='Platform_Type')
+    interfaces = ws.find('/PortInterfaces')
+    constants = ws.find('/Constants')
+    components = ws.find('/ComponentTypes')
+    for i in range(num_elements):
+        interfaces.createSenderReceiverInterface('If%d_I'%i, autosar.element.DataElement('Value', '/DataTypes/uint8'))
+        constants.createConstant('C%d_IV'%i, '/DataTypes/uint8', i % 256)
+    for i in range(0, num_elements, 100):
+        swc = components.createApplicationSoftwareComponent('Swc%d'%i)
+        for j in range(i, min(i+100, num_elements)):
+            swc.createRequirePort('If%d'%j, 'If%d_I'%j, initValueRef='C%d_IV'%j)
+    return ws
+
+def create_arxml_file(file_path, num_elements):
+    """
+    Saves workspace created by create_workspace unless file_path already exists
+    """
+    if not os.path.exists(file_path):
+        create_workspace(num_elements).saveXML(file_path)
+    return file_path
+
+@contextlib.contextmanager
+def quiet():
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+def best_of(repeat, func, *args):
+    """
+    Returns the shortest wall time (in seconds) of repeat calls to func
+    """
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+        if (result is None) or (elapsed < result):
+            result = elapsed
+    return result
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Compares saveXML time after changing one element, without and with the XML cache (Workspace.enableXMLCache).
+
+usage: incremental_save.py [num_elements]
+num_elements is the number of port interfaces and constants in the synthetic workspace (default 50000, i.e. 100k elements).
+The output of the cached save is verified to be identical to the output of the uncached save.
+"""
+import os, sys
+import tempfile
+import filecmp
+import common
+
+def save_xml(ws, file_path):
+    with common.quiet():
+        ws.saveXML(file_path)
+
+def change_and_save(ws, file_path, counter=[0]):
+    counter[0] += 1
+    ws.find('/Constants/C0_IV').value.value = counter[0] % 256
+    save_xml(ws, file_path)
+
+if __name__ == '__main__':
+    num_elements = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    ws = common.create_workspace(num_elements)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        uncached_path = os.path.join(tmp_dir, 'uncached.arxml')
+        cached_path = os.path.join(tmp_dir, 'cached.arxml')
+        uncached_time = common.best_of(3, change_and_save, ws, uncached_path)
+        ws.enableXMLCache()
+        change_and_save(ws, cached_path) #fills the cache
+        cached_time = common.best_of(3, change_and_save, ws, cached_path)
+        ws.disableXMLCache()
+        save_xml(ws, uncached_path)
+        print('Workspace with %d port interfaces and constants (%.1f MB of XML), one constant changed before each save'%(num_elements, os.path.getsize(uncached_path)/1E6))
+        print('  without cache: %6.3f s'%uncached_time)
+        print('  with cache:    %6.3f s'%cached_time)
+        print('  identical output: %s'%filecmp.cmp(uncached_path, cached_path, shallow=False))
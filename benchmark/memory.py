@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Measures memory used by instances of frequently occurring model classes and by a complete synthetic workspace.
+
+usage: memory.py [num_elements]
+num_elements is the number of port interfaces and constants in the synthetic workspace (default 20000).
+The synthetic workspace is measured twice, once as created by the factory methods and once when loaded from ARXML.
+"""
+import os, sys
+import gc
+import tempfile
+import array
+import tracemalloc
+import common
+import autosar
+
+INSTANCE_COUNT = 100000
+MAP_SIZE = 64*64
+
+def measure(func, *args):
+    """
+    Returns (result, bytes) where bytes is the memory still allocated by func when it returns
+    """
+    gc.collect()
+    tracemalloc.start()
+    result = func(*args)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+def load_workspace(file_path):
+    ws = autosar.workspace()
+    with common.quiet():
+        ws.loadXML(file_path, streaming=True) #the XML tree is not kept, only the model is measured
+    return ws
+
+def create_instances(factory, count):
+    return [factory() for _ in range(count)]
+
+def create_array_value(compact):
+    values = [i/8 for i in range(MAP_SIZE)]
+    if compact:
+        return autosar.constant.ArrayValueAR4('Map', numericalValues=array.array('d', values))
+    return autosar.constant.ArrayValueAR4('Map', elements=[autosar.constant.NumericalValue(None, v) for v in values])
+
+def create_sw_value_cont(compact):
+    values = [i/8 for i in range(MAP_SIZE)]
+    if compact:
+        return autosar.constant.SwValueCont(numericalValues=array.array('d', values))
+    return autosar.constant.SwValueCont(values)
+
+FACTORIES = [
+    ('DataElement', lambda: autosar.element.DataElement('Value', '/DataTypes/uint8')),
+    ('NumericalValue', lambda: autosar.constant.NumericalValue('Value', 0)),
+    ('RecordValueAR4', lambda: autosar.constant.RecordValueAR4('Value', '/DataTypes/Record')),
+    ('IntegerValue', lambda: autosar.constant.IntegerValue('Value', '/DataTypes/uint8', 0)),
+    ('DataElementComSpec', lambda: autosar.port.DataElementComSpec('Value', initValueRef='/Constants/C_IV')),
+    ('SwDataDefPropsConditional', lambda: autosar.base.SwDataDefPropsConditional(baseTypeRef='/DataTypes/BaseTypes/uint8')),
+    ('RecordTypeElement', lambda: autosar.datatype.RecordTypeElement('Value', '/DataTypes/uint8')),
+    ('CompuScaleElement', lambda: autosar.datatype.CompuScaleElement(0, 255)),
+]
+
+if __name__ == '__main__':
+    num_elements = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    print('Bytes per instance (%d instances)'%INSTANCE_COUNT)
+    for name, factory in FACTORIES:
+        _, size = measure(create_instances, factory, INSTANCE_COUNT)
+        print('  %-26s %6.1f'%(name, size/INSTANCE_COUNT))
+    print('Calibration map with %d values (kB as objects/list, kB as array)'%MAP_SIZE)
+    for name, func in [('ArrayValueAR4', create_array_value), ('SwValueCont', create_sw_value_cont)]:
+        sizes = [measure(func, compact)[1] for compact in (False, True)]
+        print('  %-26s %6.1f %6.1f'%(name, sizes[0]/1E3, sizes[1]/1E3))
+    print('Workspace with %d port interfaces and constants'%num_elements)
+    ws, size = measure(common.create_workspace, num_elements)
+    print('  created: %6.1f MB'%(size/1E6))
+    file_path = common.create_arxml_file(os.path.join(tempfile.gettempdir(), 'autosar_benchmark_%d.arxml'%num_elements), num_elements)
+    ws, size = measure(load_workspace, file_path)
+    print('  loaded:  %6.1f MB'%(size/1E6))
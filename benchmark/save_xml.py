@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Compares saveXML time of the serial writer with the parallel writer (saveXML with workers).
+
+usage: save_xml.py [num_elements] [workers]
+num_elements is the number of port interfaces and constants in the synthetic workspace (default 50000, i.e. 100k elements).
+workers defaults to the number of CPUs. The parallel output is verified to be identical to the serial output.
+"""
+import os, sys
+import tempfile
+import filecmp
+import common
+
+def save_xml(ws, file_path, workers=None):
+    with common.quiet():
+        ws.saveXML(file_path, workers=workers)
+
+if __name__ == '__main__':
+    num_elements = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    ws = common.create_workspace(num_elements)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        serial_path = os.path.join(tmp_dir, 'serial.arxml')
+        parallel_path = os.path.join(tmp_dir, 'parallel.arxml')
+        serial_time = common.best_of(3, save_xml, ws, serial_path)
+        parallel_time = common.best_of(3, save_xml, ws, parallel_path, workers)
+        print('Workspace with %d port interfaces and constants (%.1f MB of XML)'%(num_elements, os.path.getsize(serial_path)/1E6))
+        print('  serial:             %6.3f s'%serial_time)
+        print('  parallel (%2d proc): %6.3f s'%(workers, parallel_time))
+        print('  identical output:   %s'%filecmp.cmp(serial_path, parallel_path, shallow=False))
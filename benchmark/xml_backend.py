@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Compares load time of ARXML files using the ElementTree and lxml XML backends.
+
+usage: xml_backend.py [file.arxml ...]
+When no files are given, a synthetic AUTOSAR 4 file with 20000 port interfaces and constants is generated first.
+"""
+import os, sys
+import tempfile
+import common
+import autosar
+import autosar.base
+
+def open_xml(file_path):
+    ws = autosar.workspace()
+    ws.openXML(file_path)
+
+def load_xml(file_path):
+    ws = autosar.workspace()
+    with common.quiet():
+        ws.loadXML(file_path)
+
+if __name__ == '__main__':
+    file_paths = sys.argv[1:]
+    if len(file_paths) == 0:
+        file_paths = [common.create_arxml_file(os.path.join(tempfile.gettempdir(), 'autosar_benchmark_20000.arxml'), 20000)]
+    backends = ['etree']
+    try:
+        autosar.base.setXMLBackend('lxml')
+        backends.append('lxml')
+    except ImportError:
+        print('lxml is not installed, only measuring ElementTree')
+    for file_path in file_paths:
+        print('%s (%.1f MB)'%(file_path, os.path.getsize(file_path)/1E6))
+        for backend in backends:
+            autosar.base.setXMLBackend(backend)
+            parse_time = common.best_of(3, open_xml, file_path)
+            load_time = common.best_of(3, load_xml, file_path)
+            print('  %-6s openXML: %6.3f s  loadXML: %6.3f s'%(backend, parse_time, load_time))
@@ -22,6 +22,7 @@ setup(name='autosar',
 	  install_requires=[
           'cfile>=0.1.4',
       ],
+      extras_require={'lxml': ['lxml']},
       packages=['autosar','autosar.parser','autosar.writer','autosar.rte', 'autosar.bsw', 'autosar.util'],
 	  dependency_links=['https://github.com/cogu/cfile/archive/v0.1.4.tar.gz#egg=cfile-0.1.4'],
 	  zip_safe=False,
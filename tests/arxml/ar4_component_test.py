@@ -372,5 +372,41 @@ class ARXML4ComponentTest(ARXMLTestClass):
         msg, = cm.exception.args
         self.assertEqual(msg, 'InvalidPortRef')
 
+    def test_find_child_by_name(self):
+        ws = autosar.workspace(version="4.2.2")
+        _init_ws(ws)
+        package = ws.find('/ComponentTypes')
+        swc = package.createApplicationSoftwareComponent('MyApplication')
+        swc.createRequirePort('VehicleSpeed', 'VehicleSpeed_I', initValueRef = 'VehicleSpeed_IV')
+        port = swc.createRequirePort('EngineSpeed', 'EngineSpeed_I', initValueRef = 'EngineSpeed_IV')
+        self.assertIs(swc.find('EngineSpeed'), port)
+        self.assertIs(ws.find('/ComponentTypes/MyApplication/EngineSpeed'), port)
+        #ports added by append
+        appendedPort = autosar.port.RequirePort('AmbientT', '/PortInterfaces/AmbientT_I')
+        swc.append(appendedPort)
+        self.assertIs(swc.find('AmbientT'), appendedPort)
+        self.assertIsNone(swc.find('Missing'))
+        port.name = 'EngineSpeed2'
+        self.assertIsNone(swc.find('EngineSpeed'))
+        self.assertIs(swc.find('EngineSpeed2'), port)
+        #replaced lists are indexed again
+        newPort = autosar.port.RequirePort('AmbientT2', '/PortInterfaces/AmbientT_I', parent=swc)
+        swc.requirePorts = [newPort] + swc.requirePorts[1:2]
+        self.assertIsNone(swc.find('VehicleSpeed'))
+        self.assertIsNone(swc.find('AmbientT'))
+        self.assertIs(swc.find('AmbientT2'), newPort)
+        self.assertIs(swc.find('EngineSpeed2'), port)
+        swc.behavior.createExclusiveArea('ExclusiveArea1')
+        runnable = swc.behavior.createRunnable('Run', exclusiveAreas=['ExclusiveArea1'])
+        self.assertEqual(runnable.exclusiveAreaRefs, ['/ComponentTypes/MyApplication/MyApplication_InternalBehavior/ExclusiveArea1'])
+        self.assertIs(swc.behavior.find('Run'), runnable)
+        with self.assertRaises(ValueError):
+            swc.behavior.createRunnable('Run2', exclusiveAreas=['ExclusiveArea2'])
+        portInterface = ws.find('/PortInterfaces/EcuStatus_I')
+        self.assertIs(portInterface.find('RebootCount'), portInterface.dataElements[1])
+        portInterface = ws.find('/PortInterfaces/FreeRunningTimer5ms_I')
+        self.assertIs(portInterface.find('IsTimerElapsed'), portInterface.operations[1])
+        self.assertIsNone(portInterface.find('Missing'))
+
 if __name__ == '__main__':
     unittest.main()
@@ -3,6 +3,8 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../.
 import autosar
 from tests.arxml.common import ARXMLTestClass
 import unittest
+import array
+import tempfile
 
 def _create_packages(ws):
 
@@ -234,5 +236,41 @@ class ARXML4ConstantTest(ARXMLTestClass):
         self.assertEqual(len(value.swValueCont.values), 1)
         self.assertEqual(value.swValueCont.values[0], 'TextValue')
 
+    def test_numerical_value_arrays(self):
+        ws = autosar.workspace(version="4.2.2")
+        package = ws.createPackage('Constants', role='Constant')
+        for name, values in [('Ints_IV', [1, -2, 3]), ('Floats_IV', [0.5, 1e-05, 2.0]), ('Mixed_IV', [1, 2.5])]:
+            value = autosar.constant.ArrayValueAR4(name, elements=[autosar.constant.NumericalValue(None, v) for v in values])
+            package.append(autosar.constant.Constant(name, value))
+        package.createApplicationValueConstant('Map_IV', autosar.constant.SwValueCont([1.5, 2.5, float('inf')]), autosar.constant.SwAxisCont([1, 2, 3]))
+        with tempfile.TemporaryDirectory() as tmpDir:
+            file_path = os.path.join(tmpDir, 'arrays.arxml')
+            ws.saveXML(file_path)
+            ws2 = autosar.workspace(ws.version_str)
+            ws2.loadXML(file_path)
+        self.assertEqual(ws.toXML(), ws2.toXML())
+        value = ws2.find('/Constants/Ints_IV').value
+        self.assertEqual(value.numericalValues, array.array('q', [1, -2, 3]))
+        self.assertEqual(ws2.find('/Constants/Floats_IV').value.numericalValues.typecode, 'd')
+        self.assertIsNone(ws2.find('/Constants/Mixed_IV').value.numericalValues)
+        map_value = ws2.find('/Constants/Map_IV').value
+        self.assertEqual(map_value.swValueCont.numericalValues, array.array('d', [1.5, 2.5, float('inf')]))
+        self.assertEqual(map_value.swAxisCont.numericalValues, array.array('q', [1, 2, 3]))
+        xml = ws2.toXML()
+        #values is still a list, the compact array is converted when it's accessed
+        self.assertEqual(map_value.swAxisCont.values, [1, 2, 3])
+        map_value.swAxisCont.values.append(4)
+        self.assertIsNone(map_value.swAxisCont.numericalValues)
+        self.assertEqual(map_value.swAxisCont.values, [1, 2, 3, 4])
+        self.assertIn('<V>4</V>', ws2.toXML())
+        map_value.swAxisCont.values.pop()
+        self.assertEqual(ws2.toXML(), xml)
+        self.assertIsInstance(map_value.swValueCont.values, list)
+        elements = value.elements
+        self.assertIsNone(value.numericalValues)
+        self.assertEqual([x.value for x in elements], ['1', '-2', '3'])
+        self.assertIs(elements[0].parent, value)
+        self.assertEqual(ws.toXML(), ws2.toXML())
+
 if __name__ == '__main__':
     unittest.main()
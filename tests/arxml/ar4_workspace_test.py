@@ -0,0 +1,542 @@
+import os, sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+import autosar
+import autosar.util
+import unittest
+import glob
+import io
+import contextlib
+import tempfile
+import shutil
+import json
+import pickle
+
+expected_gen_dir = os.path.join(os.path.dirname(__file__), 'expected_gen')
+
+def _load_ws(file_path, **kwargs):
+    ws = autosar.workspace()
+    with contextlib.redirect_stdout(io.StringIO()):
+        ws.loadXML(file_path, **kwargs)
+    return ws
+
+def _ws_summary(ws):
+    """
+    Returns list of references found in the workspace followed by its XML (or the exception type when it can't be serialized)
+    """
+    result = []
+    packages = list(ws.packages)
+    while len(packages) > 0:
+        package = packages.pop(0)
+        result.append(package.ref)
+        result.extend([type(x).__name__+':'+x.ref for x in package.elements])
+        packages.extend(package.subPackages)
+    try:
+        result.append(ws.toXML())
+    except Exception as ex:
+        result.append(type(ex).__name__)
+    return result
+
+def _element_tags(file_path):
+    """
+    Returns list of (tag, ref) for all package elements found in ARXML file
+    """
+    result = []
+    xmlRoot, _ = autosar.base.parseXMLFileWithoutNamespace(file_path)
+    packages = [('', x) for x in xmlRoot.findall('./AR-PACKAGES/AR-PACKAGE')]
+    while len(packages) > 0:
+        (parentRef, xmlPackage) = packages.pop(0)
+        ref = parentRef+'/'+xmlPackage.findtext('SHORT-NAME')
+        result.extend([(x.tag, ref+'/'+x.findtext('SHORT-NAME')) for x in xmlPackage.findall('./ELEMENTS/*')])
+        packages.extend([(ref, x) for x in xmlPackage.findall('./AR-PACKAGES/AR-PACKAGE')])
+    return result
+
+def _element_refs(ws):
+    result = []
+    packages = list(ws.packages)
+    while len(packages) > 0:
+        package = packages.pop(0)
+        result.extend([x.ref for x in package.elements])
+        packages.extend(package.subPackages)
+    return result
+
+def _create_reload_ws(values, extra_package=False):
+    ws = autosar.workspace(version="4.2.2")
+    package = ws.createPackage('DataTypes', role='DataType')
+    package.createSubPackage('CompuMethods', role='CompuMethod')
+    package.createSubPackage('DataConstrs', role='DataConstraint')
+    baseTypes = package.createSubPackage('BaseTypes')
+    baseTypes.createSwBaseType('uint8', 8, nativeDeclaration='uint8')
+    package.createImplementationDataType('uint8', lowerLimit=0, upperLimit=255, baseTypeRef='/DataTypes/BaseTypes/uint8', typeEmitter='Platform_Type')
+    package = ws.createPackage('Constants', role='Constant')
+    for name, value in values.items():
+        package.createConstant(name, '/DataTypes/uint8', value)
+    if extra_package:
+        ws.createPackage('PortInterfaces', role='PortInterface').createSenderReceiverInterface('Extra_I', autosar.element.DataElement('Value', '/DataTypes/uint8'))
+    return ws
+
+class ARXML4WorkspaceTest(unittest.TestCase):
+
+    def test_streaming_load_matches_regular_load(self):
+        file_paths = sorted(glob.glob(os.path.join(expected_gen_dir, '*', '*.arxml')))
+        self.assertGreater(len(file_paths), 0)
+        for file_path in file_paths:
+            ws1 = _load_ws(file_path)
+            ws2 = _load_ws(file_path, streaming=True)
+            self.assertEqual(_ws_summary(ws1), _ws_summary(ws2), file_path)
+            self.assertIsNone(ws2.xmlroot)
+
+    def test_streaming_load_into_existing_package(self):
+        file_path = os.path.join(expected_gen_dir, 'constant', 'ar4_array_constant.arxml')
+        ws = _load_ws(file_path, streaming=True)
+        with contextlib.redirect_stdout(io.StringIO()):
+            ws.loadXML(file_path, streaming=True)
+        self.assertEqual(len(ws.packages), len(set(x.name for x in ws.packages)))
+        self.assertEqual(_ws_summary(_load_ws(file_path)), _ws_summary(ws))
+
+    def test_lazy_load_matches_regular_load(self):
+        file_paths = sorted(glob.glob(os.path.join(expected_gen_dir, '*', '*.arxml')))
+        for file_path in file_paths:
+            ws1 = _load_ws(file_path)
+            ws2 = _load_ws(file_path, lazy=True)
+            self.assertEqual(_ws_summary(ws1), _ws_summary(ws2), file_path)
+
+    def test_lazy_load_links_components(self):
+        file_paths = sorted(glob.glob(os.path.join(expected_gen_dir, '*', '*.arxml')))
+        for file_path in file_paths:
+            ws1 = _load_ws(file_path)
+            ws2 = _load_ws(file_path, lazy=True)
+            components1 = list(ws1.iterfind('/**', autosar.component.ComponentType))
+            components2 = [ws2.find(x.ref) for x in components1]
+            for (swc1, swc2) in zip(components1, components2):
+                for name in ['behavior', 'implementation']:
+                    item1 = getattr(swc1, name, None)
+                    item2 = getattr(swc2, name, None)
+                    self.assertEqual(None if item1 is None else item1.ref, None if item2 is None else item2.ref, file_path)
+        ws = _load_ws(os.path.join(expected_gen_dir, 'behavior', 'ar4_runnable_with_init_event.arxml'), lazy=True)
+        swc = ws.find('/ComponentTypes/MyApplication')
+        self.assertIsInstance(swc.implementation, autosar.component.SwcImplementation)
+        self.assertIs(swc.behavior, ws.find(swc.implementation.behaviorRef))
+
+    def test_lazy_load_parses_on_access(self):
+        file_path = os.path.join(expected_gen_dir, 'constant', 'ar4_application_value2.arxml')
+        ws = _load_ws(file_path, lazy=True)
+        package = ws['Constants']
+        self.assertIsNotNone(package._unparsed)
+        numPending = len(package._unparsed.xml)
+        self.assertGreater(numPending, 1)
+        name = next(iter(package._unparsed.xml))
+        constant = ws.find('/Constants/'+name)
+        self.assertIsInstance(constant, autosar.constant.Constant)
+        self.assertIs(constant.parent, package)
+        self.assertEqual(len(package._unparsed.xml), numPending-1)
+        self.assertEqual(len(package.elements), numPending)
+        self.assertIsNone(package._unparsed)
+
+    def test_load_xml_files_matches_load_xml(self):
+        file_paths = sorted(glob.glob(os.path.join(expected_gen_dir, '*', 'ar4_*.arxml')))
+        ws1 = autosar.workspace()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for file_path in file_paths:
+                ws1.loadXML(file_path)
+        for workers in [1, 4]:
+            ws2 = autosar.workspace()
+            with contextlib.redirect_stdout(io.StringIO()):
+                ws2.loadXMLFiles(file_paths, workers=workers)
+            self.assertEqual(_ws_summary(ws1), _ws_summary(ws2))
+            self.assertEqual(ws1.version_str, ws2.version_str)
+            self.assertEqual(ws1.unhandledParser, ws2.unhandledParser)
+
+    def test_load_xml_files_links_implementation(self):
+        file_paths = [os.path.join(expected_gen_dir, 'component', 'ar4_swc_implementation.arxml')]*2
+        ws1 = autosar.workspace()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for file_path in file_paths:
+                ws1.loadXML(file_path)
+        ws2 = autosar.workspace()
+        with contextlib.redirect_stdout(io.StringIO()):
+            ws2.loadXMLFiles(file_paths, workers=2)
+        swc1 = ws1.find('/ComponentTypes/MyApplication')
+        swc2 = ws2.find('/ComponentTypes/MyApplication')
+        self.assertIsNotNone(swc2.implementation)
+        self.assertEqual(swc1.implementation.ref, swc2.implementation.ref)
+        self.assertEqual(swc1.implementation is ws1.find(swc1.implementation.ref), swc2.implementation is ws2.find(swc2.implementation.ref))
+
+    def test_parse_cache(self):
+        file_path = os.path.join(expected_gen_dir, 'component', 'ar4_swc_implementation.arxml')
+        with tempfile.TemporaryDirectory() as tmpDir:
+            cacheDir = os.path.join(tmpDir, 'cache')
+            expected = _ws_summary(_load_ws(file_path))
+            for i in range(2):
+                ws = autosar.workspace()
+                cache = ws.enableParseCache(cacheDir)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    ws.loadXML(file_path)
+                self.assertEqual(cache.hits, i)
+                self.assertEqual(_ws_summary(ws), expected)
+                self.assertIsNotNone(ws.find('/ComponentTypes/MyApplication').implementation)
+            self.assertEqual(len(os.listdir(cacheDir)), 1)
+            #changing file content invalidates the cache entry
+            copy_path = os.path.join(tmpDir, 'copy.arxml')
+            shutil.copyfile(file_path, copy_path)
+            with open(copy_path, 'a') as fp:
+                fp.write('\n')
+            ws = autosar.workspace()
+            cache = ws.enableParseCache(cacheDir)
+            with contextlib.redirect_stdout(io.StringIO()):
+                ws.loadXML(copy_path)
+            self.assertEqual(cache.hits, 0)
+            self.assertEqual(_ws_summary(ws), expected)
+            #changing the parser configuration invalidates the cache entry
+            class CustomParser(autosar.parser.parser_base.ElementParser):
+                def getSupportedTags(self):
+                    return ['CUSTOM-ELEMENT']
+                def parseElement(self, xmlElement, parent=None):
+                    return None
+            ws = autosar.workspace()
+            cache = ws.enableParseCache(cacheDir)
+            ws.registerElementParser(CustomParser(ws.version))
+            with contextlib.redirect_stdout(io.StringIO()):
+                ws.loadXML(file_path)
+            self.assertEqual(cache.hits, 0)
+            self.assertEqual(len(os.listdir(cacheDir)), 3)
+
+    def test_default_xml_backend(self):
+        backend = autosar.base._xmlBackend
+        environ = os.environ.pop('AUTOSAR_XML_BACKEND', None)
+        try:
+            autosar.base._xmlBackend = None
+            self.assertIsInstance(autosar.base.getXMLBackend(), autosar.base.ElementTreeBackend)
+        finally:
+            autosar.base._xmlBackend = backend
+            if environ is not None:
+                os.environ['AUTOSAR_XML_BACKEND'] = environ
+
+    def test_xml_backends_give_same_result(self):
+        try:
+            import lxml
+        except ImportError:
+            self.skipTest('lxml is not installed')
+        file_paths = sorted(glob.glob(os.path.join(expected_gen_dir, '*', '*.arxml')))
+        backend = autosar.base.getXMLBackend()
+        try:
+            for file_path in file_paths:
+                autosar.base.setXMLBackend('etree')
+                ws1 = _load_ws(file_path)
+                autosar.base.setXMLBackend('lxml')
+                ws2 = _load_ws(file_path)
+                self.assertEqual(ws1.version_str, ws2.version_str)
+                self.assertEqual(ws1.schema, ws2.schema)
+                self.assertEqual(_ws_summary(ws1), _ws_summary(ws2), file_path)
+        finally:
+            autosar.base._xmlBackend = backend
+
+    def test_filtered_load(self):
+        file_paths = sorted(glob.glob(os.path.join(expected_gen_dir, '*', 'ar4_*.arxml')))
+        filters = [{'include': ['CONSTANT-SPECIFICATION']},
+                   {'include': ['*-INTERFACE', '/DataTypes/BaseTypes/*']},
+                   {'exclude': ['/DataTypes/*']},
+                   {'include': ['/*/*_T'], 'exclude': ['APPLICATION-*']},
+                   {'exclude': ['*-SOFTWARE-COMPONENT-TYPE', 'SWC-IMPLEMENTATION', '/*Types/uint8']}]
+        for file_path in file_paths:
+            full_refs = _element_refs(_load_ws(file_path))
+            tags = _element_tags(file_path)
+            for kwargs in filters:
+                elementFilter = autosar.base.ElementFilter(**kwargs)
+                accepted = set([ref for (tag, ref) in tags if elementFilter.accept(tag, ref)])
+                expected = [x for x in full_refs if x in accepted]
+                for mode in [{}, {'lazy': True}, {'streaming': True}]:
+                    ws = _load_ws(file_path, **kwargs, **mode)
+                    self.assertEqual(_element_refs(ws), expected, (file_path, kwargs, mode))
+
+    def test_streaming_filter_drops_xml(self):
+        file_path = os.path.join(expected_gen_dir, 'portinterface', 'ar4_sender_receiver_interface_single_element.arxml')
+        elementFilter = autosar.base.ElementFilter(include=['/DataTypes/*'], exclude=['COMPU-METHOD'])
+        found = []
+        for event, xmlElem in autosar.base.iterparseXMLFile(file_path, elementFilter=elementFilter):
+            self.assertNotEqual(xmlElem.tag, 'COMPU-METHOD')
+            if event == 'end' and xmlElem.tag == 'SENDER-RECEIVER-INTERFACE':
+                found.append(xmlElem)
+        self.assertGreater(len(found), 0)
+        for xmlElem in found:
+            self.assertEqual([x.tag for x in xmlElem], ['SHORT-NAME'])
+
+    def test_parse_profile(self):
+        file_paths = sorted(glob.glob(os.path.join(expected_gen_dir, 'portinterface', 'ar4_*.arxml')))
+        expected = {}
+        for file_path in file_paths:
+            for (tag, ref) in _element_tags(file_path):
+                expected[tag] = expected.get(tag, 0) + 1
+        ws1 = autosar.workspace()
+        profile = ws1.enableParseProfile()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for file_path in file_paths:
+                ws1.loadXML(file_path)
+        ws2 = autosar.workspace()
+        ws2.enableParseProfile()
+        with contextlib.redirect_stdout(io.StringIO()):
+            ws2.loadXMLFiles(file_paths, workers=2)
+        for ws in [ws1, ws2]:
+            report = json.loads(ws.parseProfile.toJSON())
+            self.assertEqual({k: v['count'] for k, v in report['tags'].items()}, expected)
+            self.assertEqual(report['parsers']['PortInterfacePackageParser']['count'],
+                             sum(v for k, v in expected.items() if k.endswith('-INTERFACE')))
+            self.assertEqual(report['total']['count'], sum(expected.values()))
+            self.assertEqual([x['name'] for x in report['files']], file_paths)
+            for entry in report['tags'].values():
+                self.assertGreater(entry['time'], 0.0)
+        self.assertIs(ws1.disableParseProfile(), profile)
+        self.assertIsNone(ws1.packageParser.profile)
+
+    def test_reload_xml(self):
+        with tempfile.TemporaryDirectory() as tmpDir:
+            file_path = os.path.join(tmpDir, 'reload.arxml')
+            _create_reload_ws({'C1_IV': 1, 'C2_IV': 2, 'C3_IV': 3}).saveXML(file_path)
+            ws = _load_ws(file_path, trackChanges=True)
+            dataType = ws.find('/DataTypes/uint8')
+            baseType = ws.find('/DataTypes/BaseTypes/uint8')
+            c1 = ws.find('/Constants/C1_IV')
+            c2 = ws.find('/Constants/C2_IV')
+            constants = ws.find('/Constants')
+            _create_reload_ws({'C1_IV': 1, 'C2_IV': 20, 'C4_IV': 4}, extra_package=True).saveXML(file_path)
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = ws.reloadXML(file_path)
+            self.assertEqual(result, {'added': ['/Constants/C4_IV', '/PortInterfaces/Extra_I'],
+                                      'changed': ['/Constants/C2_IV'],
+                                      'removed': ['/Constants/C3_IV']})
+            self.assertIs(ws.find('/DataTypes/uint8'), dataType)
+            self.assertIs(ws.find('/DataTypes/BaseTypes/uint8'), baseType)
+            self.assertIs(ws.find('/Constants'), constants)
+            self.assertIs(ws.find('/Constants/C1_IV'), c1)
+            self.assertIsNot(ws.find('/Constants/C2_IV'), c2)
+            self.assertEqual(_ws_summary(ws), _ws_summary(_load_ws(file_path)))
+            #reloading the original file again removes the package created by previous reload
+            _create_reload_ws({'C1_IV': 1, 'C2_IV': 2, 'C3_IV': 3}).saveXML(file_path)
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = ws.reloadXML(file_path)
+            self.assertEqual(result, {'added': ['/Constants/C3_IV'],
+                                      'changed': ['/Constants/C2_IV'],
+                                      'removed': ['/Constants/C4_IV', '/PortInterfaces/Extra_I']})
+            self.assertIsNone(ws.find('/PortInterfaces'))
+            self.assertIs(ws.find('/Constants/C1_IV'), c1)
+            self.assertEqual(_ws_summary(ws), _ws_summary(_load_ws(file_path)))
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = ws.reloadXML(file_path)
+            self.assertEqual(result, {'added': [], 'changed': [], 'removed': []})
+
+    def test_reload_xml_requires_track_changes(self):
+        file_path = os.path.join(expected_gen_dir, 'constant', 'ar4_array_constant.arxml')
+        ws = _load_ws(file_path)
+        with self.assertRaises(ValueError):
+            ws.reloadXML(file_path)
+
+    def test_interned_refs(self):
+        ws = _create_reload_ws({})
+        package = ws.createPackage('PortInterfaces', role='PortInterface')
+        for name in ['If1_I', 'If2_I']:
+            package.createSenderReceiverInterface(name, autosar.element.DataElement('Value', 'uint8'))
+        with tempfile.TemporaryDirectory() as tmpDir:
+            file_path = os.path.join(tmpDir, 'interfaces.arxml')
+            ws.saveXML(file_path)
+            for kwargs in [{}, {'streaming': True}]:
+                ws2 = _load_ws(file_path, **kwargs)
+                (if1, if2) = ws2.find('/PortInterfaces').elements
+                self.assertEqual(if1.dataElements[0].typeRef, '/DataTypes/uint8')
+                self.assertIs(if1.dataElements[0].typeRef, if2.dataElements[0].typeRef)
+                self.assertIs(if1.dataElements[0].typeRef, sys.intern('/DataTypes/uint8'))
+
+    def test_ref_index(self):
+        ws = _create_reload_ws({'C_A': 1})
+        self.assertIs(ws.find('/DataTypes/BaseTypes/uint8'), ws['DataTypes'].find('BaseTypes/uint8'))
+        self.assertIs(ws.find('Constants/C_A'), ws['Constants'].find('C_A'))
+        self.assertIsNotNone(ws._refIndex)
+        #a trailing '/' is ignored
+        self.assertIs(ws.find('/DataTypes/'), ws['DataTypes'])
+        self.assertIs(ws.find('Constants/C_A/'), ws['Constants'].find('C_A'))
+        self.assertIs(ws['DataTypes'].find('/DataTypes/BaseTypes/uint8/'), ws.find('/DataTypes/BaseTypes/uint8'))
+        #elements created after the index was built
+        constant = ws['Constants'].createConstant('C_B', '/DataTypes/uint8', 2)
+        self.assertIs(ws.find('/Constants/C_B'), constant)
+        swc = ws.createPackage('ComponentTypes').createApplicationSoftwareComponent('Swc')
+        self.assertIs(ws.find('/ComponentTypes/Swc'), swc)
+        self.assertIs(ws.find('/ComponentTypes/Swc_Implementation'), swc.implementation)
+        #references to objects inside elements
+        package = ws.createPackage('PortInterfaces', role='PortInterface')
+        portInterface = package.createSenderReceiverInterface('If_I', autosar.element.DataElement('Value', 'uint8'))
+        self.assertIs(ws.find('/PortInterfaces/If_I/Value'), portInterface.dataElements[0])
+        self.assertIsNone(ws.find('/PortInterfaces/If_I/Missing'))
+        self.assertIsNone(ws.find('/Missing/If_I'))
+        ws['Constants'].delete('C_B')
+        self.assertIsNone(ws.find('/Constants/C_B'))
+        ws.delete('PortInterfaces')
+        self.assertIsNone(ws.find('/PortInterfaces/If_I'))
+        self.assertIsNone(ws.find('/PortInterfaces'))
+        #lazily loaded elements are resolved and indexed when first found
+        file_path = os.path.join(expected_gen_dir, 'constant', 'ar4_application_value2.arxml')
+        ws = _load_ws(file_path, lazy=True)
+        name = next(iter(ws['Constants']._unparsed.xml))
+        constant = ws.find('/Constants/'+name)
+        self.assertIsInstance(constant, autosar.constant.Constant)
+        self.assertIs(ws._refIndex['/Constants/'+name], constant)
+
+    def test_cached_ref(self):
+        ws = _create_reload_ws({})
+        package = ws.createPackage('PortInterfaces')
+        portInterface = package.createSenderReceiverInterface('If_I', autosar.element.DataElement('Value', '/DataTypes/uint8'))
+        dataElement = portInterface.dataElements[0]
+        self.assertEqual(dataElement.ref, '/PortInterfaces/If_I/Value')
+        self.assertIs(dataElement.ref, dataElement.ref)
+        portInterface.name = 'Renamed_I'
+        self.assertEqual(dataElement.ref, '/PortInterfaces/Renamed_I/Value')
+        #moving a package changes the references of everything below it
+        subPackage = package.createSubPackage('Sub')
+        subPackage.createSenderReceiverInterface('Sub_I', autosar.element.DataElement('Value', '/DataTypes/uint8'))
+        dataElement = subPackage.find('Sub_I/Value')
+        self.assertEqual(dataElement.ref, '/PortInterfaces/Sub/Sub_I/Value')
+        ws['DataTypes'].append(subPackage)
+        self.assertEqual(dataElement.ref, '/DataTypes/Sub/Sub_I/Value')
+        ws['DataTypes'].name = 'Types'
+        self.assertEqual(dataElement.ref, '/Types/Sub/Sub_I/Value')
+        element = autosar.element.DataElement('Detached', '/DataTypes/uint8')
+        self.assertIsNone(element.ref)
+        element.parent = portInterface
+        self.assertEqual(element.ref, '/PortInterfaces/Renamed_I/Detached')
+        copied = pickle.loads(pickle.dumps(element))
+        copied.parent.name = 'Copied_I'
+        self.assertEqual(copied.ref, '/PortInterfaces/Copied_I/Detached')
+        self.assertEqual(element.ref, '/PortInterfaces/Renamed_I/Detached')
+        #renames and moves in another workspace keep the cached references of this one
+        ref = element.ref
+        ws2 = _create_reload_ws({'C1_IV': 1})
+        constant = ws2.find('/Constants/C1_IV')
+        self.assertEqual(constant.ref, '/Constants/C1_IV')
+        constant.name = 'C2_IV'
+        self.assertEqual(constant.ref, '/Constants/C2_IV')
+        self.assertIs(element.ref, ref)
+        portInterface.name = 'Other_I'
+        self.assertEqual(element.ref, '/PortInterfaces/Other_I/Detached')
+
+    def test_referrers(self):
+        ws = _create_reload_ws({}, extra_package=True)
+        dataType = ws.find('/DataTypes/uint8')
+        dataElement = ws.find('/PortInterfaces/Extra_I/Value')
+        self.assertEqual(ws.referrers('/DataTypes/BaseTypes/uint8'), [dataType.variantProps[0]])
+        self.assertEqual(ws.referrers(dataType), [dataElement])
+        #elements added to or removed from packages update the index
+        portInterface = ws['PortInterfaces'].createSenderReceiverInterface('New_I', autosar.element.DataElement('Value', '/DataTypes/uint8'))
+        self.assertIn(portInterface.dataElements[0], ws.referrers(dataType))
+        ws['PortInterfaces'].delete('New_I')
+        self.assertNotIn(portInterface.dataElements[0], ws.referrers(dataType))
+        #child elements created in elements already in the workspace
+        swc = ws.createPackage('ComponentTypes').createApplicationSoftwareComponent('Swc')
+        self.assertEqual(ws.referrers('/PortInterfaces/Extra_I'), [])
+        swc.createProvidePort('Out', 'Extra_I')
+        self.assertEqual(ws.referrers('/PortInterfaces/Extra_I'), [swc.providePorts[0]])
+        port = autosar.port.RequirePort('In', '/PortInterfaces/Extra_I')
+        swc.append(port)
+        self.assertEqual(ws.referrers('/PortInterfaces/Extra_I'), [swc.requirePorts[0], swc.providePorts[0]])
+        self.assertIs(ws.referrers('/PortInterfaces/Extra_I')[0], port)
+        #references assigned directly
+        dataElement.typeRef = '/DataTypes/BaseTypes/uint8'
+        self.assertNotIn(dataElement, ws.referrers(dataType))
+        port.portInterfaceRef = '/PortInterfaces/Other_I'
+        ws.updateReferrers(port)
+        self.assertEqual(ws.referrers('/PortInterfaces/Other_I'), [port])
+        self.assertEqual(ws.referrers('/Missing'), [])
+        #lists of references
+        instanceRef = autosar.system.SignalDataElementInstanceRef('/PortInterfaces/Extra_I/Value')
+        instanceRef.componentPrototypeRef.extend(['/Compositions/Top/Swc1', '/Compositions/Top/Swc2'])
+        system = autosar.system.System('System')
+        system.mapping = autosar.system.Mapping()
+        system.mapping.data.senderReceiverToSignal.append(autosar.system.SenderReceiverToSignalMapping(instanceRef, '/Signals/S1'))
+        ws.createPackage('Systems').append(system)
+        self.assertEqual(ws.referrers('/Compositions/Top/Swc2'), [instanceRef])
+        self.assertEqual(ws.referrers('/PortInterfaces/Extra_I/Value'), [instanceRef])
+
+    def test_validate_references(self):
+        ws = _create_reload_ws({}, extra_package=True)
+        self.assertEqual(ws.validateReferences(), [])
+        swc = ws.createPackage('ComponentTypes').createApplicationSoftwareComponent('Swc')
+        swc.createProvidePort('Out', 'Extra_I')
+        port = swc.providePorts[0]
+        self.assertEqual(ws.validateReferences(), [])
+        port.portInterfaceRef = '/PortInterfaces/Missing_I'
+        ws.find('/PortInterfaces/Extra_I/Value').typeRef = '/DataTypes/uint8/Missing'
+        result = ws.validateReferences()
+        self.assertEqual([(x.ref, x.attribute, x.element.ref) for x in result],
+                         [('/DataTypes/uint8/Missing', 'typeRef', '/PortInterfaces/Extra_I'),
+                          ('/PortInterfaces/Missing_I', 'portInterfaceRef', '/ComponentTypes/Swc')])
+        self.assertIs(result[1].owner, port)
+
+    def test_iterfind(self):
+        ws = _create_reload_ws({'C_A': 1, 'C_B': 2}, extra_package=True)
+        def refs(pattern, elementType=None):
+            return [x.ref for x in ws.iterfind(pattern, elementType)]
+        self.assertEqual(refs('/Constants/*'), ['/Constants/C_A', '/Constants/C_B'])
+        self.assertEqual(refs('/Constants/C_?'), ['/Constants/C_A', '/Constants/C_B'])
+        self.assertEqual(refs('/**/uint8'), ['/DataTypes/uint8', '/DataTypes/BaseTypes/uint8'])
+        self.assertEqual(refs('/DataTypes/**'), ['/DataTypes/uint8', '/DataTypes/CompuMethods', '/DataTypes/DataConstrs',
+                                                 '/DataTypes/DataConstrs/uint8_DataConstr', '/DataTypes/BaseTypes', '/DataTypes/BaseTypes/uint8'])
+        self.assertEqual(refs('/**/*_I'), ['/PortInterfaces/Extra_I'])
+        self.assertEqual(refs('/**/Missing'), [])
+        self.assertEqual(refs('/**', autosar.constant.Constant), ['/Constants/C_A', '/Constants/C_B'])
+        self.assertEqual(refs('/**/*B', autosar.constant.Constant), ['/Constants/C_B'])
+        self.assertEqual(refs('/DataTypes/*', autosar.package.Package), ['/DataTypes/CompuMethods', '/DataTypes/DataConstrs', '/DataTypes/BaseTypes'])
+        #type index follows changes to the workspace
+        ws['Constants'].createConstant('C_C', '/DataTypes/uint8', 3)
+        ws['Constants'].delete('C_A')
+        self.assertEqual(refs('/**', autosar.constant.Constant), ['/Constants/C_B', '/Constants/C_C'])
+        #results are in document order, whatever the order of indexing
+        ws['Constants'].createSubPackage('Sub').createConstant('C_D', '/DataTypes/uint8', 4)
+        ws['Constants'].createConstant('C_E', '/DataTypes/uint8', 5)
+        self.assertEqual(refs('/Constants/**', (autosar.constant.Constant, autosar.package.Package)),
+                         ['/Constants/C_B', '/Constants/C_C', '/Constants/C_E', '/Constants/Sub', '/Constants/Sub/C_D'])
+        self.assertEqual(refs('/Constants/**', (autosar.constant.Constant, autosar.package.Package)), refs('/Constants/**'))
+        self.assertEqual([x.ref for x in ws['DataTypes'].iterfind('**/uint8')], ['/DataTypes/uint8', '/DataTypes/BaseTypes/uint8'])
+        self.assertEqual(ws.findall('/Constants/C_*'), ws['Constants'].elements)
+
+    def test_role_packages(self):
+        ws = _create_reload_ws({'C_A': 1})
+        compuMethods = ws.find('/DataTypes/CompuMethods')
+        self.assertIs(ws.findRolePackage('CompuMethod'), compuMethods)
+        self.assertIsNone(ws.findRolePackage('Unknown'))
+        self.assertIs(ws.find('uint8', role='DataType'), ws.find('/DataTypes/uint8'))
+        nested = ws['Constants'].createSubPackage('Level2').createSubPackage('Level3', role='Constant')
+        constant = nested.createConstant('C_Nested', '/DataTypes/uint8', 1)
+        self.assertIs(ws.findRolePackage('Constant'), nested)
+        self.assertIs(ws.find('C_Nested', role='Constant'), constant)
+        ws.pushRoles()
+        ws.setRole('/Constants', 'Constant')
+        self.assertIs(ws.find('C_A', role='Constant'), ws.find('/Constants/C_A'))
+        self.assertIsNone(ws.find('C_Nested', role='Constant'))
+        ws.popRoles()
+        self.assertIs(ws.findRolePackage('Constant'), nested)
+        self.assertIs(ws.find('C_Nested', role='Constant'), constant)
+        ws.roles['Constant'] = '/Missing'
+        self.assertIsNone(ws.find('C_Nested', role='Constant'))
+        ws.setRole(None, 'Constant')
+        self.assertIs(ws.find('Constants/C_A', role='Constant'), ws.find('/Constants/C_A'))
+        #role packages created after a failed lookup
+        ws.roles['ComponentType'] = '/Late'
+        ws.roles['ModeDclrGroup'] = '/Constants/Late'
+        self.assertIsNone(ws.findRolePackage('ComponentType'))
+        self.assertIsNone(ws.find('C_Late', role='ModeDclrGroup'))
+        late = ws.createPackage('Late')
+        self.assertIs(ws.findRolePackage('ComponentType'), late)
+        lateSub = ws['Constants'].createSubPackage('Late')
+        constant = lateSub.createConstant('C_Late', '/DataTypes/uint8', 1)
+        self.assertIs(ws.findRolePackage('ModeDclrGroup'), lateSub)
+        self.assertIs(ws.find('C_Late', role='ModeDclrGroup'), constant)
+
+    def test_open_xml_without_namespace(self):
+        file_path = os.path.join(expected_gen_dir, 'constant', 'ar4_array_constant.arxml')
+        ws = autosar.workspace()
+        ws.openXML(file_path)
+        self.assertEqual(ws.xmlroot.tag, 'AUTOSAR')
+        for xmlElem in ws.xmlroot.iter():
+            self.assertFalse(xmlElem.tag.startswith('{'))
+        self.assertEqual(ws.version, 4.2)
+        self.assertEqual(ws.patch, 2)
+        self.assertEqual(ws.listPackages(), ['Constants'])
+
+if __name__ == '__main__':
+    unittest.main()
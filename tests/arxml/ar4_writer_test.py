@@ -0,0 +1,251 @@
+import os, sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+import autosar
+from tests.arxml.common import ARXMLTestClass
+import unittest
+import array
+import tempfile
+import io
+import contextlib
+
+def _create_packages(ws):
+
+    package=ws.createPackage('DataTypes', role='DataType')
+    package.createSubPackage('CompuMethods', role='CompuMethod')
+    package.createSubPackage('DataConstrs', role='DataConstraint')
+    package.createSubPackage('Units', role='Unit')
+    package.createSubPackage('BaseTypes')
+    ws.createPackage('Constants', role='Constant')
+
+def _create_base_types(ws):
+    basetypes = ws.find('/DataTypes/BaseTypes')
+    basetypes.createSwBaseType('boolean', 1, 'BOOLEAN')
+    basetypes.createSwBaseType('uint8', 8, nativeDeclaration='uint8')
+    basetypes.createSwBaseType('uint16', 16, nativeDeclaration='uint16')
+    basetypes.createSwBaseType('uint32', 32, nativeDeclaration='uint32')
+    basetypes.createSwBaseType('float32', 32, encoding='IEEE754')
+    package = ws.find('DataTypes')
+    package.createImplementationDataType('boolean', valueTable=['FALSE','TRUE'], baseTypeRef='/DataTypes/BaseTypes/boolean', typeEmitter='Platform_Type')
+    package.createImplementationDataType('uint8', lowerLimit=0, upperLimit=255, baseTypeRef='/DataTypes/BaseTypes/uint8', typeEmitter='Platform_Type')
+    package.createImplementationDataType('uint16', lowerLimit=0, upperLimit=65535, baseTypeRef='/DataTypes/BaseTypes/uint16', typeEmitter='Platform_Type')
+    package.createImplementationDataType('uint32', lowerLimit=0, upperLimit=4294967295, baseTypeRef='/DataTypes/BaseTypes/uint32', typeEmitter='Platform_Type')
+
+def _init_ws(ws):
+    _create_packages(ws)
+    _create_base_types(ws)
+
+def _create_writer_ws(count, extra_package=False):
+    """
+    Returns workspace with the constants C0_IV..C<count-1>_IV (value i) and optionally the PortInterfaces package
+    """
+    ws = autosar.workspace(version="4.2.2")
+    _init_ws(ws)
+    package = ws['Constants']
+    for i in range(count):
+        package.createConstant('C%d_IV'%i, '/DataTypes/uint8', i)
+    if extra_package:
+        ws.createPackage('PortInterfaces', role='PortInterface').createSenderReceiverInterface('Extra_I', autosar.element.DataElement('Value', '/DataTypes/uint8'))
+    return ws
+
+def _load_xml_text(text):
+    """
+    Returns new workspace loaded from XML text
+    """
+    with tempfile.TemporaryDirectory() as tmpDir:
+        file_path = os.path.join(tmpDir, 'ws.arxml')
+        with open(file_path, 'w', encoding='utf-8') as fp:
+            fp.write(text)
+        ws = autosar.workspace(version="4.2.2")
+        with contextlib.redirect_stdout(io.StringIO()):
+            ws.loadXML(file_path)
+    return ws
+
+def _constant_values(ws):
+    return [(x.name, x.value.value) for x in ws['Constants'].elements]
+
+class ARXML4WriterTest(ARXMLTestClass):
+
+    def test_save_xml_streaming(self):
+        ws = _create_writer_ws(2, extra_package=True)
+        fp = io.StringIO()
+        ws.saveXML(fp)
+        self.assertEqual(fp.getvalue(), ws.toXML())
+        ws2 = _load_xml_text(fp.getvalue())
+        self.assertEqual(_constant_values(ws2), [('C0_IV', '0'), ('C1_IV', '1')])
+        self.assertEqual(ws2.find('/DataTypes/BaseTypes/uint8').size, 8)
+        self.assertEqual(ws2.find('/PortInterfaces/Extra_I').dataElements[0].typeRef, '/DataTypes/uint8')
+        fp = io.StringIO()
+        ws.saveXML(fp, filters=['/Constants'])
+        self.assertEqual(fp.getvalue(), ws.toXML(filters=['/Constants']))
+        ws2 = _load_xml_text(fp.getvalue())
+        self.assertEqual(ws2.listPackages(), ['Constants'])
+        self.assertEqual(_constant_values(ws2), [('C0_IV', '0'), ('C1_IV', '1')])
+        lines = ws.toXML().split('\n')
+        self.assertEqual(lines.count('  <AR-PACKAGES>'), 1)
+        self.assertIn('      <AR-PACKAGES>', lines) #sub-packages of /DataTypes
+        self.assertIn('          <SHORT-NAME>BaseTypes</SHORT-NAME>', lines)
+
+    def test_xml_emitter(self):
+        emitter = autosar.writer.writer_base.XMLEmitter('  ', 1)
+        emitter.begin('<A>')
+        emitter.write('<B/>')
+        emitter.extend(['<C>', '  <D/>', '</C>'])
+        emitter.end('</A>')
+        self.assertEqual(emitter.take(), ['  <A>', '    <B/>', '    <C>', '      <D/>', '    </C>', '  </A>'])
+        self.assertEqual(emitter.lines, [])
+
+        class LegacyConstantWriter(autosar.writer.writer_base.ElementWriter):
+            """Writer which only implements writeElementXML (list of lines)"""
+            def getSupportedXML(self): return ['Constant']
+            def getSupportedCode(self): return []
+            def writeElementXML(self, elem): return ['<CONSTANT-SPECIFICATION>', self.indent('<SHORT-NAME>%s</SHORT-NAME>'%elem.name, 1), '</CONSTANT-SPECIFICATION>']
+            def writeElementCode(self, elem, localvars): return None
+        ws = _create_writer_ws(1)
+        expected = ws.toXML(filters=['/Constants'])
+        ws2 = _load_xml_text(expected)
+        self.assertEqual(_constant_values(ws2), [('C0_IV', '0')])
+        self.assertEqual(ws2.find('/Constants/C0_IV').value.label, 'C0_IV')
+        ws.registerElementWriter(LegacyConstantWriter(ws.version))
+        lines = ws.toXML(filters=['/Constants']).split('\n')
+        self.assertEqual(lines[5:10], ['      <ELEMENTS>', '        <CONSTANT-SPECIFICATION>', '          <SHORT-NAME>C0_IV</SHORT-NAME>',
+                                      '        </CONSTANT-SPECIFICATION>', '      </ELEMENTS>'])
+        self.assertEqual(lines[:6], expected.split('\n')[:6])
+
+    def test_parallel_xml_writer(self):
+        ws = _create_writer_ws(30, extra_package=True) #more tasks than the 2*workers pending at once
+        expected = ws.toXML()
+        wsModule = sys.modules['autosar.workspace'] #autosar.workspace is the factory function
+        chunkSize = wsModule._xmlChunkSize
+        wsModule._xmlChunkSize = 3
+        try:
+            self.assertEqual(ws.toXML(workers=2), expected)
+            self.assertEqual(ws.toXML(filters=['/Constants'], workers=2), ws.toXML(filters=['/Constants']))
+            fp = io.StringIO()
+            ws.saveXML(fp, workers=2)
+            self.assertEqual(fp.getvalue(), expected)
+            #worker processes which aren't forked get a snapshot of the workspace
+            self.assertEqual(ws.toXML(workers=2, startMethod='spawn'), expected)
+        finally:
+            wsModule._xmlChunkSize = chunkSize
+        ws2 = _load_xml_text(fp.getvalue())
+        self.assertEqual(_constant_values(ws2), [('C%d_IV'%i, str(i)) for i in range(30)])
+        self.assertEqual(ws2.find('/PortInterfaces/Extra_I').dataElements[0].typeRef, '/DataTypes/uint8')
+        self.assertEqual(len(ws['Constants'].unhandledWriter), 0)
+        #snapshot used by worker processes which aren't forked
+        copy = wsModule._loadWorkspaceSnapshot(wsModule._dumpWorkspaceSnapshot(ws))
+        self.assertEqual(copy.toXML(), expected)
+        self.assertEqual(_constant_values(copy), _constant_values(ws))
+        self.assertIs(copy.find('/Constants/C1_IV').rootWS(), copy)
+
+    def test_xml_cache(self):
+        def create_ws():
+            ws = _create_writer_ws(3, extra_package=True)
+            package = ws.createPackage('ComponentTypes', role='ComponentType')
+            package.createApplicationSoftwareComponent('Swc1').createRequirePort('Extra', 'Extra_I', queueLength=1)
+            return ws
+        def change(ws):
+            """
+            Yields the number of elements written again after each change (None for all)
+            """
+            ws.find('/Constants/C1_IV').value.value = 10 #property setter
+            yield 1
+            ws.find('/ComponentTypes/Swc1').createProvidePort('Extra2', 'Extra_I')
+            yield 2 #Swc1 and Swc1_Implementation, which refers to it
+            ws.find('/ComponentTypes/Swc1').behavior.createRunnable('Run')
+            yield 2
+            behavior = ws.find('/ComponentTypes/Swc1').behavior
+            behavior.runnables.pop() #list changed in place
+            ws.markDirty(behavior)
+            yield 2
+            portInterface = ws.find('/PortInterfaces/Extra_I')
+            portInterface.desc = 'Extra'
+            ws.markDirty(portInterface)
+            yield 2 #Extra_I and Swc1
+            portInterface.dataElements[0].isQueued = True #changes the ComSpec of Swc1
+            ws.markDirty(portInterface.dataElements[0])
+            yield 2
+            ws.find('/Constants').delete('C0_IV')
+            yield 0
+            ws.find('/Constants/C2_IV').name = 'C3_IV'
+            yield None #all elements
+        ws1 = create_ws()
+        ws2 = create_ws()
+        cache = ws1.enableXMLCache()
+        self.assertEqual(ws1.toXML(), ws2.toXML())
+        self.assertEqual(cache.hits, 0)
+        self.assertEqual(ws1.toXML(), ws2.toXML())
+        self.assertEqual(cache.hits, len(cache.entries))
+        for (written, _) in zip(change(ws1), change(ws2)):
+            (hits, misses) = (cache.hits, cache.misses)
+            self.assertEqual(ws1.toXML(), ws2.toXML())
+            if written is not None:
+                self.assertEqual(cache.misses-misses, written)
+        self.assertEqual(cache.hits-hits, 0) #renamed element, all elements are written again
+        self.assertEqual(ws1.toXML(), ws2.toXML())
+        #only the changed element is written again
+        misses = cache.misses
+        ws1.find('/Constants/C1_IV').value.value = 11
+        fp = io.StringIO()
+        ws1.saveXML(fp)
+        self.assertEqual(cache.misses-misses, 1)
+        self.assertIn('<VALUE>11</VALUE>', fp.getvalue())
+        self.assertEqual(ws1.find('/Constants/C1_IV').value.value, '11')
+        self.assertEqual(len(ws1.find('/ComponentTypes/Swc1').behavior.runnables), 0)
+        ws3 = _load_xml_text(fp.getvalue())
+        self.assertEqual(_constant_values(ws3), [('C1_IV', '11'), ('C3_IV', '2')])
+        self.assertEqual([x.name for x in ws3.find('/ComponentTypes/Swc1').providePorts], ['Extra2'])
+        self.assertEqual(ws3.find('/PortInterfaces/Extra_I').desc, 'Extra')
+        self.assertEqual([x.name for x in ws3.find('/ComponentTypes/Swc1').requirePorts], ['Extra'])
+        ws1.disableXMLCache()
+        self.assertIsNone(ws1.xmlCache)
+
+    def test_xml_cache_in_place_edits(self):
+        ws = autosar.workspace(version="4.2.2")
+        package = ws.createPackage('Constants', role='Constant')
+        value = autosar.constant.ArrayValueAR4('Ints_IV', numericalValues=array.array('q', [1, 2, 3]))
+        package.append(autosar.constant.Constant('Ints_IV', value))
+        package.append(autosar.constant.Constant('C_IV', autosar.constant.NumericalValue('C_IV', 1)))
+        cache = ws.enableXMLCache()
+        ws.toXML()
+        #compact array edited in place and reported
+        value.numericalValues[0] = 5
+        ws.markDirty(value)
+        misses = cache.misses
+        self.assertIn('<VALUE>5</VALUE>', ws.toXML())
+        self.assertEqual(cache.misses-misses, 1)
+        #property setters of the values mark the constant themselves
+        value.elements[1].value = 7
+        ws.find('/Constants/C_IV').value.value = 8
+        misses = cache.misses
+        xml = ws.toXML()
+        self.assertEqual(cache.misses-misses, 2)
+        self.assertIn('<VALUE>7</VALUE>', xml)
+        self.assertIn('<VALUE>8</VALUE>', xml)
+        cache.clear()
+        self.assertEqual(ws.toXML(), xml)
+
+    def test_save_xml_files(self):
+        ws = _create_writer_ws(3, extra_package=True)
+        files = [['/DataTypes'], ['/Constants/C1_IV', '/PortInterfaces'], None, ['/DataTypes/BaseTypes'], ['/Missing']]
+        outputs = [io.StringIO() for _ in files]
+        ws.saveXMLFiles(list(zip(outputs, files)), ignore=['/Constants/C2_IV'])
+        for (fp, filters) in zip(outputs, files):
+            self.assertEqual(fp.getvalue(), ws.toXML(filters=filters, ignore=['/Constants/C2_IV']))
+        ws2 = _load_xml_text(outputs[1].getvalue())
+        self.assertEqual(ws2.listPackages(), ['Constants', 'PortInterfaces'])
+        self.assertEqual(_constant_values(ws2), [('C1_IV', '1')])
+        ws2 = _load_xml_text(outputs[2].getvalue())
+        self.assertEqual(_constant_values(ws2), [('C0_IV', '0'), ('C1_IV', '1')])
+        self.assertEqual(ws2.find('/PortInterfaces/Extra_I').dataElements[0].typeRef, '/DataTypes/uint8')
+        #a single ignore string is accepted by saveXMLFiles, saveXML and toXML alike
+        fp = io.StringIO()
+        ws.saveXMLFiles([(fp, ['/Constants'])], ignore='/Constants/C2_IV')
+        self.assertEqual(fp.getvalue(), ws.toXML(filters=['/Constants'], ignore='/Constants/C2_IV'))
+        self.assertIn('<SHORT-NAME>C1_IV</SHORT-NAME>', fp.getvalue())
+        self.assertNotIn('<SHORT-NAME>C2_IV</SHORT-NAME>', fp.getvalue())
+        fp2 = io.StringIO()
+        ws.saveXML(fp2, filters=['/Constants'], ignore='/Constants/C2_IV')
+        self.assertEqual(fp2.getvalue(), fp.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
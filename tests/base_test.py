@@ -4,6 +4,8 @@ sys.path.insert(0, mod_path)
 import autosar
 import xml.etree.ElementTree as ElementTree
 import unittest
+import pickle
+import copy
 
 class TestBase(unittest.TestCase):
 
@@ -142,6 +144,21 @@ class TestBase(unittest.TestCase):
       ws = autosar.workspace(version=4.2, patch = 2)
       self.assertEqual(ws.version, 4.2)
       self.assertEqual(ws.patch, 2)
+
+   def test_slots(self):
+      dataElement = autosar.element.DataElement('Value', '/DataTypes/uint8', swImplPolicy='queued')
+      comspec = autosar.port.DataElementComSpec('Value', initValueRef='/Constants/C_IV', queueLength=2)
+      value = autosar.constant.NumericalValue('Value', 3)
+      self.assertFalse(hasattr(dataElement, 'desc'))
+      dataElement.desc = 'description'
+      for obj in [dataElement, comspec, value, autosar.base.SwDataDefPropsConditional(), autosar.base.AdminData()]:
+         obj.userTag = 'tag' #attributes unknown to the library can still be added
+      copied = pickle.loads(pickle.dumps(dataElement))
+      self.assertEqual((copied.name, copied.typeRef, copied.swImplPolicy, copied.isQueued, copied.desc), ('Value', '/DataTypes/uint8', 'QUEUED', True, 'description'))
+      self.assertEqual(copied.userTag, 'tag')
+      copied = copy.deepcopy(comspec)
+      self.assertEqual((copied.name, copied.initValueRef, copied.queueLength, copied.userTag), ('Value', '/Constants/C_IV', 2, 'tag'))
+      self.assertEqual(value.userTag, 'tag')
    
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,105 @@
+import os, sys
+mod_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, mod_path)
+import autosar
+import autosar.util
+import unittest
+import io
+import contextlib
+import tempfile
+import shutil
+import concurrent.futures
+import warnings
+
+expected_gen_dir = os.path.join(os.path.dirname(__file__), 'arxml', 'expected_gen')
+
+def _create_ws():
+    ws = autosar.workspace(version="4.2.2")
+    package = ws.createPackage('DataTypes', role='DataType')
+    package.createSubPackage('CompuMethods', role='CompuMethod')
+    package.createSubPackage('DataConstrs', role='DataConstraint')
+    baseTypes = package.createSubPackage('BaseTypes')
+    baseTypes.createSwBaseType('uint8', 8, nativeDeclaration='uint8')
+    package.createImplementationDataType('uint8', lowerLimit=0, upperLimit=255, baseTypeRef='/DataTypes/BaseTypes/uint8', typeEmitter='Platform_Type')
+    package = ws.createPackage('Constants', role='Constant')
+    for i in range(3):
+        package.createConstant('C%d_IV'%i, '/DataTypes/uint8', i)
+    return ws
+
+class DcfTest(unittest.TestCase):
+
+    def test_import_dcf(self):
+        constant_dir = os.path.join(expected_gen_dir, 'constant')
+        file_names = ['ar4_array_constant.arxml', 'ar4_record_constant1.arxml', 'ar4_num_value_constant.arxml']
+        with tempfile.TemporaryDirectory() as tmpDir:
+            os.makedirs(os.path.join(tmpDir, 'sub'))
+            for file_name in file_names:
+                shutil.copy(os.path.join(constant_dir, file_name), tmpDir)
+            dcf_xml = '<?xml version="1.0" encoding="utf-8"?>\n<DCF>{}</DCF>\n'
+            file_ref = '<FILEREF><ARXML ROOTITEM="CONSTANT" TYPE="">{}</ARXML></FILEREF>'
+            external_ref = '<EXTERNALFILEREF><PATH>{}</PATH></EXTERNALFILEREF>'
+            with open(os.path.join(tmpDir, 'top.dcf'), 'w') as fp:
+                fp.write(dcf_xml.format(file_ref.format(file_names[0]) + file_ref.format(file_names[1]) + external_ref.format('sub/child.dcf')))
+            #child references an ARXML already referenced by top.dcf and refers back to top.dcf
+            with open(os.path.join(tmpDir, 'sub', 'child.dcf'), 'w') as fp:
+                fp.write(dcf_xml.format(file_ref.format('../'+file_names[0]) + file_ref.format('../'+file_names[2]) + external_ref.format('../top.dcf')))
+            dcf = autosar.util.dcf.DcfParser().parse(os.path.join(tmpDir, 'top.dcf'))
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter('always')
+                file_paths = dcf.collectReferences()
+            self.assertEqual([os.path.basename(x) for x in file_paths], file_names)
+            self.assertEqual([x.category for x in caught], [RuntimeWarning])
+            self.assertIn('DCF reference cycle', str(caught[0].message))
+            ws1 = autosar.workspace()
+            with contextlib.redirect_stdout(io.StringIO()):
+                for file_name in file_names:
+                    ws1.loadXML(os.path.join(constant_dir, file_name))
+            refs = [x.ref for x in ws1.iterfind('/Constants/*')]
+            self.assertGreater(len(refs), 0)
+            #serial by default, no process pool is started
+            executor = concurrent.futures.ProcessPoolExecutor
+            concurrent.futures.ProcessPoolExecutor = None
+            try:
+                with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+                    warnings.simplefilter('ignore')
+                    ws2 = autosar.util.importDcf(os.path.join(tmpDir, 'top.dcf'))
+            finally:
+                concurrent.futures.ProcessPoolExecutor = executor
+            with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                ws3 = autosar.util.importDcf(os.path.join(tmpDir, 'top.dcf'), workers=2)
+            for ws in [ws2, ws3]:
+                self.assertEqual([x.ref for x in ws.iterfind('/Constants/*')], refs)
+                for ref in refs:
+                    self.assertIs(type(ws.find(ref)), type(ws1.find(ref)))
+                    self.assertIs(ws.find(ref).parent, ws.find('/Constants'))
+                    self.assertEqual(type(ws.find(ref).value), type(ws1.find(ref).value))
+
+    def test_parse_dcf(self):
+        with tempfile.TemporaryDirectory() as tmpDir:
+            with open(os.path.join(tmpDir, 'top.dcf'), 'w') as fp:
+                fp.write('<?xml version="1.0" encoding="utf-8"?>\n<DCF><FILEREF><ARXML ROOTITEM="CONSTANT" TYPE="">sub\\Constants.arxml</ARXML></FILEREF></DCF>\n')
+            dcf = autosar.util.dcf.DcfParser().parse(os.path.join(tmpDir, 'top.dcf'))
+        self.assertIsNone(dcf.ws)
+        self.assertEqual(len(dcf.file_ref), 1)
+        if os.path.sep == '/':
+            self.assertEqual(dcf.file_ref[0]['path'], os.path.join(tmpDir, 'sub', 'Constants.arxml'))
+
+    def test_save_dcf(self):
+        ws = _create_ws()
+        file_map = {'DataTypes': {'root': 'DATATYPE', 'filters': ['/DataTypes']},
+                    'Constants.arxml': {'root': 'CONSTANT', 'filters': ['/Constants']}}
+        with tempfile.TemporaryDirectory() as tmpDir:
+            dcf = autosar.util.dcf.Dcf(ws)
+            dcf.save(tmpDir, 'Test', file_map=file_map, force=True)
+            for (file_name, filters) in [('DataTypes.arxml', ['/DataTypes']), ('Constants.arxml', ['/Constants'])]:
+                with open(os.path.join(tmpDir, file_name), encoding='utf-8') as fp:
+                    self.assertEqual(fp.read(), ws.toXML(filters=filters))
+            with contextlib.redirect_stdout(io.StringIO()):
+                ws2 = autosar.util.importDcf(os.path.join(tmpDir, 'Test.dcf'))
+            self.assertEqual([x.name for x in ws2.find('/Constants').elements], ['C0_IV', 'C1_IV', 'C2_IV'])
+            self.assertEqual(ws2.find('/Constants/C2_IV').value.value, '2')
+            self.assertEqual(ws2.find('/DataTypes/uint8').ref, '/DataTypes/uint8')
+
+if __name__ == '__main__':
+    unittest.main()